@@ -3,9 +3,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from config import Config
+from app.database import RoutingSession
 
 # Flask eklentileri
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 migrate = Migrate()
 
@@ -14,10 +15,21 @@ def create_app(config_class=Config):
     app.config.from_object(config_class)
     
     # Eklentileri başlat
+    from app import database
+    database.configure_engine_options(app)
     db.init_app(app)
+    database.init_app(app, db)
     login_manager.init_app(app)
     migrate.init_app(app, db)
     
+    from app import lazy_guard, instrumentation, identity, jobs, http_cache, replicas
+    replicas.init_app(app)
+    lazy_guard.init_app(app)
+    instrumentation.init_app(app)
+    identity.init_app(app)
+    jobs.init_app(app)
+    http_cache.init_app(app)
+    
     # Login manager ayarları
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Bu sayfaya erişmek için giriş yapmalısınız.'
@@ -36,9 +48,15 @@ def create_app(config_class=Config):
     from app.reports import bp as reports_bp
     app.register_blueprint(reports_bp, url_prefix='/reports')
     
+    from app.search import bp as search_bp
+    app.register_blueprint(search_bp, url_prefix='/search')
+    
+    from app.api import bp as api_bp
+    app.register_blueprint(api_bp, url_prefix='/api')
+    
     from app.main import bp as main_bp
     app.register_blueprint(main_bp)
     
     return app
 
-from app import models 
\ No newline at end of file
+from app import models, data_versions, rollups, status_events, refdata, prerequisites, career, job_handlers 
\ No newline at end of file
@@ -1,7 +1,10 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, TextAreaField, SelectField, SubmitField, SelectMultipleField, PasswordField, BooleanField
-from wtforms.validators import DataRequired, Length, ValidationError, Email, EqualTo
-from app.models import Department, Training, Level, User
+from flask_wtf.file import FileField, FileRequired, FileAllowed
+from wtforms import StringField, TextAreaField, SelectField, SubmitField, PasswordField, BooleanField
+from wtforms.validators import DataRequired, Length, ValidationError, Email, EqualTo, Optional
+from app.models import Department, Training, User
+from app.fields import ModelIdField, ModelIdListField
+from app.refdata import department_choices, level_choices, training_choices
 
 class DepartmentForm(FlaskForm):
     ad = StringField('Bölüm Adı', validators=[DataRequired(), Length(min=2, max=100)])
@@ -22,7 +25,7 @@ class TrainingForm(FlaskForm):
     
     def __init__(self, *args, **kwargs):
         super(TrainingForm, self).__init__(*args, **kwargs)
-        self.pre_requisite_id.choices = [(0, 'Ön koşul yok')] + [(t.id, f"{t.kod} - {t.baslik}") for t in Training.query.all()]
+        self.pre_requisite_id.choices = [(0, 'Ön koşul yok')] + training_choices()
     
     def validate_kod(self, kod):
         training = Training.query.filter_by(kod=kod.data).first()
@@ -37,19 +40,48 @@ class TrainingSectionForm(FlaskForm):
     
     def __init__(self, *args, **kwargs):
         super(TrainingSectionForm, self).__init__(*args, **kwargs)
-        self.egitim_id.choices = [(t.id, f"{t.kod} - {t.baslik}") for t in Training.query.all()]
-        self.bolum_id.choices = [(d.id, d.ad) for d in Department.query.all()]
-        self.seviye_id.choices = [(l.id, l.ad) for l in Level.query.all()]
+        self.egitim_id.choices = training_choices()
+        self.bolum_id.choices = department_choices()
+        self.seviye_id.choices = level_choices()
 
 class UserAssignmentForm(FlaskForm):
-    kullanici_id = SelectField('Kullanıcı', coerce=int, validators=[DataRequired()])
-    egitim_ids = SelectMultipleField('Eğitimler', coerce=int, validators=[DataRequired()])
+    kullanici_id = ModelIdField('Kullanıcı ID', model=User, message='Kullanıcı bulunamadı.',
+                                validators=[DataRequired()])
+    egitim_ids = ModelIdListField('Eğitimler', model=Training, message='Eğitim bulunamadı',
+                                  validators=[DataRequired()])
     submit = SubmitField('Ata')
+
+class BulkAssignForm(FlaskForm):
+    kaynak = SelectField('Atanacak Eğitimler', choices=[
+        ('egitimler', 'Seçilen eğitimler'),
+        ('bolum_eslemesi', 'Kullanıcının bölümüne bağlı eğitimler')
+    ], default='egitimler')
+    egitim_ids = ModelIdListField('Eğitimler', model=Training, message='Eğitim bulunamadı')
+    seviye_id = SelectField('Seviye', coerce=int, default=0)
+    bolum_id = ModelIdField('Bölüm', model=Department, message='Bölüm bulunamadı.', validators=[Optional()])
+    rol = SelectField('Rol', choices=[
+        ('', 'Tüm roller'),
+        ('Personel', 'Personel'),
+        ('Eğitmen', 'Eğitmen'),
+        ('Admin', 'Admin')
+    ], default='')
+    submit = SubmitField('Toplu Ata')
     
     def __init__(self, *args, **kwargs):
-        super(UserAssignmentForm, self).__init__(*args, **kwargs)
-        self.kullanici_id.choices = [(u.id, f"{u.isim} ({u.email})") for u in User.query.all()]
-        self.egitim_ids.choices = [(t.id, f"{t.kod} - {t.baslik}") for t in Training.query.all()]
+        super(BulkAssignForm, self).__init__(*args, **kwargs)
+        self.seviye_id.choices = [(0, 'Tüm seviyeler')] + level_choices()
+    
+    def validate_egitim_ids(self, egitim_ids):
+        if self.kaynak.data == 'egitimler' and not egitim_ids.data:
+            raise ValidationError('En az bir eğitim seçmelisiniz.')
+
+class UserTrainingForm(FlaskForm):
+    durum = SelectField('Durum', choices=[
+        ('baslamadi', 'Başlamadı'),
+        ('devam', 'Devam Ediyor'),
+        ('tamamlandi', 'Tamamlandı')
+    ], validators=[DataRequired()])
+    submit = SubmitField('Kaydet')
 
 class UserForm(FlaskForm):
     isim = StringField('Ad Soyad', validators=[DataRequired(), Length(min=2, max=100)])
@@ -65,7 +97,7 @@ class UserForm(FlaskForm):
     
     def __init__(self, *args, **kwargs):
         super(UserForm, self).__init__(*args, **kwargs)
-        self.bolum_id.choices = [(0, 'Bölüm seçiniz')] + [(d.id, d.ad) for d in Department.query.all()]
+        self.bolum_id.choices = [(0, 'Bölüm seçiniz')] + department_choices()
     
     def validate_email(self, email):
         user = User.query.filter_by(email=email.data).first()
@@ -75,4 +107,9 @@ class UserForm(FlaskForm):
 class UserPasswordForm(FlaskForm):
     password = PasswordField('Yeni Şifre', validators=[DataRequired(), Length(min=6)])
     password2 = PasswordField('Şifre Tekrar', validators=[DataRequired(), EqualTo('password')])
-    submit = SubmitField('Şifreyi Değiştir') 
\ No newline at end of file
+    submit = SubmitField('Şifreyi Değiştir')
+
+class UserImportForm(FlaskForm):
+    dosya = FileField('CSV Dosyası', validators=[FileRequired(), FileAllowed(['csv'], 'Yalnızca CSV dosyası yükleyebilirsiniz.')])
+    egitim_ata = BooleanField('Bölümün varsayılan eğitimlerini ata', default=True)
+    submit = SubmitField('Aktar')
@@ -1,9 +1,21 @@
-from flask import render_template, redirect, url_for, flash, request, abort
+import io
+import os
+from flask import render_template, redirect, url_for, flash, request, abort, current_app, Response, send_file
 from flask_login import login_required, current_user
 from app import db
 from app.admin import bp
-from app.admin.forms import DepartmentForm, TrainingForm, TrainingSectionForm, UserAssignmentForm, UserForm, UserPasswordForm
-from app.models import Department, Training, Level, TrainingSection, User, UserTraining
+from app.admin.forms import DepartmentForm, TrainingForm, TrainingSectionForm, UserAssignmentForm, BulkAssignForm, UserTrainingForm, UserForm, UserPasswordForm, UserImportForm
+from app.models import Department, Training, Level, TrainingSection, User, UserTraining, Job
+from app.rollups import status_totals
+from app.pagination import paginate_request
+from app.http_cache import conditional
+from app.assignments import bulk_assign as bulk_assign_trainings
+from app.refdata import department_choices, training_choices
+from app.prerequisites import get_graph as get_prerequisite_graph, PrerequisiteCycleError
+from app.instrumentation import recent_requests, endpoint_summary
+from app.identity import remember_password_version
+from app.user_import import write_error_report, DEFAULT_PASSWORD
+from app.jobs import enqueue, store_upload, files_dir, recent_jobs, job_label, STATUS_LABELS
 from datetime import datetime
 
 def admin_required(f):
@@ -19,13 +31,14 @@ def admin_required(f):
 @bp.route('/')
 @login_required
 @admin_required
+@conditional('users', 'trainings', 'departments', 'training_progress_rollups')
 def index():
     # İstatistikler
     stats = {
         'total_users': User.query.count(),
         'total_trainings': Training.query.count(),
         'total_departments': Department.query.count(),
-        'completed_trainings': UserTraining.query.filter_by(durum='tamamlandi').count()
+        'completed_trainings': status_totals().get('tamamlandi', 0)
     }
     
     # Son eklenen eğitimler
@@ -43,8 +56,9 @@ def index():
 @bp.route('/departments')
 @login_required
 @admin_required
+@conditional('departments')
 def departments():
-    departments = Department.query.all()
+    departments = paginate_request(Department.query, Department)
     return render_template('admin/departments.html', departments=departments)
 
 @bp.route('/departments/add', methods=['GET', 'POST'])
@@ -85,17 +99,17 @@ def edit_department(id):
 @admin_required
 def delete_department(id):
     department = Department.query.get_or_404(id)
-    db.session.delete(department)
-    db.session.commit()
-    flash('Bölüm başarıyla silindi.', 'success')
-    return redirect(url_for('admin.departments'))
+    job = enqueue('delete_department', olusturan_id=current_user.id, bolum_id=department.id)
+    flash(f'{department.ad} bölümü arka planda siliniyor.', 'info')
+    return redirect(url_for('admin.job_detail', id=job.id))
 
 # Eğitim Yönetimi
 @bp.route('/trainings')
 @login_required
 @admin_required
+@conditional('trainings')
 def trainings():
-    trainings = Training.query.all()
+    trainings = paginate_request(Training.with_profile('training_list'), Training)
     return render_template('admin/trainings.html', trainings=trainings)
 
 @bp.route('/trainings/add', methods=['GET', 'POST'])
@@ -125,11 +139,22 @@ def edit_training(id):
     form = TrainingForm(obj=training)
     
     if form.validate_on_submit():
+        pre_requisite_id = form.pre_requisite_id.data if form.pre_requisite_id.data != 0 else None
+        if get_prerequisite_graph().would_create_cycle(training.id, pre_requisite_id):
+            flash('Bu ön koşul seçimi döngüsel bir bağımlılık oluşturur.', 'danger')
+            return render_template('admin/training_form.html', form=form, title='Eğitim Düzenle')
+        
         training.kod = form.kod.data
         training.baslik = form.baslik.data
         training.aciklama = form.aciklama.data
-        training.pre_requisite_id = form.pre_requisite_id.data if form.pre_requisite_id.data != 0 else None
-        db.session.commit()
+        training.pre_requisite_id = pre_requisite_id
+        try:
+            db.session.commit()
+        except PrerequisiteCycleError:
+            # Başka bir süreç aynı anda zinciri değiştirmiş olabilir
+            db.session.rollback()
+            flash('Bu ön koşul seçimi döngüsel bir bağımlılık oluşturur.', 'danger')
+            return render_template('admin/training_form.html', form=form, title='Eğitim Düzenle')
         flash('Eğitim başarıyla güncellendi.', 'success')
         return redirect(url_for('admin.trainings'))
     
@@ -140,18 +165,33 @@ def edit_training(id):
 @admin_required
 def delete_training(id):
     training = Training.query.get_or_404(id)
-    db.session.delete(training)
-    db.session.commit()
-    flash('Eğitim başarıyla silindi.', 'success')
-    return redirect(url_for('admin.trainings'))
+    job = enqueue('delete_training', olusturan_id=current_user.id, egitim_id=training.id)
+    flash(f'{training.kod} eğitimi ve atamaları arka planda siliniyor.', 'info')
+    return redirect(url_for('admin.job_detail', id=job.id))
 
 # Eğitim-Bölüm İlişkilendirme
 @bp.route('/training-sections')
 @login_required
 @admin_required
+@conditional('training_sections', 'trainings', 'departments', 'levels')
 def training_sections():
-    sections = TrainingSection.query.all()
-    return render_template('admin/training_sections.html', sections=sections)
+    filters = {
+        'bolum_id': request.args.get('bolum_id', type=int),
+        'egitim_id': request.args.get('egitim_id', type=int)
+    }
+    
+    query = TrainingSection.with_profile('section_list')
+    if filters['bolum_id']:
+        query = query.filter(TrainingSection.bolum_id == filters['bolum_id'])
+    if filters['egitim_id']:
+        query = query.filter(TrainingSection.egitim_id == filters['egitim_id'])
+    
+    sections = paginate_request(query, TrainingSection)
+    return render_template('admin/training_sections.html',
+                         sections=sections,
+                         filters=filters,
+                         departments=department_choices(),
+                         trainings=training_choices())
 
 @bp.route('/training-sections/add', methods=['GET', 'POST'])
 @login_required
@@ -195,9 +235,31 @@ def delete_training_section(id):
 @bp.route('/user-assignments')
 @login_required
 @admin_required
+@conditional('user_trainings', 'users', 'trainings', 'departments')
 def user_assignments():
-    user_trainings = UserTraining.query.all()
-    return render_template('admin/user_assignments.html', user_trainings=user_trainings)
+    filters = {
+        'bolum_id': request.args.get('bolum_id', type=int),
+        'egitim_id': request.args.get('egitim_id', type=int),
+        'durum': request.args.get('durum') or None,
+        'kullanici_id': request.args.get('kullanici_id', type=int)
+    }
+    
+    query = UserTraining.with_profile('assignment_list')
+    if filters['bolum_id']:
+        query = query.join(User, User.id == UserTraining.kullanici_id).filter(User.bolum_id == filters['bolum_id'])
+    if filters['egitim_id']:
+        query = query.filter(UserTraining.egitim_id == filters['egitim_id'])
+    if filters['durum']:
+        query = query.filter(UserTraining.durum == filters['durum'])
+    if filters['kullanici_id']:
+        query = query.filter(UserTraining.kullanici_id == filters['kullanici_id'])
+    
+    user_trainings = paginate_request(query, UserTraining)
+    return render_template('admin/user_assignments.html',
+                         user_trainings=user_trainings,
+                         filters=filters,
+                         departments=department_choices(),
+                         trainings=training_choices())
 
 @bp.route('/user-assignments/add', methods=['GET', 'POST'])
 @login_required
@@ -205,36 +267,84 @@ def user_assignments():
 def add_user_assignment():
     form = UserAssignmentForm()
     if form.validate_on_submit():
-        user = User.query.get(form.kullanici_id.data)
-        
-        for egitim_id in form.egitim_ids.data:
-            # Kullanıcının bu eğitimi zaten var mı kontrol et
-            existing = UserTraining.query.filter_by(
-                kullanici_id=user.id,
-                egitim_id=egitim_id
-            ).first()
-            
-            if not existing:
-                user_training = UserTraining(
-                    kullanici_id=user.id,
-                    egitim_id=egitim_id,
-                    durum='baslamadi'
-                )
-                db.session.add(user_training)
-        
+        result = bulk_assign_trainings(egitim_ids=form.egitim_ids.data,
+                                       kullanici_ids=[form.kullanici_id.data],
+                                       only_active=False)
         db.session.commit()
-        flash('Eğitimler başarıyla atandı.', 'success')
+        flash(f'{result.inserted} eğitim atandı, {result.skipped} eğitim zaten atanmıştı.', 'success')
         return redirect(url_for('admin.user_assignments'))
     
     return render_template('admin/user_assignment_form.html', form=form, title='Kullanıcı Eğitim Ata')
 
+@bp.route('/user-assignments/bulk', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def bulk_assign():
+    form = BulkAssignForm()
+    if form.validate_on_submit():
+        use_sections = form.kaynak.data == 'bolum_eslemesi'
+        job = enqueue('bulk_assign', olusturan_id=current_user.id,
+                      egitim_ids=form.egitim_ids.data,
+                      bolum_id=form.bolum_id.data or None,
+                      rol=form.rol.data or None,
+                      use_sections=use_sections,
+                      seviye_id=form.seviye_id.data or None)
+        flash('Toplu atama arka planda yapılıyor.', 'info')
+        return redirect(url_for('admin.job_detail', id=job.id))
+    
+    return render_template('admin/bulk_assign.html', form=form, title='Toplu Eğitim Ata')
+
+@bp.route('/user-assignments/<int:id>/edit', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_user_assignment(id):
+    user_training = UserTraining.with_profile('assignment_list').get_or_404(id)
+    form = UserTrainingForm(obj=user_training)
+    
+    if form.validate_on_submit():
+        user_training.durum = form.durum.data
+        if user_training.durum == 'tamamlandi':
+            user_training.tamamlanma_tarihi = user_training.tamamlanma_tarihi or datetime.utcnow()
+        else:
+            user_training.tamamlanma_tarihi = None
+        db.session.commit()
+        flash('Atama başarıyla güncellendi.', 'success')
+        return redirect(url_for('admin.user_assignments'))
+    
+    return render_template('admin/user_assignment_edit.html', form=form, user_training=user_training)
+
+@bp.route('/user-assignments/<int:id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_user_assignment(id):
+    user_training = UserTraining.query.get_or_404(id)
+    db.session.delete(user_training)
+    db.session.commit()
+    flash('Atama başarıyla silindi.', 'success')
+    return redirect(url_for('admin.user_assignments'))
+
 # Kullanıcı Yönetimi
 @bp.route('/users')
 @login_required
 @admin_required
+@conditional('users', 'departments')
 def users():
-    users = User.query.all()
-    return render_template('admin/users.html', users=users)
+    filters = {
+        'bolum_id': request.args.get('bolum_id', type=int),
+        'rol': request.args.get('rol') or None
+    }
+    
+    query = User.with_profile('user_list')
+    if filters['bolum_id']:
+        query = query.filter(User.bolum_id == filters['bolum_id'])
+    if filters['rol']:
+        query = query.filter(User.rol == filters['rol'])
+    
+    users = paginate_request(query, User)
+    return render_template('admin/users.html',
+                         users=users,
+                         filters=filters,
+                         departments=department_choices())
 
 @bp.route('/users/add', methods=['GET', 'POST'])
 @login_required
@@ -295,6 +405,8 @@ def change_user_password(id):
     if form.validate_on_submit():
         user.set_password(form.password.data)
         db.session.commit()
+        if user == current_user:
+            remember_password_version(user)
         flash('Kullanıcı şifresi başarıyla değiştirildi.', 'success')
         return redirect(url_for('admin.users'))
     
@@ -314,6 +426,21 @@ def delete_user(id):
     flash('Kullanıcı başarıyla silindi.', 'success')
     return redirect(url_for('admin.users'))
 
+@bp.route('/users/import', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def import_users():
+    form = UserImportForm()
+    if form.validate_on_submit():
+        job = enqueue('import_users', olusturan_id=current_user.id,
+                      dosya=store_upload(form.dosya.data, '.csv'),
+                      assign_trainings=form.egitim_ata.data)
+        flash('Dosya yüklendi, kullanıcılar arka planda aktarılıyor.', 'info')
+        return redirect(url_for('admin.job_detail', id=job.id))
+    
+    return render_template('admin/user_import.html', form=form, title='Toplu Kullanıcı Aktarımı',
+                         default_password=DEFAULT_PASSWORD)
+
 @bp.route('/users/<int:user_id>/assign-trainings', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -323,27 +450,71 @@ def assign_trainings(user_id):
     form.kullanici_id.data = user_id
     
     if form.validate_on_submit():
-        for egitim_id in form.egitim_ids.data:
-            # Kullanıcının bu eğitimi zaten var mı kontrol et
-            existing = UserTraining.query.filter_by(
-                kullanici_id=user.id,
-                egitim_id=egitim_id
-            ).first()
-            
-            if not existing:
-                user_training = UserTraining(
-                    kullanici_id=user.id,
-                    egitim_id=egitim_id,
-                    durum='baslamadi'
-                )
-                db.session.add(user_training)
-        
+        result = bulk_assign_trainings(egitim_ids=form.egitim_ids.data,
+                                       kullanici_ids=[user.id],
+                                       only_active=False)
         db.session.commit()
-        flash('Eğitimler başarıyla atandı.', 'success')
+        flash(f'{result.inserted} eğitim atandı, {result.skipped} eğitim zaten atanmıştı.', 'success')
         return redirect(url_for('admin.users'))
-    
-    # Kullanıcının mevcut eğitimlerini seçili hale getir
-    user_trainings = UserTraining.query.filter_by(kullanici_id=user_id).all()
-    form.egitim_ids.data = [ut.egitim_id for ut in user_trainings]
-    
-    return render_template('admin/assign_trainings.html', form=form, user=user) 
\ No newline at end of file
+
+    # Mevcut eğitimler sayfaya gömülmez; seçim kutusu onları API'den "atanmış" olarak işaretler
+    return render_template('admin/assign_trainings.html', form=form, user=user)
+
+# Arka Plan İşleri
+@bp.route('/jobs')
+@login_required
+@admin_required
+def jobs():
+    return render_template('admin/jobs.html', jobs=recent_jobs(),
+                         job_label=job_label, status_labels=STATUS_LABELS)
+
+@bp.route('/jobs/rebuild-rollups', methods=['POST'])
+@login_required
+@admin_required
+def rebuild_rollups():
+    job = enqueue('rebuild_rollups', olusturan_id=current_user.id)
+    flash('Özet tablo arka planda yeniden hesaplanıyor.', 'info')
+    return redirect(url_for('admin.job_detail', id=job.id))
+
+@bp.route('/jobs/<int:id>')
+@login_required
+@admin_required
+def job_detail(id):
+    job = Job.with_profile('job_list').filter_by(id=id).first_or_404()
+    return render_template('admin/job_detail.html', job=job,
+                         job_label=job_label, status_labels=STATUS_LABELS)
+
+@bp.route('/jobs/<int:id>/errors.csv')
+@login_required
+@admin_required
+def job_errors(id):
+    job = Job.query.get_or_404(id)
+    if not job.sonuc or 'errors' not in job.sonuc:
+        abort(404)
+    output = io.StringIO()
+    write_error_report(job.sonuc['errors'], output)
+    return Response('\ufeff' + output.getvalue(), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=aktarim_hatalari.csv'})
+
+@bp.route('/jobs/<int:id>/download')
+@login_required
+@admin_required
+def job_download(id):
+    job = Job.query.get_or_404(id)
+    if job.durum != 'tamamlandi' or not job.sonuc or 'dosya' not in job.sonuc:
+        abort(404)
+    path = os.path.join(files_dir(), job.sonuc['dosya'])
+    if not os.path.exists(path):
+        abort(404)
+    return send_file(path, as_attachment=True, download_name=job.sonuc['ad'])
+
+# Performans
+@bp.route('/perf')
+@login_required
+@admin_required
+def perf():
+    entries = recent_requests()
+    return render_template('admin/perf.html',
+                         entries=entries,
+                         summary=endpoint_summary(entries),
+                         enabled=current_app.extensions.get('instrumentation') is not None)
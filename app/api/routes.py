@@ -0,0 +1,163 @@
+"""
+Form seçim arayüzleri için JSON API
+
+    GET /api/users          (yalnızca admin)
+    GET /api/trainings      (kullanici_id verilirse öğelerde 'assigned' alanı)
+    GET /api/departments
+    POST /api/status-updates (STATUS_API_TOKENS anahtarıyla; bkz. app.status_updates)
+
+Parametreler: q (önek araması, alaka sırasıyla tek sayfa), ids (virgülle
+ayrılmış id'lerin etiketleri), limit ve cursor (q yokken created_at sırasıyla
+keyset sayfalama). Yanıt: {"items": [{"id", "label", "detail"}], "next_cursor"}.
+
+Yanıtlar veri sürümlerine bağlı ETag ile sunulur (app.http_cache) ve tarayıcıda
+API_CACHE_SECONDS saniye tekrar kullanılabilir.
+"""
+
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+from flask_login import current_user
+from app.api import bp
+from app.http_cache import conditional
+from app.models import Department, Training, User, UserTraining
+from app.pagination import InvalidCursor, encode_cursor, keyset_query
+from app.search.index import search
+from app.status_updates import InvalidPayload, apply_status_updates, load_items
+from app import db
+
+class ApiError(Exception):
+    """{"error": mesaj} gövdeli JSON hata yanıtına dönüşen hata"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+@bp.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify(error=error.message), error.status
+
+def api_login_required(admin=False):
+    """Oturum yoksa 401, admin gerekiyorsa 403 JSON yanıtı döndüren dekoratör"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_user.is_authenticated:
+                raise ApiError('Giriş yapmalısınız.', 401)
+            if admin and not current_user.is_admin():
+                raise ApiError('Bu işlem için yetkiniz yok.', 403)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def api_token_required(view):
+    """'Authorization: Bearer <anahtar>' başlığını STATUS_API_TOKENS ile doğrulayan dekoratör"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        tokens = current_app.config.get('STATUS_API_TOKENS') or []
+        if scheme.lower() != 'bearer' or not any(hmac.compare_digest(token.encode(), known.encode())
+                                                 for known in tokens):
+            raise ApiError('Geçersiz API anahtarı.', 401)
+        return view(*args, **kwargs)
+    return wrapper
+
+def short_lived(view):
+    """Başarılı yanıtların tarayıcıda API_CACHE_SECONDS saniye kullanılmasına izin ver"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code in (200, 304):
+            response.headers['Cache-Control'] = f"private, max-age={current_app.config.get('API_CACHE_SECONDS', 30)}"
+        return response
+    return wrapper
+
+def _limit():
+    maximum = current_app.config.get('API_MAX_LIMIT', 100)
+    limit = request.args.get('limit', current_app.config.get('API_DEFAULT_LIMIT', 20), type=int)
+    return max(1, min(limit, maximum))
+
+def _parse_ids(value):
+    return list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+
+def listing(kind, model, columns, describe):
+    """q, ids veya cursor parametresine göre bir sayfa öğe ve sonraki sayfa imleci"""
+    limit = _limit()
+    query = request.args.get('q', '').strip()
+
+    if request.args.get('ids') is not None:
+        try:
+            ids = _parse_ids(request.args['ids'])[:current_app.config.get('API_MAX_LIMIT', 100)]
+        except ValueError:
+            raise ApiError('Geçersiz ids parametresi.')
+        rows = db.session.execute(db.select(model.id, *columns).where(model.id.in_(ids))).all()
+        by_id = {row.id: row for row in rows}
+        return [describe(by_id[id]) for id in ids if id in by_id], None
+
+    if query:
+        return [describe(row) for row in search(kind, query, limit=limit, columns=columns)], None
+
+    statement = db.select(model.id, model.created_at, *columns)
+    try:
+        statement = keyset_query(statement, model, request.args.get('cursor') or None)
+    except InvalidCursor:
+        raise ApiError('Geçersiz cursor parametresi.')
+    rows = db.session.execute(statement.limit(limit + 1)).all()
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    return [describe(row) for row in rows[:limit]], next_cursor
+
+def page_response(items, next_cursor):
+    return jsonify(items=items, next_cursor=next_cursor)
+
+@bp.route('/users')
+@api_login_required(admin=True)
+@short_lived
+@conditional('users')
+def users():
+    return page_response(*listing('users', User, (User.isim, User.email),
+                                  lambda row: {'id': row.id, 'label': row.isim, 'detail': row.email}))
+
+@bp.route('/trainings')
+@api_login_required()
+@short_lived
+@conditional('trainings', 'user_trainings')
+def trainings():
+    kullanici_id = request.args.get('kullanici_id', type=int)
+    if kullanici_id and kullanici_id != current_user.id and not current_user.is_admin():
+        raise ApiError('Bu işlem için yetkiniz yok.', 403)
+
+    items, next_cursor = listing('trainings', Training, (Training.kod, Training.baslik),
+                                 lambda row: {'id': row.id, 'label': f'{row.kod} - {row.baslik}', 'detail': None})
+    if kullanici_id and items:
+        # Sayfadaki eğitimlerden kullanıcıya atanmış olanlar (tek sorgu)
+        assigned = set(db.session.scalars(db.select(UserTraining.egitim_id).where(
+            UserTraining.kullanici_id == kullanici_id,
+            UserTraining.egitim_id.in_([item['id'] for item in items]))))
+        for item in items:
+            item['assigned'] = item['id'] in assigned
+    return page_response(items, next_cursor)
+
+@bp.route('/departments')
+@api_login_required()
+@short_lived
+@conditional('departments')
+def departments():
+    return page_response(*listing('departments', Department, (Department.ad,),
+                                  lambda row: {'id': row.id, 'label': row.ad, 'detail': None}))
+
+@bp.route('/status-updates', methods=['POST'])
+@api_token_required
+def status_updates():
+    """JSON listesi veya NDJSON gövdesindeki durum güncellemelerini uygula"""
+    ndjson = request.mimetype in ('application/x-ndjson', 'application/jsonl')
+    try:
+        items = load_items(request.get_data(as_text=True), ndjson=ndjson)
+    except InvalidPayload as exc:
+        raise ApiError(str(exc))
+    maximum = current_app.config.get('STATUS_UPDATE_MAX_ITEMS', 10000)
+    if len(items) > maximum:
+        raise ApiError(f'Bir istekte en fazla {maximum} öğe gönderilebilir.', 413)
+
+    report = apply_status_updates(items)
+    return jsonify(summary=report.summary(), results=report.results)
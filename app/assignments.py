@@ -0,0 +1,113 @@
+"""
+Toplu eğitim atama
+
+Hedef kullanıcı kümesi (bölüm, rol, kullanıcı listesi) ile eğitim kümesi
+(verilen eğitimler veya bölümün TrainingSection eşlemesi) arasındaki eksik
+(kullanıcı, eğitim) çiftleri tek bir anti-join sorgusuyla bulunur ve
+INSERT ... SELECT ile tek ifadede eklenir. _kullanici_egitim_uc kısıtına
+çarpan (eşzamanlı eklenmiş) satırlar ON CONFLICT DO NOTHING ile atlanır.
+Eklenen satırların durum olayları da INSERT ... SELECT ile yazılır.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import select, func, literal, exists, insert
+from app import db
+from app.models import User, Training, TrainingSection, UserTraining
+from app.data_versions import mark_changed
+from app.rollups import NO_DEPARTMENT, apply_deltas, rebuild_rollups
+from app.status_events import backfill
+
+BulkAssignResult = namedtuple('BulkAssignResult', ['inserted', 'skipped', 'total'])
+
+def _insert_ignoring_duplicates(dialect_name):
+    """Benzersizlik kısıtına çarpan satırları atlayan INSERT ifadesi"""
+    table = UserTraining.__table__
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(table), False
+    return dialect_insert(table), True
+
+def _target_pairs(egitim_ids, bolum_id, rol, kullanici_ids, use_sections, seviye_id, only_active):
+    """(kullanici_id, egitim_id, bolum_id) hedef çiftlerini veren SELECT"""
+    bolum = func.coalesce(User.bolum_id, NO_DEPARTMENT)
+    if use_sections:
+        # Kullanıcının bölümüne TrainingSection ile bağlı eğitimler
+        query = (select(User.id.label('kullanici_id'), TrainingSection.egitim_id.label('egitim_id'),
+                        bolum.label('bolum_id'))
+                 .join(TrainingSection, TrainingSection.bolum_id == User.bolum_id))
+        if seviye_id:
+            query = query.where(TrainingSection.seviye_id == seviye_id)
+        if egitim_ids:
+            query = query.where(TrainingSection.egitim_id.in_(egitim_ids))
+        training_id = TrainingSection.egitim_id
+    else:
+        query = (select(User.id.label('kullanici_id'), Training.id.label('egitim_id'), bolum.label('bolum_id'))
+                 .join(Training, literal(True))
+                 .where(Training.id.in_(egitim_ids)))
+        training_id = Training.id
+
+    if bolum_id:
+        query = query.where(User.bolum_id == bolum_id)
+    if rol:
+        query = query.where(User.rol == rol)
+    if kullanici_ids is not None:
+        query = query.where(User.id.in_(kullanici_ids))
+    if only_active:
+        query = query.where(User.is_active.is_(True))
+    return query, training_id
+
+def bulk_assign(egitim_ids=None, bolum_id=None, rol=None, kullanici_ids=None,
+                use_sections=False, seviye_id=None, only_active=True):
+    """Hedef kullanıcılara eksik eğitim atamalarını toplu olarak ekle
+
+    egitim_ids: atanacak eğitimler (use_sections=True ise isteğe bağlı filtre)
+    bolum_id, rol, kullanici_ids: hedef kullanıcı filtreleri
+    use_sections: eğitimleri kullanıcının bölümüne bağlı TrainingSection
+                  kayıtlarından al (seviye_id ile seviye filtresi uygulanabilir)
+
+    Commit çağırana bırakılır. BulkAssignResult(inserted, skipped, total) döner.
+    """
+    if not use_sections and not egitim_ids:
+        return BulkAssignResult(0, 0, 0)
+
+    pairs, training_id = _target_pairs(egitim_ids, bolum_id, rol, kullanici_ids,
+                                       use_sections, seviye_id, only_active)
+    total = db.session.scalar(select(func.count()).select_from(pairs.subquery()))
+    if not total:
+        return BulkAssignResult(0, 0, 0)
+
+    missing = pairs.where(~exists().where(UserTraining.kullanici_id == User.id,
+                                          UserTraining.egitim_id == training_id)).subquery()
+
+    # Özet tablo farkları: eklenecek satırlar eğitim/bölüm bazında 'baslamadi'
+    deltas = {(egitim_id, bolum, 'baslamadi'): adet
+              for egitim_id, bolum, adet in db.session.execute(
+                  select(missing.c.egitim_id, missing.c.bolum_id, func.count())
+                  .group_by(missing.c.egitim_id, missing.c.bolum_id))}
+    expected = sum(deltas.values())
+    if not expected:
+        return BulkAssignResult(0, total, total)
+
+    now = datetime.utcnow()
+    source = select(missing.c.kullanici_id, missing.c.egitim_id,
+                    literal('baslamadi'), literal(now), literal(now)).where(literal(True))
+    stmt, ignores_conflicts = _insert_ignoring_duplicates(db.session.get_bind().dialect.name)
+    stmt = stmt.from_select(['kullanici_id', 'egitim_id', 'durum', 'baslama_tarihi', 'created_at'], source)
+    if ignores_conflicts:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['kullanici_id', 'egitim_id'])
+    inserted = db.session.execute(stmt).rowcount
+
+    connection = db.session.connection()
+    mark_changed([UserTraining.__tablename__])
+    backfill(connection, UserTraining.created_at == now)
+    if inserted == expected:
+        apply_deltas(connection, deltas)
+    else:
+        # Eşzamanlı eklenen satırlar atlandı; etkilenen eğitimleri yeniden say
+        rebuild_rollups(connection, egitim_ids={egitim_id for egitim_id, _, _ in deltas})
+
+    return BulkAssignResult(inserted, total - inserted, total)
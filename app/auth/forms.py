@@ -1,7 +1,8 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, BooleanField, SubmitField, SelectField
 from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError
-from app.models import User, Department
+from app.models import User
+from app.refdata import department_choices
 
 class LoginForm(FlaskForm):
     email = StringField('E-posta', validators=[DataRequired(), Email()])
@@ -24,7 +25,7 @@ class RegistrationForm(FlaskForm):
     
     def __init__(self, *args, **kwargs):
         super(RegistrationForm, self).__init__(*args, **kwargs)
-        self.bolum_id.choices = [(d.id, d.ad) for d in Department.query.all()]
+        self.bolum_id.choices = department_choices()
     
     def validate_email(self, email):
         user = User.query.filter_by(email=email.data).first()
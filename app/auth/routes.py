@@ -4,6 +4,7 @@ from app import db
 from app.auth import bp
 from app.auth.forms import LoginForm, RegistrationForm, ChangePasswordForm
 from app.models import User, Department
+from app.identity import remember_password_version
 
 @bp.route('/login', methods=['GET', 'POST'])
 def login():
@@ -17,7 +18,13 @@ def login():
             flash('Geçersiz e-posta veya şifre', 'danger')
             return redirect(url_for('auth.login'))
         
+        # Eski parametrelerle saklanan özeti güncel yöntemle yenile
+        if user.password_needs_rehash():
+            user.set_password(form.password.data)
+            db.session.commit()
+        
         login_user(user, remember=form.remember_me.data)
+        remember_password_version(user)
         next_page = request.args.get('next')
         if not next_page or not next_page.startswith('/'):
             if user.is_admin():
@@ -65,6 +72,8 @@ def change_password():
         
         current_user.set_password(form.new_password.data)
         db.session.commit()
+        # Diğer oturumlar geçersiz olur, bu oturum açık kalır
+        remember_password_version(current_user)
         flash('Şifreniz başarıyla değiştirildi.', 'success')
         return redirect(url_for('user.profile'))
     
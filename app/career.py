@@ -0,0 +1,127 @@
+"""
+Kariyer yolu ilerlemesi
+
+Kullanıcının bölümündeki eğitimlerin seviye bazında toplam/tamamlanan sayıları
+tek bir gruplu sorguyla hesaplanır: bölümün eğitim ilişkileri, kullanıcının
+tamamladığı atamalarla LEFT JOIN edilir.
+
+Sonuç (kullanıcı, bölüm) anahtarıyla süreç içinde önbelleğe alınır ve
+kapsamlı veri sürümleriyle (app.data_versions) birlikte saklanır:
+
+    user_trainings:<kullanici_id>   kullanıcının atamaları değiştiğinde
+    training_sections:<bolum_id>    bölümün eğitim ilişkileri değiştiğinde
+    trainings                       eğitim eklendiğinde, değiştiğinde veya silindiğinde
+
+Kapsamlı sürümler atama ve bölüm ilişkisi yazan flush'larda işaretlenir; başka
+bir kullanıcının başlatması veya tamamlaması önbelleği geçersiz kılmaz. Sürümler
+veritabanında tutulduğundan başka bir süreçteki (worker, arka plan işi) yazmalar
+da görülür. Session olaylarını atlayan toplu güncellemeler aynı transaction
+içinde mark_users_changed(kullanici_idleri) çağırmalıdır. Yalnızca 'baslamadi'
+durumunda atama ekleyen toplu işlemler ilerlemeyi değiştirmez.
+"""
+
+import threading
+from collections import OrderedDict
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import attributes
+from app import db
+from app.data_versions import mark_changed, versions
+from app.models import Department, Training, TrainingSection, UserTraining
+from app.refdata import level_choices
+
+_MAX_ENTRIES = 10000
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def user_scope(kullanici_id):
+    return f'{UserTraining.__tablename__}:{kullanici_id}'
+
+def department_scope(bolum_id):
+    return f'{TrainingSection.__tablename__}:{bolum_id}'
+
+def mark_users_changed(kullanici_ids, session=None):
+    """Kullanıcıların ilerlemesini mevcut transaction commit edilirken geçersiz kıl"""
+    scopes = {user_scope(kullanici_id) for kullanici_id in kullanici_ids}
+    if scopes:
+        mark_changed(scopes, session)
+
+def reset_cache():
+    """Süreçteki tüm sonuçları sil (ör. veritabanı yeniden tohumlandığında)"""
+    with _lock:
+        _cache.clear()
+
+def progress_query(kullanici_id, bolum_id):
+    """Seviye bazında (seviye_id, total, completed) veren gruplu sorgu"""
+    completed = UserTraining.__table__.alias('tamamlanan')
+    return (
+        select(TrainingSection.seviye_id,
+               func.count(TrainingSection.id).label('total'),
+               func.count(completed.c.id).label('completed'))
+        .outerjoin(completed, and_(completed.c.egitim_id == TrainingSection.egitim_id,
+                                   completed.c.kullanici_id == kullanici_id,
+                                   completed.c.durum == 'tamamlandi'))
+        .where(TrainingSection.bolum_id == bolum_id)
+        .group_by(TrainingSection.seviye_id)
+        .order_by(TrainingSection.seviye_id)
+    )
+
+def _load_progress(kullanici_id, bolum_id):
+    rows = db.session.execute(progress_query(kullanici_id, bolum_id))
+    return tuple((row.seviye_id, row.total, row.completed) for row in rows)
+
+def _cached_progress(kullanici_id, bolum_id):
+    key = (kullanici_id, bolum_id)
+    current = tuple(versions([user_scope(kullanici_id), department_scope(bolum_id),
+                              Training.__tablename__]).values())
+
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == current:
+        with _lock:
+            _cache.move_to_end(key)
+        return entry[1]
+
+    value = _load_progress(kullanici_id, bolum_id)
+    with _lock:
+        _cache[key] = (current, value)
+        _cache.move_to_end(key)
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return value
+
+def _values(obj, key):
+    """Özelliğin flush öncesi ve sonrası değerleri"""
+    history = attributes.get_history(obj, key)
+    return set(history.deleted) | set(history.unchanged) | set(history.added)
+
+@event.listens_for(db.session, 'after_flush')
+def _mark_scopes(session, flush_context):
+    scopes = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, UserTraining):
+            scopes.update(user_scope(kullanici_id) for kullanici_id in _values(obj, 'kullanici_id'))
+        elif isinstance(obj, TrainingSection):
+            scopes.update(department_scope(bolum_id) for bolum_id in _values(obj, 'bolum_id'))
+        elif isinstance(obj, Department) and obj in session.deleted:
+            scopes.add(department_scope(obj.id))
+    scopes.discard(user_scope(None))
+    scopes.discard(department_scope(None))
+    if scopes:
+        mark_changed(scopes, session)
+
+def career_progress(kullanici_id, bolum_id):
+    """Seviye bazında ilerleme: [{'seviye_id', 'level', 'total', 'completed', 'rate'}, ...]"""
+    if bolum_id is None:
+        return []
+
+    level_names = dict(level_choices())
+    return [
+        {
+            'seviye_id': seviye_id,
+            'level': level_names.get(seviye_id, '-'),
+            'total': total,
+            'completed': completed,
+            'rate': round(completed / total * 100, 1) if total else 0
+        }
+        for seviye_id, total, completed in _cached_progress(kullanici_id, bolum_id)
+    ]
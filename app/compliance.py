@@ -0,0 +1,173 @@
+"""
+Geçmişe dönük uyum (tamamlanma oranı) sorguları
+
+Durum geçişi olayları (app.status_events) belirli aralıklarla sıkıştırılmış
+snapshot'lara dönüştürülür: her snapshot, zamanından önceki tüm olayların
+eğitim/bölüm/durum bazında toplamıdır (sıfır olan sayılar saklanmaz).
+
+Bir andaki sayılar, o andan önceki en yakın snapshot'ın satırları ile
+snapshot'tan sonraki olayların tekrar oynatılmasıyla hesaplanır. Snapshot'lar
+düzenli oluşturulduğunda tekrar oynatılan olaylar en fazla bir aralık
+(COMPLIANCE_SNAPSHOT_DAYS) kadardır; tüm geçmiş hiçbir zaman taranmaz.
+
+Snapshot'lar flask build-snapshots ile (ör. günlük zamanlanmış görev) oluşturulur.
+Olay içermeyen aralıklar için snapshot oluşturulmaz.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from flask import current_app
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from app import db
+from app.models import ComplianceSnapshot, ComplianceSnapshotRow, TrainingStatusEvent
+from app.refdata import department_choices, training_choices
+from app.rollups import NO_DEPARTMENT
+
+event_table = TrainingStatusEvent.__table__
+row_table = ComplianceSnapshotRow.__table__
+
+# Açık transaction'ların daha eski zaman damgalı olayları snapshot'ı kaçırmasın diye
+SNAPSHOT_MARGIN = timedelta(minutes=10)
+
+def _window(start, end, bolum_id=None):
+    """start <= zaman < end aralığındaki olayların filtresi (start None ise başlangıçtan)"""
+    criteria = [event_table.c.zaman < end]
+    if start is not None:
+        criteria.append(event_table.c.zaman >= start)
+    if bolum_id is not None:
+        criteria.append(event_table.c.bolum_id == bolum_id)
+    return criteria
+
+def replay(start, end, bolum_id=None):
+    """Aralıktaki olayların {(egitim_id, bolum_id, durum): fark} toplamı (tek sorgu)"""
+    criteria = _window(start, end, bolum_id)
+    opened = (select(event_table.c.egitim_id, event_table.c.bolum_id,
+                     event_table.c.yeni_durum.label('durum'), func.count().label('fark'))
+              .where(event_table.c.yeni_durum.is_not(None), *criteria)
+              .group_by(event_table.c.egitim_id, event_table.c.bolum_id, event_table.c.yeni_durum))
+    closed = (select(event_table.c.egitim_id, event_table.c.bolum_id,
+                     event_table.c.onceki_durum, literal(0) - func.count())
+              .where(event_table.c.onceki_durum.is_not(None), *criteria)
+              .group_by(event_table.c.egitim_id, event_table.c.bolum_id, event_table.c.onceki_durum))
+
+    deltas = defaultdict(int)
+    for egitim_id, bolum, durum, fark in db.session.execute(union_all(opened, closed)):
+        deltas[(egitim_id, bolum, durum)] += fark
+    return deltas
+
+def snapshot_before(moment):
+    """Zamanı moment'tan önce (veya eşit) olan en yeni snapshot"""
+    return db.session.scalars(
+        select(ComplianceSnapshot).where(ComplianceSnapshot.zaman <= moment)
+        .order_by(ComplianceSnapshot.zaman.desc()).limit(1)
+    ).first()
+
+def snapshot_counts(snapshot_id, bolum_id=None):
+    query = select(row_table.c.egitim_id, row_table.c.bolum_id, row_table.c.durum, row_table.c.adet) \
+        .where(row_table.c.snapshot_id == snapshot_id)
+    if bolum_id is not None:
+        query = query.where(row_table.c.bolum_id == bolum_id)
+    return {(egitim_id, bolum, durum): adet for egitim_id, bolum, durum, adet in db.session.execute(query)}
+
+def counts_at(moment, bolum_id=None):
+    """moment anındaki (öncesindeki olaylarla) {(egitim_id, bolum_id, durum): adet} ve kullanılan snapshot"""
+    snapshot = snapshot_before(moment)
+    counts = defaultdict(int)
+    if snapshot is not None:
+        counts.update(snapshot_counts(snapshot.id, bolum_id))
+    for key, fark in replay(snapshot.zaman if snapshot else None, moment, bolum_id).items():
+        counts[key] += fark
+    return {key: adet for key, adet in counts.items() if adet}, snapshot
+
+def compliance_at(moment, bolum_id=None):
+    """Bir andaki tamamlanma oranları
+
+    bolum_id verilmezse bölüm bazında, verilirse o bölümün eğitimleri bazında
+    satırlar döner: {'rows': [...], 'toplam': {...}, 'snapshot': ComplianceSnapshot}
+    """
+    counts, snapshot = counts_at(moment, bolum_id)
+    if bolum_id is None:
+        labels, position = {NO_DEPARTMENT: 'Bölümsüz', **dict(department_choices())}, 1
+    else:
+        labels, position = dict(training_choices()), 0
+
+    totals = defaultdict(lambda: defaultdict(int))
+    for key, adet in counts.items():
+        totals[key[position]][key[2]] += adet
+
+    rows = [_rate_row(labels.get(key, f'#{key} (silinmiş)'), by_status, id=key)
+            for key, by_status in totals.items()]
+    rows.sort(key=lambda row: row['ad'])
+
+    overall = defaultdict(int)
+    for by_status in totals.values():
+        for durum, adet in by_status.items():
+            overall[durum] += adet
+    return {'rows': rows, 'toplam': _rate_row('Toplam', overall), 'snapshot': snapshot}
+
+def _rate_row(ad, by_status, **extra):
+    atanan = sum(by_status.values())
+    tamamlanan = by_status.get('tamamlandi', 0)
+    return {
+        'ad': ad,
+        'atanan': atanan,
+        'tamamlanan': tamamlanan,
+        'devam': by_status.get('devam', 0),
+        'baslamadi': by_status.get('baslamadi', 0),
+        'oran': round(tamamlanan / atanan * 100, 1) if atanan else 0,
+        **extra,
+    }
+
+def _first_boundary(interval):
+    """İlk olayın gününden itibaren ilk snapshot zamanı (UTC gece yarısına hizalı)"""
+    first = db.session.scalar(select(func.min(event_table.c.zaman)))
+    if first is None:
+        return None
+    return datetime.combine(first.date(), time()) + interval
+
+def build_snapshots(until=None, interval_days=None, rebuild=False):
+    """Son snapshot'tan until'e kadar her aralık sonu için snapshot oluştur
+
+    Her snapshot bir önceki snapshot'a aralıktaki olayların eklenmesiyle
+    hesaplanır ve ayrı commit edilir; yarıda kesilen çalışma kaldığı yerden
+    devam eder. Oluşturulan snapshot'ları döndürür.
+    """
+    interval = timedelta(days=interval_days or current_app.config.get('COMPLIANCE_SNAPSHOT_DAYS', 7))
+    until = until or datetime.utcnow() - SNAPSHOT_MARGIN
+
+    if rebuild:
+        db.session.execute(delete(row_table))
+        db.session.execute(delete(ComplianceSnapshot))
+        db.session.commit()
+
+    last = db.session.scalars(
+        select(ComplianceSnapshot).order_by(ComplianceSnapshot.zaman.desc()).limit(1)).first()
+    if last is not None:
+        state = defaultdict(int, snapshot_counts(last.id))
+        start, boundary = last.zaman, last.zaman + interval
+    else:
+        state = defaultdict(int)
+        start, boundary = None, _first_boundary(interval)
+        if boundary is None:
+            return []
+
+    created = []
+    while boundary <= until:
+        event_count = db.session.scalar(select(func.count()).select_from(event_table)
+                                        .where(*_window(start, boundary)))
+        if event_count:
+            for key, fark in replay(start, boundary).items():
+                state[key] += fark
+            snapshot = ComplianceSnapshot(zaman=boundary, olay_sayisi=event_count)
+            db.session.add(snapshot)
+            db.session.flush()
+            rows = [{'snapshot_id': snapshot.id, 'egitim_id': egitim_id, 'bolum_id': bolum_id,
+                     'durum': durum, 'adet': adet}
+                    for (egitim_id, bolum_id, durum), adet in state.items() if adet]
+            if rows:
+                db.session.execute(insert(row_table), rows)
+            db.session.commit()
+            created.append(snapshot)
+            start = boundary
+        boundary += interval
+    return created
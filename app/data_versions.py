@@ -0,0 +1,121 @@
+"""
+Tablo veri sürümleri
+
+data_versions tablosunda her tablo için bir değişiklik sayacı tutulur. Bir
+flush bir tabloya yazdığında tablo session üzerinde işaretlenir; işaretlenen
+tüm tabloların sayaçları commit öncesinde (before_commit) tek bir sıralı upsert
+ile artırılır. Böylece sürüm ile veri birlikte commit edilir ve tüm süreçler
+(gunicorn worker'ları, arka plan işleri) aynı sürümü görür. Sayaç satırları
+yalnızca commit anında ve her zaman aynı sırayla kilitlendiğinden yazan
+transaction'lar flush boyunca birbirini beklemez ve kilitlenmez. Sürümler
+koşullu GET için ETag hesaplamada kullanılır (app.http_cache).
+
+Silinen kayıtların veritabanında ON DELETE kurallarıyla değişen tabloları
+(ör. eğitim silinince user_trainings) da artırılır.
+
+Session olaylarını atlayan toplu yazmalar (Core INSERT/UPDATE/DELETE) aynı
+transaction içinde mark_changed(tablolar) çağırmalıdır. Session dışındaki
+bağlantılarda bump(connection, tablolar) sayaçları hemen artırır.
+"""
+
+from collections import defaultdict
+from sqlalchemy import event, insert, select, update
+from app import db
+from app.models import DataVersion
+
+version_table = DataVersion.__table__
+
+PENDING_KEY = '_data_versions_changed'
+
+def _on_delete_rules():
+    """{tablo: [(bağımlı tablo, kural), ...]} ON DELETE kuralı olan foreign key'ler"""
+    rules = defaultdict(list)
+    for table in db.metadata.tables.values():
+        for fk in table.foreign_keys:
+            if fk.ondelete:
+                rules[fk.column.table.name].append((table.name, fk.ondelete.upper()))
+    return rules
+
+_ON_DELETE = _on_delete_rules()
+
+def cascaded_tables(table_name):
+    """Tablodan satır silindiğinde veritabanının değiştirdiği diğer tablolar"""
+    changed, stack = set(), [table_name]
+    while stack:
+        for child, rule in _ON_DELETE.get(stack.pop(), ()):
+            if child not in changed:
+                changed.add(child)
+                if rule == 'CASCADE':
+                    stack.append(child)
+    return changed
+
+def _upsert(dialect_name):
+    """surum sütununu artıran INSERT ... ON CONFLICT ifadesi (destekleyen veritabanlarında)"""
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(version_table)
+    return stmt.on_conflict_do_update(
+        index_elements=['tablo'],
+        set_={'surum': version_table.c.surum + 1}
+    )
+
+def bump(connection, tables):
+    """Verilen tabloların sürümünü mevcut transaction içinde bir artır"""
+    tables = sorted(set(tables))
+    if not tables:
+        return
+
+    upsert = _upsert(connection.dialect.name)
+    if upsert is not None:
+        connection.execute(upsert, [{'tablo': tablo, 'surum': 1} for tablo in tables])
+        return
+
+    for tablo in tables:
+        result = connection.execute(
+            update(version_table).where(version_table.c.tablo == tablo)
+            .values(surum=version_table.c.surum + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(version_table).values(tablo=tablo, surum=1))
+
+def mark_changed(tables, session=None):
+    """Tabloları mevcut transaction commit edilirken artırılmak üzere işaretle"""
+    session = session if session is not None else db.session()
+    session.info.setdefault(PENDING_KEY, set()).update(tables)
+
+def versions(tables):
+    """{tablo: sürüm} (hiç yazılmamış tablolar için 0); ORM kullanmadan tek sorgu"""
+    current = dict(db.session.execute(
+        select(version_table.c.tablo, version_table.c.surum)
+        .where(version_table.c.tablo.in_(tables))
+    ).all())
+    return {tablo: current.get(tablo, 0) for tablo in tables}
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    changed = {obj.__table__.name for obj in session.new}
+    changed.update(obj.__table__.name for obj in session.dirty
+                   if session.is_modified(obj, include_collections=False))
+    for obj in session.deleted:
+        changed.add(obj.__table__.name)
+        changed.update(cascaded_tables(obj.__table__.name))
+    changed.discard(version_table.name)
+    if changed:
+        mark_changed(changed, session)
+
+@event.listens_for(db.session, 'before_commit')
+def _bump_pending(session):
+    # Commit'in kendi flush'ı bu olaydan sonra çalışır; bekleyen değişiklikler
+    # önce yazılır ki işaretlenen tablolar eksiksiz olsun
+    session.flush()
+    changed = session.info.pop(PENDING_KEY, None)
+    if changed:
+        bump(session.connection(), changed)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(PENDING_KEY, None)
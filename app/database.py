@@ -0,0 +1,121 @@
+"""
+Veritabanı bağlantı ayarları
+
+SQLALCHEMY_ENGINE_OPTIONS (havuz boyutu, taşma, pre-ping, recycle) config'den
+okunur. Bellek içi SQLite veritabanı StaticPool kullandığından havuz boyutu
+ayarları bu durumda çıkarılır.
+
+SQLite bağlantılarında her yeni bağlantıda şu PRAGMA'lar uygulanır:
+
+    journal_mode=WAL     okuyucular yazıcıyı beklemez
+    busy_timeout         kilitli veritabanında hemen hata yerine bekleme (ms)
+    synchronous=NORMAL   WAL ile güvenli, her commit'te fsync yok
+    foreign_keys=ON      ON DELETE CASCADE / SET NULL kuralları uygulanır
+
+Böylece birden fazla worker aynı anda yazdığında "database is locked" hatası
+yerine kısa bir bekleme yaşanır.
+
+REPLICA_DATABASE_URLS ile verilen okuma replikaları 'replica_1', 'replica_2', ...
+bind anahtarlarıyla SQLALCHEMY_BINDS'e eklenir. RoutingSession, session.info'da
+bir replika seçilmişse (app.replicas) yalnızca SELECT ifadelerini o replikaya
+gönderir; flush, INSERT/UPDATE/DELETE ve bağlantı istekleri birincil veritabanına
+gider ve session'ın sonraki okumaları da birincile döner.
+"""
+
+import sqlite3
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+_POOL_SIZE_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+REPLICA_PREFIX = 'replica_'
+# session.info anahtarı: okumaların yönlendirileceği replika bind anahtarı
+REPLICA_INFO_KEY = 'replica_bind'
+
+class RoutingSession(Session):
+    """Seçilmiş replikaya SELECT, birincil veritabanına diğer tüm ifadeleri gönderen session"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get(REPLICA_INFO_KEY)
+        if replica is not None and bind is None:
+            if not self._flushing and getattr(clause, 'is_select', False):
+                return self._db.engines[replica]
+            if self._flushing or clause is not None and getattr(clause, 'is_dml', False):
+                # Yazdıktan sonraki okumalar yazılanı görmeli
+                self.info[REPLICA_INFO_KEY] = None
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def replica_keys(app):
+    """Yapılandırılmış replika bind anahtarları"""
+    return sorted(key for key in app.config.get('SQLALCHEMY_BINDS') or {} if key.startswith(REPLICA_PREFIX))
+
+def is_memory_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def configure_engine_options(app):
+    """db.init_app'ten önce çağrılır; motor seçeneklerini veritabanına göre düzenle"""
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        for key in _POOL_SIZE_OPTIONS:
+            options.pop(key, None)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    for number, url in enumerate(app.config.get('REPLICA_DATABASE_URLS') or (), start=1):
+        binds[f'{REPLICA_PREFIX}{number}'] = url
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+def _sqlite_pragmas(app):
+    pragmas = []
+    if not is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']) and app.config.get('SQLITE_JOURNAL_MODE'):
+        pragmas.append(f"PRAGMA journal_mode={app.config['SQLITE_JOURNAL_MODE']}")
+    if app.config.get('SQLITE_BUSY_TIMEOUT') is not None:
+        pragmas.append(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT'])}")
+    if app.config.get('SQLITE_SYNCHRONOUS'):
+        pragmas.append(f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}")
+    if app.config.get('SQLITE_FOREIGN_KEYS', True):
+        pragmas.append('PRAGMA foreign_keys=ON')
+    return pragmas
+
+def init_app(app, db):
+    """db.init_app'ten sonra çağrılır; SQLite bağlantılarına (replikalar dahil) PRAGMA'ları uygula"""
+    with app.app_context():
+        engines = list(db.engines.values())
+    pragmas = _sqlite_pragmas(app)
+
+    for engine in engines:
+        if engine.dialect.name != 'sqlite':
+            continue
+
+        @event.listens_for(engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+def sync_sqlite_replicas(app):
+    """Birincil SQLite dosyasını replika dosyalarına kopyala (yerel geliştirme ve test için)
+
+    SQLite'ta replikasyon olmadığından replikalar bu komutla güncellenir;
+    PostgreSQL replikaları veritabanının kendi replikasyonuyla güncel tutulur.
+    Kopyalanan dosya yollarını döndürür.
+    """
+    primary = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if primary.get_backend_name() != 'sqlite' or is_memory_sqlite(primary):
+        raise ValueError('Birincil veritabanı bir SQLite dosyası değil')
+
+    copied = []
+    with sqlite3.connect(primary.database) as source:
+        for key in replica_keys(app):
+            replica = make_url(app.config['SQLALCHEMY_BINDS'][key])
+            if replica.get_backend_name() != 'sqlite' or is_memory_sqlite(replica):
+                raise ValueError(f'{key} bir SQLite dosyası değil')
+            with sqlite3.connect(replica.database) as target:
+                source.backup(target)
+            copied.append(replica.database)
+    return copied
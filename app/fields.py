@@ -0,0 +1,78 @@
+"""
+Ortak form alanları
+"""
+
+from wtforms import Field, IntegerField
+from wtforms.validators import ValidationError
+from wtforms.widgets import TextInput
+from app import db
+
+class ModelIdField(IntegerField):
+    """Gönderilen id'yi seçim listesi yüklemeden veritabanında doğrulayan alan
+
+    Doğrulama tek bir birincil anahtar sorgusuyla yapılır; bulunan kayıt
+    field.object üzerinden kullanılabilir.
+    """
+
+    def __init__(self, label=None, validators=None, model=None, message=None, **kwargs):
+        super(ModelIdField, self).__init__(label, validators, **kwargs)
+        self.model = model
+        self.message = message or 'Seçilen kayıt bulunamadı.'
+        self.object = None
+
+    def pre_validate(self, form):
+        if self.data is None:
+            return
+        self.object = db.session.get(self.model, self.data)
+        if self.object is None:
+            raise ValidationError(self.message)
+
+class ModelIdListField(Field):
+    """Birden fazla id'yi seçim listesi yüklemeden tek IN (...) sorgusuyla doğrulayan alan
+
+    Id'ler tekrarlanan alan (egitim_ids=1&egitim_ids=2) veya virgülle ayrılmış
+    metin olarak gönderilebilir; tekrarlar atılır. Bulunan kayıtlar gönderilme
+    sırasıyla field.objects üzerinden kullanılabilir. Sayfada yalnızca seçili
+    id'ler bulunur; seçim arayüzü kayıtları JSON API'den (app.api) arar.
+    """
+    widget = TextInput()
+
+    def __init__(self, label=None, validators=None, model=None, message=None, **kwargs):
+        super(ModelIdListField, self).__init__(label, validators, **kwargs)
+        self.model = model
+        self.message = message or 'Seçilen kayıtlardan bazıları bulunamadı'
+        self.objects = []
+
+    def process_data(self, value):
+        self.data = list(value or [])
+
+    def process_formdata(self, valuelist):
+        ids = []
+        invalid = False
+        for value in valuelist:
+            for part in value.split(','):
+                part = part.strip()
+                if not part:
+                    continue
+                try:
+                    ids.append(int(part))
+                except ValueError:
+                    invalid = True
+        # Geçerli id'ler korunur; form hatayla döndüğünde seçimler kaybolmaz
+        self.data = list(dict.fromkeys(ids))
+        if invalid:
+            raise ValueError('Geçersiz kayıt numarası.')
+
+    def _value(self):
+        return ','.join(str(id) for id in self.data or [])
+
+    def pre_validate(self, form):
+        self.objects = []
+        if not self.data:
+            return
+        found = {obj.id: obj for obj in db.session.scalars(
+            db.select(self.model).where(self.model.id.in_(self.data)))}
+        missing = [id for id in self.data if id not in found]
+        if missing:
+            raise ValidationError(f"{self.message}: {', '.join(str(id) for id in missing)}")
+        self.objects = [found[id] for id in self.data]
@@ -0,0 +1,155 @@
+"""
+Sık kullanılan sorgu kaydı
+
+Sıcak yollardaki sorgular örnek parametrelerle burada kaydedilir.
+`flask explain-hot-queries` her biri için sorgu planını gösterir ve tam tablo
+taraması yapan sorgu varsa hata ile çıkar:
+
+    SQLite     -> EXPLAIN QUERY PLAN ('SCAN <tablo>' satırları)
+    PostgreSQL -> EXPLAIN (ANALYZE, FORMAT JSON), enable_seqscan kapalıyken
+                  ('Seq Scan' düğümleri)
+
+Sorgular gerçek sorgu oluşturucularından üretilir; route'taki sorgu
+değiştiğinde burada da aynısı denetlenir.
+"""
+
+import re
+from collections import OrderedDict
+from sqlalchemy import text
+from sqlalchemy.orm import Query
+from app import db
+
+HOT_QUERIES = OrderedDict()
+
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+def hot_query(name, allow_scans=()):
+    """Sorgu üreten fonksiyonu kaydet (allow_scans: taranmasına izin verilen küçük tablolar)"""
+    def decorator(factory):
+        HOT_QUERIES[name] = (factory, frozenset(allow_scans))
+        return factory
+    return decorator
+
+def _statement(query):
+    return query.statement if isinstance(query, Query) else query
+
+def _explain_sqlite(connection, sql):
+    plan, scans = [], []
+    for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}'):
+        detail = row[3]
+        plan.append(detail)
+        match = _SQLITE_SCAN.match(detail)
+        if match:
+            scans.append(match.group(1))
+    return plan, scans
+
+def _walk_pg_plan(node, depth, plan, scans):
+    label = node['Node Type']
+    if 'Relation Name' in node:
+        label += f" on {node['Relation Name']}"
+    if 'Index Name' in node:
+        label += f" using {node['Index Name']}"
+    if 'Actual Total Time' in node:
+        label += f" ({node['Actual Total Time']:.2f} ms, {node.get('Actual Rows', 0)} satır)"
+    plan.append('  ' * depth + label)
+    if node['Node Type'] == 'Seq Scan':
+        scans.append(node['Relation Name'])
+    for child in node.get('Plans', ()):
+        _walk_pg_plan(child, depth + 1, plan, scans)
+
+def _explain_postgresql(connection, sql):
+    # Küçük tablolarda planlayıcı her durumda Seq Scan seçebilir; kapatıldığında
+    # yine de Seq Scan kullanılıyorsa sorgu için uygun indeks yoktur
+    connection.execute(text('SET LOCAL enable_seqscan = off'))
+    result = connection.exec_driver_sql(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}').scalar()
+    plan, scans = [], []
+    _walk_pg_plan(result[0]['Plan'], 0, plan, scans)
+    return plan, scans
+
+_EXPLAINERS = {
+    'sqlite': _explain_sqlite,
+    'postgresql': _explain_postgresql,
+}
+
+def explain(connection, query):
+    """Sorgunun planını ve tam taranan tabloları döndür: (plan satırları, tablolar)"""
+    dialect = connection.dialect
+    explainer = _EXPLAINERS.get(dialect.name)
+    if explainer is None:
+        raise RuntimeError(f'{dialect.name} veritabanı için sorgu planı desteklenmiyor.')
+    compiled = _statement(query).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+    return explainer(connection, str(compiled))
+
+def explain_all():
+    """Kayıtlı tüm sorguların planları: [(ad, plan, izinsiz taramalar), ...]"""
+    results = []
+    with db.engine.connect() as connection:
+        for name, (factory, allow_scans) in HOT_QUERIES.items():
+            transaction = connection.begin()
+            try:
+                plan, scans = explain(connection, factory())
+            finally:
+                transaction.rollback()
+            results.append((name, plan, [table for table in scans if table not in allow_scans]))
+    return results
+
+# Kayıtlı sorgular. Örnek parametre olarak 1 kullanılır; planlar değere bağlı değildir.
+
+@hot_query('rapor_egitim_durum')
+def _report_training_status():
+    from app.reports.export import export_query
+    return export_query({'egitim_id': 1, 'durum': 'tamamlandi'})
+
+@hot_query('rapor_bolum_egitimleri', allow_scans=('training_progress_rollups',))
+def _report_department_trainings():
+    from app.models import TrainingSection
+    from app.reports.queries import _training_stats_query
+    return _training_stats_query().filter(TrainingSection.bolum_id == 1)
+
+@hot_query('ozet_tablo_yeniden_hesaplama')
+def _rollup_source():
+    from app.rollups import _source_query
+    return _source_query([1])
+
+@hot_query('dashboard_durum_sayilari')
+def _dashboard_status_counts():
+    from app.user.queries import status_counts_query
+    return status_counts_query(1)
+
+@hot_query('dashboard_son_tamamlananlar')
+def _dashboard_recently_completed():
+    from app.user.queries import panel_query
+    return panel_query(1, 'tamamlandi')
+
+@hot_query('kariyer_yolu')
+def _career_path():
+    from app.career import progress_query
+    return progress_query(1, 1)
+
+@hot_query('kullanici_egitimleri')
+def _user_trainings():
+    from app.models import UserTraining
+    return UserTraining.with_profile('training_list').filter_by(kullanici_id=1, durum='baslamadi')
+
+@hot_query('bolum_egitim_iliskileri')
+def _department_sections():
+    from app.models import TrainingSection
+    return TrainingSection.with_profile('section_list').filter_by(bolum_id=1)
+
+@hot_query('admin_egitim_listesi')
+def _admin_trainings():
+    from app.models import Training
+    from app.pagination import keyset_query
+    return keyset_query(Training.with_profile('training_list'), Training, forward=False).limit(21)
+
+@hot_query('admin_kullanici_listesi')
+def _admin_users():
+    from app.models import User
+    from app.pagination import keyset_query
+    return keyset_query(User.with_profile('user_list'), User, forward=False).limit(21)
+
+@hot_query('admin_atama_listesi')
+def _admin_assignments():
+    from app.models import UserTraining
+    from app.pagination import keyset_query
+    return keyset_query(UserTraining.with_profile('assignment_list'), UserTraining, forward=False).limit(21)
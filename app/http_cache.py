@@ -0,0 +1,124 @@
+"""
+Koşullu GET ve işlenmiş sayfa önbelleği
+
+@conditional('departments', 'trainings', ...) ile işaretlenen görünümler için
+zayıf bir ETag hesaplanır. ETag şunlardan türetilir:
+
+    - görünümün okuduğu tabloların veri sürümleri (app.data_versions)
+    - istek yolu ve sorgu parametreleri
+    - oturum açmış kullanıcının id, isim ve rolü (menü ve başlık bunlara bağlı)
+    - uygulama kodunun sürümü (şablon/kod değişince eski ETag'ler geçersiz olur)
+    - verilirse key() çağrısının sonucu (ör. varsayılan tarihi bugün olan
+      görünümlerde günün tarihi)
+
+İstemci aynı ETag'i If-None-Match ile gönderirse görünüm çalıştırılmadan (ORM
+ve Jinja kullanılmadan, tek bir sürüm sorgusuyla) 304 döndürülür.
+
+RENDER_CACHE_SIZE > 0 ise 200 yanıtların gövdesi ETag anahtarıyla süreç içinde
+tutulur; ETag göndermeyen tekrar istekler (ör. yeni sekme) de görünüm
+çalıştırılmadan bellekten yanıtlanır. Veri değiştiğinde ETag de değiştiğinden
+eski kayıtlar kullanılmaz ve LRU ile düşer.
+
+Flash mesajı bekleyen isteklerde önbellek kullanılmaz. HTTP_CACHE=False ile
+tamamen kapatılır. Form (CSRF token) içeren sayfalar işaretlenmemelidir.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from app import data_versions
+
+CACHE_CONTROL = 'private, no-cache'
+
+class RenderCache:
+    """ETag -> (gövde, mimetype) LRU önbelleği"""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def set(self, key, body, mimetype):
+        with self._lock:
+            self._items[key] = (body, mimetype)
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+def code_version(root_path):
+    """Uygulama paketindeki dosyaların en son değişme zamanından türetilen sürüm"""
+    latest = 0
+    for directory, _, files in os.walk(root_path):
+        for name in files:
+            if name.endswith(('.py', '.html')):
+                latest = max(latest, os.stat(os.path.join(directory, name)).st_mtime_ns)
+    return str(latest)
+
+def compute_etag(tables, key=None):
+    salt = current_app.extensions['http_cache']['salt']
+    versions = data_versions.versions(tables)
+    parts = [salt, request.full_path]
+    if key is not None:
+        parts.append(str(key()))
+    if current_user.is_authenticated:
+        parts += [current_user.get_id(), current_user.isim, current_user.rol]
+    parts += [f'{tablo}:{versions[tablo]}' for tablo in sorted(versions)]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:24]
+
+def _with_etag(response, etag):
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+def conditional(*tables, key=None):
+    """Görünümü verilen tabloların veri sürümlerine bağlı ETag ile önbelleğe al
+
+    key: yanıt istek parametreleri ve veri dışında bir değere (ör. saate) de
+    bağlıysa o değeri döndüren fonksiyon
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            state = current_app.extensions.get('http_cache')
+            if state is None or request.method != 'GET' or '_flashes' in session:
+                return view(*args, **kwargs)
+
+            etag = compute_etag(tables, key)
+            if request.if_none_match.contains_weak(etag):
+                return _with_etag(current_app.response_class(status=304), etag)
+
+            pages = state['pages']
+            cached = pages.get(etag) if pages is not None else None
+            if cached is not None:
+                body, mimetype = cached
+                return _with_etag(current_app.response_class(body, mimetype=mimetype), etag)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed or '_flashes' in session:
+                return response
+            if pages is not None:
+                pages.set(etag, response.get_data(), response.mimetype)
+            return _with_etag(response, etag)
+        return wrapper
+    return decorator
+
+def init_app(app):
+    if not app.config.get('HTTP_CACHE', True):
+        app.extensions['http_cache'] = None
+        return
+    size = app.config.get('RENDER_CACHE_SIZE', 0)
+    app.extensions['http_cache'] = {
+        'salt': app.config.get('HTTP_CACHE_SALT') or code_version(app.root_path),
+        'pages': RenderCache(size) if size > 0 else None,
+    }
@@ -0,0 +1,241 @@
+"""
+Kullanıcı kimlik önbelleği
+
+Flask-Login her istekte oturumdaki kullanıcıyı yükler. Bu modül yetkilendirme
+için gereken alanları (id, isim, e-posta, rol, bölüm, aktiflik, şifre sürümü)
+önbellekte tutar; böylece çoğu istek users tablosuna gitmez. current_user önbellekteki alanları taşıyan bir Identity nesnesidir;
+önbellekte olmayan bir alan okunduğunda veya bir alan değiştirildiğinde gerçek
+User kaydı yüklenir ve işlem ona aktarılır.
+
+IDENTITY_CACHE_BACKEND ile süreçler arası paylaşılan bir önbellek (ör. Redis)
+tanımlanırsa kayıtlar orada IDENTITY_CACHE_TTL süresince tutulur ve her istekte
+oradan okunur: 'memory' bellek içi yedeği seçer, 'paket.modul:fabrika'
+biçimindeki değer fabrika(app) ile oluşturulan nesneyi kullanır. Arka uç
+get(key), set(key, value, ttl) ve delete(key) sağlamalıdır.
+
+Arka uç yoksa kayıtlar süreç içi bir LRU önbellekte tutulur. Başka bir
+worker'daki değişiklik (pasifleştirme, rol değişikliği, şifre değişikliği) bu
+süreçten silinemediği için yerel kayıtlar en fazla IDENTITY_CACHE_LOCAL_TTL
+saniye (varsayılan birkaç saniye) kullanılır.
+
+users tablosuna yazan bir transaction commit edildiğinde ilgili kayıtlar yerel
+ve paylaşılan önbellekten silinir. Session olaylarını atlayan toplu
+yazmalardan sonra invalidate() çağrılmalıdır.
+
+Şifre sürümü şifre özetinden türetilir ve girişte oturuma yazılır. Şifre
+değiştiğinde eski oturumlar geçersiz olur.
+"""
+
+import hashlib
+import importlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from flask import current_app, has_app_context, session as flask_session
+from sqlalchemy import event
+from app import db, login_manager
+from app.models import Department, User
+
+FIELDS = ('id', 'isim', 'email', 'rol', 'bolum_id', 'is_active', 'created_at')
+SESSION_KEY = '_password_version'
+
+_versions = defaultdict(int)
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+class MemoryBackend:
+    """Paylaşılan önbellek arka ucunun süreç içi yedeği"""
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                self._items.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+def _create_backend(app):
+    setting = app.config.get('IDENTITY_CACHE_BACKEND')
+    if not setting:
+        return None
+    if setting == 'memory':
+        return MemoryBackend()
+    module_name, _, factory = setting.partition(':')
+    return getattr(importlib.import_module(module_name), factory)(app)
+
+def password_version(sifre_hash):
+    return hashlib.sha256(sifre_hash.encode()).hexdigest()[:16]
+
+def snapshot(user):
+    """User kaydından önbelleğe alınacak alanlar"""
+    data = {field: getattr(user, field) for field in FIELDS}
+    data['password_version'] = password_version(user.sifre_hash)
+    return data
+
+def _backend_key(user_id):
+    return f'identity:{user_id}'
+
+def invalidate(user_ids):
+    """Verilen kullanıcıları yerel ve paylaşılan önbellekten sil"""
+    backend = current_app.extensions.get('identity_cache') if has_app_context() else None
+    with _lock:
+        for user_id in user_ids:
+            _versions[user_id] += 1
+            _cache.pop(user_id, None)
+    if backend is not None:
+        for user_id in user_ids:
+            backend.delete(_backend_key(user_id))
+
+def _load(user_id):
+    user = db.session.get(User, user_id)
+    return snapshot(user) if user is not None else None
+
+def _shared_identity(backend, user_id, ttl):
+    """Paylaşılan arka uçtaki kayıt; yoksa veritabanından yüklenip yazılır"""
+    key = _backend_key(user_id)
+    data = backend.get(key)
+    if data is None:
+        data = _load(user_id)
+        if data is not None:
+            backend.set(key, data, ttl)
+    return data
+
+def cached_identity(user_id):
+    """Kullanıcının önbellekteki alanları; kullanıcı yoksa None"""
+    config = current_app.config
+    backend = current_app.extensions.get('identity_cache')
+    if backend is not None:
+        # Diğer worker'ların invalidate() çağrıları yalnızca paylaşılan arka uçta görünür
+        return _shared_identity(backend, user_id, config.get('IDENTITY_CACHE_TTL', 300))
+
+    ttl = config.get('IDENTITY_CACHE_LOCAL_TTL', 5)
+    version = _versions[user_id]
+    now = time.monotonic()
+
+    entry = _cache.get(user_id)
+    if entry is not None:
+        cached_version, loaded_at, data = entry
+        if cached_version == version and now - loaded_at < ttl:
+            with _lock:
+                _cache.move_to_end(user_id)
+            return data
+
+    data = _load(user_id)
+    if data is None:
+        return None
+
+    with _lock:
+        # Yükleme sırasında kayıt değiştiyse eski veri önbelleğe yazılmaz
+        if _versions[user_id] == version:
+            _cache[user_id] = (version, now, data)
+            _cache.move_to_end(user_id)
+            while len(_cache) > config.get('IDENTITY_CACHE_SIZE', 10000):
+                _cache.popitem(last=False)
+    return data
+
+class Identity:
+    """current_user olarak kullanılan, önbellekten oluşturulmuş kullanıcı"""
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, data):
+        object.__setattr__(self, '_data', dict(data))
+        object.__setattr__(self, '_user', None)
+
+    @property
+    def user(self):
+        """Gerçek User kaydı (ilk erişimde yüklenir)"""
+        if self._user is None:
+            object.__setattr__(self, '_user', db.session.get(User, self._data['id']))
+        return self._user
+
+    def __getattr__(self, name):
+        if name in self._data:
+            return self._data[name]
+        return getattr(self.user, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.user, name, value)
+        if name in self._data:
+            self._data[name] = value
+
+    def __eq__(self, other):
+        if isinstance(other, (Identity, User)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._data['id'])
+
+    def get_id(self):
+        return str(self._data['id'])
+
+    def is_admin(self):
+        return self.rol == 'Admin'
+
+    def is_egitmen(self):
+        return self.rol == 'Eğitmen'
+
+    def __repr__(self):
+        return f'<Identity {self.isim}>'
+
+def remember_password_version(user):
+    """Girişte veya şifre değiştikten sonra oturumun şifre sürümünü kaydet"""
+    flask_session[SESSION_KEY] = password_version(user.sifre_hash)
+
+@login_manager.user_loader
+def load_user(id):
+    data = cached_identity(int(id))
+    if data is None or not data['is_active']:
+        return None
+    # Şifre değiştirildikten sonra eski oturumlar geçersiz
+    expected = flask_session.get(SESSION_KEY)
+    if expected is not None and expected != data['password_version']:
+        return None
+    return Identity(data)
+
+def init_app(app):
+    app.extensions['identity_cache'] = _create_backend(app)
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_cascaded(session, flush_context, instances):
+    """Silinen bölümlerin kullanıcıları veritabanında bölümsüz kalır; önceden topla"""
+    deleted_departments = [obj.id for obj in session.deleted if isinstance(obj, Department)]
+    if not deleted_departments:
+        return
+    changed = session.info.setdefault('_identity_changed', set())
+    changed.update(session.connection().scalars(
+        db.select(User.id).where(User.bolum_id.in_(deleted_departments))))
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_changes(session, flush_context):
+    changed = session.info.setdefault('_identity_changed', set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_changed(session):
+    changed = session.info.pop('_identity_changed', None)
+    if changed:
+        invalidate(changed)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('_identity_changed', None)
@@ -0,0 +1,167 @@
+"""
+İstek bazında SQL ölçümü
+
+Her istek için çalışan sorgu sayısı, toplam veritabanı süresi ve en yavaş
+sorgular toplanır ve şu yollarla raporlanır:
+
+    - 'app.sql' loglayıcısına JSON satırı (yavaş sorgular uyarı olarak)
+    - Server-Timing yanıt başlığı (tarayıcı geliştirici araçlarında görünür)
+    - PERF_RING_BUFFER_SIZE > 0 ise bellek içi halka tampon (/admin/perf)
+
+QUERY_BUDGETS ({endpoint: en fazla sorgu}) ve QUERY_BUDGET_DEFAULT ile
+endpoint başına sorgu bütçesi tanımlanır. Bütçe aşıldığında QUERY_BUDGET_MODE
+ayarına göre uyarı loglanır veya hata fırlatılır:
+
+    'raise' -> QueryBudgetExceeded (testlerde varsayılan)
+    'log'   -> uyarı logu (diğer durumlarda varsayılan)
+    'off'   -> kapalı
+
+Akış halindeki yanıtlarda (ör. dışa aktarım) gövde üretilirken çalışan
+sorgular ölçüme dahil edilmez.
+"""
+
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.sql')
+
+SLOWEST_KEPT = 5
+STATEMENT_PREVIEW = 300
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+class RequestStats:
+    """Bir istekte çalışan sorguların özeti"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.slowest = []
+
+    def record(self, statement, duration_ms):
+        self.query_count += 1
+        self.db_ms += duration_ms
+        if len(self.slowest) < SLOWEST_KEPT or duration_ms > self.slowest[-1][0]:
+            self.slowest.append((duration_ms, ' '.join(statement.split())[:STATEMENT_PREVIEW]))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+def _budget_mode(app):
+    mode = app.config.get('QUERY_BUDGET_MODE')
+    if mode:
+        return mode
+    return 'raise' if app.testing else 'log'
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('_query_started')
+    if not started:
+        return
+    duration_ms = (time.perf_counter() - started.pop()) * 1000
+    if not has_request_context():
+        return
+    stats = g.get('_sql_stats')
+    if stats is None:
+        return
+    stats.record(statement, duration_ms)
+
+    if duration_ms >= current_app.config.get('SLOW_QUERY_MS', 100):
+        logger.warning(json.dumps({
+            'event': 'slow_query',
+            'endpoint': request.endpoint,
+            'path': request.path,
+            'ms': round(duration_ms, 2),
+            'statement': ' '.join(statement.split())[:STATEMENT_PREVIEW],
+        }, ensure_ascii=False))
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('_query_started'):
+        connection.info['_query_started'].pop()
+
+def _start_request():
+    g._sql_stats = RequestStats()
+
+def _finish_request(response):
+    stats = g.pop('_sql_stats', None)
+    if stats is None:
+        return response
+
+    app = current_app._get_current_object()
+    total_ms = (time.perf_counter() - stats.started) * 1000
+    response.headers.add('Server-Timing', f'db;dur={stats.db_ms:.1f};desc="{stats.query_count} sorgu"')
+    response.headers.add('Server-Timing', f'app;dur={total_ms:.1f}')
+
+    entry = {
+        'time': datetime.utcnow().isoformat(timespec='seconds'),
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'queries': stats.query_count,
+        'db_ms': round(stats.db_ms, 2),
+        'total_ms': round(total_ms, 2),
+        'slowest': [{'ms': round(ms, 2), 'statement': statement} for ms, statement in stats.slowest],
+    }
+    logger.info(json.dumps(entry, ensure_ascii=False))
+
+    buffer = app.extensions['instrumentation']
+    if buffer is not None:
+        buffer.append(entry)
+
+    budget = app.config.get('QUERY_BUDGETS', {}).get(request.endpoint, app.config.get('QUERY_BUDGET_DEFAULT'))
+    if budget is not None and stats.query_count > budget:
+        mode = _budget_mode(app)
+        message = f'{request.endpoint}: {stats.query_count} sorgu çalıştı (bütçe {budget})'
+        if mode == 'raise':
+            raise QueryBudgetExceeded(message)
+        if mode == 'log':
+            logger.warning(json.dumps({'event': 'query_budget_exceeded', **entry}, ensure_ascii=False))
+    return response
+
+def recent_requests():
+    """Halka tampondaki istekler (en yeni önce)"""
+    buffer = current_app.extensions.get('instrumentation')
+    return list(reversed(buffer)) if buffer is not None else []
+
+def endpoint_summary(entries):
+    """Endpoint bazında istek sayısı, ortalama/en fazla sorgu ve ortalama DB süresi"""
+    groups = defaultdict(list)
+    for entry in entries:
+        groups[entry['endpoint']].append(entry)
+
+    summary = []
+    for endpoint, items in groups.items():
+        summary.append({
+            'endpoint': endpoint,
+            'requests': len(items),
+            'avg_queries': round(sum(item['queries'] for item in items) / len(items), 1),
+            'max_queries': max(item['queries'] for item in items),
+            'avg_db_ms': round(sum(item['db_ms'] for item in items) / len(items), 2),
+            'budget': current_app.config.get('QUERY_BUDGETS', {}).get(
+                endpoint, current_app.config.get('QUERY_BUDGET_DEFAULT')),
+        })
+    return sorted(summary, key=lambda row: row['max_queries'], reverse=True)
+
+def init_app(app):
+    size = app.config.get('PERF_RING_BUFFER_SIZE', 0)
+    app.extensions['instrumentation'] = deque(maxlen=size) if size else None
+
+    if not app.config.get('SQL_INSTRUMENTATION', True):
+        return
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
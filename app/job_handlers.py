@@ -0,0 +1,144 @@
+"""
+Arka plan iş türleri
+
+Her işleyici app.jobs.job ile kaydedilir ve iş parametrelerini anahtar kelime
+argümanı olarak alır. Core ile yapılan toplu silmeler session olaylarını
+atladığından özet tablo, durum olayları ve veri sürümleri burada elle güncellenir.
+"""
+
+import os
+from sqlalchemy import delete, func, select
+from werkzeug.datastructures import MultiDict
+from app import db
+from app.assignments import bulk_assign
+from app.data_versions import mark_changed
+from app.jobs import job, files_dir
+from app.models import Department, Training, User, UserTraining
+from app.reports.export import generate_csv, generate_xlsx, parse_filters
+from app.rollups import NO_DEPARTMENT, apply_deltas, rebuild_rollups
+from app.status_events import record
+from app.user_import import import_users as import_user_file
+
+DELETE_BATCH_SIZE = 5000
+
+@job('delete_training', 'Eğitim silme')
+def delete_training(ctx, egitim_id):
+    """Eğitimin atamalarını parça parça, ardından eğitimi sil"""
+    training = db.session.get(Training, egitim_id)
+    if training is None:
+        return {'silinen_atama': 0}
+    label = f'{training.kod} - {training.baslik}'
+
+    total = db.session.scalar(select(func.count(UserTraining.id)).where(UserTraining.egitim_id == egitim_id))
+    ctx.progress(0, total + 1, f'{label}: atamalar siliniyor')
+
+    deleted = 0
+    bolum_id = func.coalesce(User.bolum_id, NO_DEPARTMENT)
+    while True:
+        rows = db.session.execute(
+            select(UserTraining.id, UserTraining.kullanici_id, bolum_id, UserTraining.durum)
+            .join(User, User.id == UserTraining.kullanici_id)
+            .where(UserTraining.egitim_id == egitim_id)
+            .order_by(UserTraining.id)
+            .limit(DELETE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        deltas = {}
+        for _, _, bolum, durum in rows:
+            deltas[(egitim_id, bolum, durum)] = deltas.get((egitim_id, bolum, durum), 0) - 1
+        db.session.execute(delete(UserTraining).where(UserTraining.id.in_([row[0] for row in rows])))
+        apply_deltas(db.session.connection(), deltas)
+        mark_changed([UserTraining.__tablename__])
+        record(db.session.connection(), [
+            {'atama_id': atama_id, 'kullanici_id': kullanici_id, 'egitim_id': egitim_id,
+             'bolum_id': bolum, 'onceki_durum': durum, 'yeni_durum': None}
+            for atama_id, kullanici_id, bolum, durum in rows
+        ])
+
+        deleted += len(rows)
+        ctx.progress(deleted, message=f'{label}: {deleted}/{total} atama silindi')
+
+    # Kalan bölüm ilişkileri ON DELETE CASCADE ile silinir; ön koşul grafı,
+    # seçim listeleri ve özet tablo session olaylarıyla güncellenir
+    db.session.delete(training)
+    db.session.commit()
+    ctx.progress(total + 1, message=f'{label} silindi')
+    return {'egitim': label, 'silinen_atama': deleted}
+
+@job('delete_department', 'Bölüm silme')
+def delete_department(ctx, bolum_id):
+    """Bölümü sil; eğitim ilişkileri silinir, kullanıcılar bölümsüz kalır"""
+    department = db.session.get(Department, bolum_id)
+    if department is None:
+        return {'bolumsuz_kalan_kullanici': 0}
+    label = department.ad
+
+    users = db.session.scalar(select(func.count(User.id)).where(User.bolum_id == bolum_id))
+    ctx.progress(0, 1, f'{label} siliniyor')
+    db.session.delete(department)
+    db.session.commit()
+    ctx.progress(1, message=f'{label} silindi')
+    return {'bolum': label, 'bolumsuz_kalan_kullanici': users}
+
+@job('bulk_assign', 'Toplu eğitim atama')
+def bulk_assign_job(ctx, **filters):
+    ctx.progress(0, 1, 'Atamalar ekleniyor')
+    result = bulk_assign(**filters)
+    db.session.commit()
+    ctx.progress(1, message=f'{result.inserted} yeni atama eklendi')
+    return result._asdict()
+
+@job('import_users', 'Kullanıcı aktarımı')
+def import_users(ctx, dosya, assign_trainings=False):
+    path = os.path.join(files_dir(), dosya)
+
+    def progress(report):
+        ctx.progress(report.processed, message=f'{report.processed} satır işlendi, '
+                                               f'{report.created} kullanıcı eklendi')
+
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as handle:
+            report = import_user_file(handle, assign_trainings=assign_trainings, progress=progress)
+    finally:
+        os.unlink(path)
+
+    ctx.progress(report.processed, report.processed)
+    return {
+        'processed': report.processed,
+        'created': report.created,
+        'assigned': report.assigned,
+        'failed': report.failed,
+        'errors': [list(error) for error in report.errors],
+    }
+
+@job('export_assignments', 'Atama dışa aktarımı')
+def export_assignments(ctx, args, fmt='csv'):
+    filters = parse_filters(MultiDict(args))
+    name = f'atamalar.{fmt}'
+    path = ctx.path(name)
+
+    def progress(rows):
+        # Okuma imleci açıkken session commit edilemez; ilerleme ayrı bağlantıdan yazılır
+        ctx.progress(rows, message=f'{rows} satır yazıldı', separate=True)
+
+    if fmt == 'xlsx':
+        with open(path, 'wb') as handle:
+            for chunk in generate_xlsx(filters, progress=progress):
+                handle.write(chunk)
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as handle:
+            for chunk in generate_csv(filters, progress=progress):
+                handle.write(chunk)
+
+    ctx.progress(1, 1, 'Dosya hazır')
+    return {'dosya': os.path.basename(path), 'ad': name}
+
+@job('rebuild_rollups', 'Özet tablo yeniden hesaplama')
+def rebuild_rollups_job(ctx):
+    ctx.progress(0, 1, 'Özet tablo hesaplanıyor')
+    rebuild_rollups()
+    db.session.commit()
+    ctx.progress(1)
+    return {}
@@ -0,0 +1,342 @@
+"""
+Arka plan işleri
+
+Uzun süren yönetim işlemleri (toplu silme, toplu atama, kullanıcı aktarımı,
+dışa aktarım, özet tablo yeniden hesaplama) istek içinde değil, jobs
+tablosundaki kayıtlar üzerinden çalıştırılır. İş türleri @job ile kaydedilir:
+
+    @job('delete_training', 'Eğitim silme')
+    def delete_training(ctx, egitim_id):
+        ...
+        ctx.progress(done, total)
+        return {'silinen_atama': total}
+
+ctx.progress() ilerlemeyi yazar ve o ana kadarki transaction'ı commit eder;
+işleyiciler onu tutarlı noktalarda (ör. her parçanın sonunda) çağırmalıdır.
+Okuma akışı sürerken commit edilemeyen işler (dışa aktarım) separate=True ile
+ilerlemeyi ayrı bir bağlantıdan yazar. Dönüş değeri sonuc sütununa JSON
+olarak yazılır.
+
+JOB_RUNNER ayarı işlerin nerede çalışacağını belirler:
+
+    'thread' -> uygulama sürecindeki thread havuzu (JOB_THREADS)
+    'worker' -> yalnızca kuyruğa yazılır; `flask run-worker` süreçleri çalıştırır
+    'sync'   -> enqueue çağrısında hemen çalıştırılır (testlerde varsayılan)
+
+Boş bırakılırsa testte 'sync', diğer durumlarda 'thread' kullanılır. Bellek
+içi SQLite veritabanında işler her zaman 'sync' çalışır.
+
+Çalışan iş JOB_HEARTBEAT_SECONDS'ta bir son_sinyal sütununu ayrı bir bağlantıdan
+günceller. Çalıştırıcı süreç (gunicorn worker'ı, run-worker) iş ortasında
+ölürse sinyal kesilir: JOB_STALE_SECONDS boyunca sinyal vermeyen 'calisiyor'
+işler recover_stale() ile yeniden kuyruğa alınır, JOB_MAX_ATTEMPTS denemeden
+sonra hata olarak kapatılır. İşleyiciler yeniden çalıştırılabilir olmalıdır
+(ör. silme işleri kalan kayıtlarla devam eder). 'thread' modunda her süreç ilk
+isteğiyle birlikte bir tarayıcı thread başlatır; bu thread takılan işleri
+kurtarır ve kuyrukta kalan (ör. yeniden başlatılan bir worker'ın sıraya aldığı)
+işleri havuza verir. `flask run-worker` aynı kontrolü boş kuyrukta yapar.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select, update
+from app import db
+from app.database import is_memory_sqlite
+from app.models import Job
+
+logger = logging.getLogger('app.jobs')
+
+STATUS_LABELS = {
+    'bekliyor': 'Bekliyor',
+    'calisiyor': 'Çalışıyor',
+    'tamamlandi': 'Tamamlandı',
+    'hata': 'Hata',
+}
+
+HANDLERS = {}
+
+def job(kind, label):
+    """İş türünü kaydeden decorator"""
+    def decorator(handler):
+        HANDLERS[kind] = (handler, label)
+        return handler
+    return decorator
+
+def job_label(kind):
+    return HANDLERS[kind][1] if kind in HANDLERS else kind
+
+class JobContext:
+    """Çalışan işin parametreleri ve ilerleme bildirimi"""
+
+    def __init__(self, job_id, params):
+        self.job_id = job_id
+        self.params = params
+
+    def progress(self, done, total=None, message=None, separate=False):
+        """İlerlemeyi kaydet; separate=False ise mevcut transaction da commit edilir"""
+        values = {'ilerleme': done, 'son_sinyal': datetime.utcnow()}
+        if total is not None:
+            values['toplam'] = total
+        if message is not None:
+            values['mesaj'] = message[:255]
+        stmt = update(Job).where(Job.id == self.job_id).values(**values)
+        if separate:
+            with db.engine.begin() as connection:
+                connection.execute(stmt)
+        else:
+            db.session.execute(stmt)
+            db.session.commit()
+
+    def path(self, name):
+        """İşe ait dosyanın JOB_FILES_DIR içindeki yolu"""
+        return os.path.join(files_dir(), f'{self.job_id}_{name}')
+
+def files_dir(app=None):
+    """İşlerin girdi/çıktı dosyalarının tutulduğu dizin (gerekirse oluşturulur)"""
+    app = app or current_app
+    directory = app.config.get('JOB_FILES_DIR') or os.path.join(app.instance_path, 'jobs')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+def store_upload(file_storage, suffix=''):
+    """Yüklenen dosyayı iş dosyaları dizinine kaydet ve dosya adını döndür"""
+    name = f'upload_{uuid.uuid4().hex}{suffix}'
+    file_storage.save(os.path.join(files_dir(), name))
+    return name
+
+def _runner_mode(app):
+    # Bellek içi SQLite her bağlantıda ayrı bir veritabanıdır; işler yalnızca
+    # isteğin kendi bağlantısında çalışabilir
+    if is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        return 'sync'
+    mode = app.config.get('JOB_RUNNER')
+    if mode:
+        return mode
+    return 'sync' if app.testing else 'thread'
+
+_executor_lock = threading.Lock()
+
+def _executor(app):
+    with _executor_lock:
+        executor = app.extensions.get('job_executor')
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=app.config.get('JOB_THREADS', 2),
+                                          thread_name_prefix='job')
+            app.extensions['job_executor'] = executor
+            app.extensions['job_submitted'] = set()
+        return executor
+
+def _submit(app, job_id):
+    """İşi süreçteki thread havuzuna ver (aynı iş iki kez verilmez)"""
+    executor = _executor(app)
+    submitted = app.extensions['job_submitted']
+    with _executor_lock:
+        if job_id in submitted:
+            return
+        submitted.add(job_id)
+    executor.submit(_run_in_app_context, app, job_id)
+
+def enqueue(kind, olusturan_id=None, **params):
+    """İşi kuyruğa ekle (commit edilir) ve Job kaydını döndür"""
+    if kind not in HANDLERS:
+        raise ValueError(f'Bilinmeyen iş türü: {kind}')
+
+    new_job = Job(tur=kind, parametreler=params, olusturan_id=olusturan_id, mesaj='Sırada')
+    db.session.add(new_job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    mode = _runner_mode(app)
+    if mode == 'sync':
+        run_job(new_job.id)
+    elif mode == 'thread':
+        _submit(app, new_job.id)
+    return new_job
+
+def _run_in_app_context(app, job_id):
+    with app.app_context():
+        try:
+            run_job(job_id)
+        finally:
+            db.session.remove()
+            with _executor_lock:
+                app.extensions['job_submitted'].discard(job_id)
+
+def claim(job_id=None):
+    """Bekleyen bir işi (veya verilen işi) çalışıyor olarak işaretle; alınamazsa None
+
+    Koşullu UPDATE ile aynı işin iki çalıştırıcı tarafından alınması önlenir.
+    """
+    if job_id is None:
+        job_id = db.session.scalar(
+            select(Job.id).where(Job.durum == 'bekliyor').order_by(Job.created_at, Job.id).limit(1))
+        if job_id is None:
+            return None
+
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(Job).where(Job.id == job_id, Job.durum == 'bekliyor')
+        .values(durum='calisiyor', baslama_tarihi=now, son_sinyal=now, deneme=Job.deneme + 1,
+                mesaj='Çalışıyor')
+    ).rowcount
+    db.session.commit()
+    return job_id if claimed else None
+
+def recover_stale(stale_seconds=None, max_attempts=None):
+    """Sinyali kesilen 'calisiyor' işleri yeniden kuyruğa al; (kuyruğa alınan, kapatılan)
+
+    Deneme hakkı biten işler hata olarak kapatılır. Koşullu UPDATE'ler yalnızca
+    hâlâ takılı olan işleri değiştirir; aynı anda çalışan iki kontrol aynı işi
+    iki kez saymaz.
+    """
+    config = current_app.config
+    stale_seconds = stale_seconds or config.get('JOB_STALE_SECONDS', 300)
+    max_attempts = max_attempts or config.get('JOB_MAX_ATTEMPTS', 3)
+    now = datetime.utcnow()
+    # Sinyal sütunundan önce alınmış işlerde başlama zamanı kullanılır
+    last_seen = func.coalesce(Job.son_sinyal, Job.baslama_tarihi)
+    stale = (Job.durum == 'calisiyor') & (last_seen < now - timedelta(seconds=stale_seconds))
+
+    requeued = db.session.execute(
+        update(Job).where(stale, Job.deneme < max_attempts)
+        .values(durum='bekliyor', mesaj='Yeniden sırada (çalıştırıcı yanıt vermedi)')
+    ).rowcount
+    failed = db.session.execute(
+        update(Job).where(stale, Job.deneme >= max_attempts)
+        .values(durum='hata', bitis_tarihi=now, mesaj='Hata',
+                hata=f'Çalıştırıcı {max_attempts} denemede de yanıt vermedi')
+    ).rowcount
+    db.session.commit()
+    if requeued or failed:
+        logger.warning('Takılan işler: %d yeniden sırada, %d hata olarak kapatıldı', requeued, failed)
+    return requeued, failed
+
+def run_job(job_id):
+    """İşi al ve çalıştır; başka bir çalıştırıcı aldıysa hiçbir şey yapmaz"""
+    if claim(job_id) is None:
+        return False
+    _execute(job_id)
+    return True
+
+def _heartbeat(app, job_id, stop):
+    """İş bitene kadar son_sinyal sütununu ayrı bir bağlantıdan güncelle"""
+    interval = app.config.get('JOB_HEARTBEAT_SECONDS', 30)
+    with app.app_context():
+        while not stop.wait(interval):
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(update(Job).where(Job.id == job_id, Job.durum == 'calisiyor')
+                                       .values(son_sinyal=datetime.utcnow()))
+            except Exception:
+                logger.exception('İş %s için sinyal yazılamadı', job_id)
+
+def _execute(job_id):
+    current = db.session.get(Job, job_id)
+    kind = current.tur
+    handler, _ = HANDLERS[kind]
+    params = dict(current.parametreler or {})
+    started = time.perf_counter()
+    app = current_app._get_current_object()
+    stop = threading.Event()
+    # Bellek içi SQLite'ta tek bağlantı paylaşılır; sinyal yalnızca ayrı bağlantılarla yazılır
+    if _runner_mode(app) != 'sync':
+        threading.Thread(target=_heartbeat, args=(app, job_id, stop), daemon=True,
+                         name=f'job-heartbeat-{job_id}').start()
+    try:
+        result = handler(JobContext(job_id, params), **params)
+    except Exception as exc:
+        db.session.rollback()
+        logger.exception('İş %s (%s) başarısız', job_id, kind)
+        values = {'durum': 'hata', 'hata': str(exc) or exc.__class__.__name__, 'mesaj': 'Hata'}
+    else:
+        values = {'durum': 'tamamlandi', 'sonuc': result, 'mesaj': 'Tamamlandı'}
+    finally:
+        stop.set()
+
+    values['bitis_tarihi'] = datetime.utcnow()
+    # Sinyal kesildiği için iş başka bir çalıştırıcıya verildiyse sonuç yazılmaz
+    db.session.execute(update(Job).where(Job.id == job_id, Job.durum == 'calisiyor').values(**values))
+    db.session.commit()
+    logger.info('İş %s (%s) %s: %.1f sn', job_id, kind, values['durum'],
+                time.perf_counter() - started)
+
+def run_worker(poll_interval=1.0, burst=False):
+    """Kuyruktaki işleri sırayla çalıştır; burst=True ise kuyruk boşalınca dön"""
+    processed = 0
+    interval = current_app.config.get('JOB_HEARTBEAT_SECONDS', 30)
+    recover_stale()
+    checked = time.monotonic()
+    while True:
+        job_id = claim()
+        if job_id is None:
+            if time.monotonic() - checked >= interval:
+                recover_stale()
+                checked = time.monotonic()
+            db.session.remove()
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        _execute(job_id)
+        processed += 1
+        db.session.remove()
+
+def recent_jobs(limit=50):
+    return Job.with_profile('job_list').order_by(Job.id.desc()).limit(limit).all()
+
+def _sweep(app, stop):
+    """Takılan işleri kurtar ve kuyrukta bekleyenleri süreçteki havuza ver"""
+    interval = app.config.get('JOB_HEARTBEAT_SECONDS', 30)
+    while True:
+        with app.app_context():
+            try:
+                recover_stale()
+                for job_id in db.session.scalars(
+                        select(Job.id).where(Job.durum == 'bekliyor').order_by(Job.created_at, Job.id)):
+                    _submit(app, job_id)
+            except Exception:
+                logger.exception('İş kuyruğu taranamadı')
+            finally:
+                db.session.remove()
+        if stop.wait(interval):
+            return
+
+def _start_sweeper(app):
+    # Fork eden sunucularda (gunicorn) thread'ler fork'ta kaybolur; tarayıcı her
+    # sürecin ilk isteğinde başlatılır
+    with _executor_lock:
+        if _sweeper_pid(app) == os.getpid():
+            return
+        stop = threading.Event()
+        app.extensions['job_sweeper'] = (os.getpid(), stop)
+    threading.Thread(target=_sweep, args=(app, stop), daemon=True, name='job-sweeper').start()
+
+def _sweeper_pid(app):
+    sweeper = app.extensions.get('job_sweeper')
+    return sweeper[0] if sweeper else None
+
+def shutdown(app, wait=True):
+    """Süreçteki tarayıcıyı durdur ve thread havuzunu kapat"""
+    with _executor_lock:
+        sweeper = app.extensions.pop('job_sweeper', None)
+        executor = app.extensions.get('job_executor')
+        app.extensions['job_executor'] = None
+    if sweeper:
+        sweeper[1].set()
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def init_app(app):
+    app.extensions['job_executor'] = None
+
+    @app.before_request
+    def _ensure_sweeper():
+        if _sweeper_pid(app) != os.getpid() and _runner_mode(app) == 'thread':
+            _start_sweeper(app)
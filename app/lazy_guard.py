@@ -0,0 +1,57 @@
+"""
+Şablonlarda lazy load koruması
+
+Şablon render edilirken bir ilişki lazy load ile yüklenirse (N+1 sorgu
+belirtisi) LAZY_LOAD_GUARD ayarına göre hata fırlatılır veya log yazılır:
+
+    'raise' -> LazyLoadError (testlerde varsayılan)
+    'log'   -> uyarı logu (debug modunda varsayılan)
+    'off'   -> kapalı (üretimde varsayılan)
+
+Çözüm, ilgili route'ta modelin loader profilini kullanmaktır
+(ör. UserTraining.with_profile('assignment_list')).
+"""
+
+from flask import current_app, g, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+from app import db
+
+class LazyLoadError(RuntimeError):
+    pass
+
+def _guard_mode(app):
+    mode = app.config.get('LAZY_LOAD_GUARD')
+    if mode:
+        return mode
+    if app.testing:
+        return 'raise'
+    if app.debug:
+        return 'log'
+    return 'off'
+
+def _template_started(sender, template, context, **extra):
+    g._rendering_depth = g.get('_rendering_depth', 0) + 1
+
+def _template_finished(sender, template, context, **extra):
+    g._rendering_depth = g.get('_rendering_depth', 1) - 1
+
+def _check_lazy_load(orm_execute_state):
+    if not orm_execute_state.is_select or orm_execute_state.lazy_loaded_from is None:
+        return
+    if not has_request_context() or not g.get('_rendering_depth'):
+        return
+
+    mode = _guard_mode(current_app)
+    if mode == 'off':
+        return
+
+    message = f'Şablonda lazy load: {orm_execute_state.loader_strategy_path}'
+    if mode == 'raise':
+        raise LazyLoadError(message)
+    current_app.logger.warning(message)
+
+def init_app(app):
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+    if not event.contains(db.session, 'do_orm_execute', _check_lazy_load):
+        event.listen(db.session, 'do_orm_execute', _check_lazy_load)
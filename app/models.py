@@ -1,34 +1,64 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from flask_login import UserMixin
-from app import db, login_manager
+from sqlalchemy.orm import joinedload
+from app import db
+from app.passwords import hash_password, needs_rehash
 
-@login_manager.user_loader
-def load_user(id):
-    return User.query.get(int(id))
+class LoaderProfileMixin:
+    """Adlandırılmış eager-loading profilleri
 
-class User(UserMixin, db.Model):
+    Her model loader_profiles sözlüğünde profil adını, yükleme seçeneklerini
+    döndüren bir fonksiyona eşler. Liste sayfaları şablonda kullanılan
+    ilişkileri satır başına lazy load yerine tek sorguda yükler:
+
+        UserTraining.with_profile('assignment_list').filter_by(...)
+    """
+    loader_profiles = {}
+    
+    @classmethod
+    def loader_options(cls, name):
+        return cls.loader_profiles[name]()
+    
+    @classmethod
+    def with_profile(cls, name):
+        return cls.query.options(*cls.loader_options(name))
+
+class User(LoaderProfileMixin, UserMixin, db.Model):
     __tablename__ = 'users'
+    loader_profiles = {
+        'user_list': lambda: (joinedload(User.bolum),)
+    }
     
     id = db.Column(db.Integer, primary_key=True)
     isim = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     sifre_hash = db.Column(db.String(255), nullable=False)
     rol = db.Column(db.String(20), nullable=False, default='Personel')  # Admin, Eğitmen, Personel
-    bolum_id = db.Column(db.Integer, db.ForeignKey('departments.id'))
+    bolum_id = db.Column(db.Integer, db.ForeignKey('departments.id', ondelete='SET NULL'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
-    # İlişkiler
-    bolum = db.relationship('Department', backref='kullanicilar')
-    egitimler = db.relationship('UserTraining', back_populates='kullanici', cascade='all, delete-orphan')
+    # İlişkiler (silmede alt kayıtlar yüklenmez; veritabanı ON DELETE ile temizler)
+    bolum = db.relationship('Department', backref=db.backref('kullanicilar', passive_deletes=True))
+    egitimler = db.relationship('UserTraining', back_populates='kullanici', cascade='all, delete-orphan',
+                                passive_deletes=True)
+    
+    # İndeksler: bölüm filtresi, created_at sıralı sayfalama
+    __table_args__ = (
+        db.Index('ix_users_bolum_id', 'bolum_id'),
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
     
     def set_password(self, password):
-        self.sifre_hash = generate_password_hash(password)
+        self.sifre_hash = hash_password(password)
     
     def check_password(self, password):
         return check_password_hash(self.sifre_hash, password)
     
+    def password_needs_rehash(self):
+        return needs_rehash(self.sifre_hash)
+    
     def is_admin(self):
         return self.rol == 'Admin'
     
@@ -47,7 +77,11 @@ class Department(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # İlişkiler
-    egitimler = db.relationship('TrainingSection', back_populates='bolum', cascade='all, delete-orphan')
+    egitimler = db.relationship('TrainingSection', back_populates='bolum', cascade='all, delete-orphan',
+                                passive_deletes=True)
+    
+    # İndeksler: created_at sıralı sayfalama
+    __table_args__ = (db.Index('ix_departments_created_at_id', 'created_at', 'id'),)
     
     def __repr__(self):
         return f'<Department {self.ad}>'
@@ -65,30 +99,44 @@ class Level(db.Model):
     def __repr__(self):
         return f'<Level {self.ad}>'
 
-class Training(db.Model):
+class Training(LoaderProfileMixin, db.Model):
     __tablename__ = 'trainings'
+    loader_profiles = {
+        'training_list': lambda: (joinedload(Training.pre_requisite),)
+    }
     
     id = db.Column(db.Integer, primary_key=True)
     kod = db.Column(db.String(20), unique=True, nullable=False)
     baslik = db.Column(db.String(200), nullable=False)
     aciklama = db.Column(db.Text)
-    pre_requisite_id = db.Column(db.Integer, db.ForeignKey('trainings.id'))
+    pre_requisite_id = db.Column(db.Integer, db.ForeignKey('trainings.id', ondelete='SET NULL'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # İlişkiler
-    pre_requisite = db.relationship('Training', remote_side=[id], backref='dependent_trainings')
-    bolumler = db.relationship('TrainingSection', back_populates='egitim', cascade='all, delete-orphan')
-    kullanicilar = db.relationship('UserTraining', back_populates='egitim', cascade='all, delete-orphan')
+    pre_requisite = db.relationship('Training', remote_side=[id],
+                                    backref=db.backref('dependent_trainings', passive_deletes=True))
+    bolumler = db.relationship('TrainingSection', back_populates='egitim', cascade='all, delete-orphan',
+                               passive_deletes=True)
+    kullanicilar = db.relationship('UserTraining', back_populates='egitim', cascade='all, delete-orphan',
+                                   passive_deletes=True)
+    
+    # İndeksler: created_at sıralı sayfalama
+    __table_args__ = (db.Index('ix_trainings_created_at_id', 'created_at', 'id'),)
     
     def __repr__(self):
         return f'<Training {self.kod}: {self.baslik}>'
 
-class TrainingSection(db.Model):
+class TrainingSection(LoaderProfileMixin, db.Model):
     __tablename__ = 'training_sections'
+    loader_profiles = {
+        'section_list': lambda: (joinedload(TrainingSection.egitim),
+                                 joinedload(TrainingSection.bolum),
+                                 joinedload(TrainingSection.seviye))
+    }
     
     id = db.Column(db.Integer, primary_key=True)
-    egitim_id = db.Column(db.Integer, db.ForeignKey('trainings.id'), nullable=False)
-    bolum_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=False)
+    egitim_id = db.Column(db.Integer, db.ForeignKey('trainings.id', ondelete='CASCADE'), nullable=False)
+    bolum_id = db.Column(db.Integer, db.ForeignKey('departments.id', ondelete='CASCADE'), nullable=False)
     seviye_id = db.Column(db.Integer, db.ForeignKey('levels.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -97,18 +145,27 @@ class TrainingSection(db.Model):
     bolum = db.relationship('Department', back_populates='egitimler')
     seviye = db.relationship('Level', back_populates='egitim_bolumleri')
     
-    # Benzersizlik kısıtı
-    __table_args__ = (db.UniqueConstraint('egitim_id', 'bolum_id', name='_egitim_bolum_uc'),)
+    # Benzersizlik kısıtı ve indeksler: bölümün eğitimleri (seviye bazında), sayfalama
+    __table_args__ = (
+        db.UniqueConstraint('egitim_id', 'bolum_id', name='_egitim_bolum_uc'),
+        db.Index('ix_training_sections_bolum_seviye', 'bolum_id', 'seviye_id', 'egitim_id'),
+        db.Index('ix_training_sections_created_at_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
         return f'<TrainingSection {self.egitim.kod} - {self.bolum.ad} - {self.seviye.ad}>'
 
-class UserTraining(db.Model):
+class UserTraining(LoaderProfileMixin, db.Model):
     __tablename__ = 'user_trainings'
+    loader_profiles = {
+        'assignment_list': lambda: (joinedload(UserTraining.kullanici),
+                                    joinedload(UserTraining.egitim)),
+        'training_list': lambda: (joinedload(UserTraining.egitim),)
+    }
     
     id = db.Column(db.Integer, primary_key=True)
-    kullanici_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    egitim_id = db.Column(db.Integer, db.ForeignKey('trainings.id'), nullable=False)
+    kullanici_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    egitim_id = db.Column(db.Integer, db.ForeignKey('trainings.id', ondelete='CASCADE'), nullable=False)
     durum = db.Column(db.String(20), nullable=False, default='baslamadi')  # baslamadi, devam, tamamlandi
     tamamlanma_tarihi = db.Column(db.DateTime)
     baslama_tarihi = db.Column(db.DateTime, default=datetime.utcnow)
@@ -118,8 +175,137 @@ class UserTraining(db.Model):
     kullanici = db.relationship('User', back_populates='egitimler')
     egitim = db.relationship('Training', back_populates='kullanicilar')
     
-    # Benzersizlik kısıtı
-    __table_args__ = (db.UniqueConstraint('kullanici_id', 'egitim_id', name='_kullanici_egitim_uc'),)
+    # Benzersizlik kısıtı ve indeksler: eğitim/durum (raporlar), kullanıcı/durum
+    # (dashboard, kariyer yolu), created_at sıralı sayfalama
+    __table_args__ = (
+        db.UniqueConstraint('kullanici_id', 'egitim_id', name='_kullanici_egitim_uc'),
+        db.Index('ix_user_trainings_egitim_durum', 'egitim_id', 'durum'),
+        db.Index('ix_user_trainings_kullanici_durum', 'kullanici_id', 'durum', 'tamamlanma_tarihi'),
+        db.Index('ix_user_trainings_created_at_id', 'created_at', 'id'),
+    )
+    
+    def __repr__(self):
+        return f'<UserTraining {self.kullanici.isim} - {self.egitim.kod} - {self.durum}>' 
+class TrainingProgressRollup(db.Model):
+    """Eğitim/bölüm/durum bazında atama sayıları (app.rollups tarafından güncellenir)"""
+    __tablename__ = 'training_progress_rollups'
+    
+    egitim_id = db.Column(db.Integer, primary_key=True)
+    bolum_id = db.Column(db.Integer, primary_key=True)  # 0: bölümü olmayan kullanıcılar
+    durum = db.Column(db.String(20), primary_key=True)
+    adet = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TrainingProgressRollup {self.egitim_id} - {self.bolum_id} - {self.durum}: {self.adet}>'
+
+class TrainingStatusEvent(db.Model):
+    """Atama durum geçişi (app.status_events tarafından yazılır, yalnızca eklenir)
+
+    onceki_durum boşsa atama oluşturulmuş veya bölüme taşınmış, yeni_durum boşsa
+    atama silinmiş veya bölümden çıkmıştır. Atama/kullanıcı silinse de kayıt
+    korunur; bu nedenle foreign key tanımlanmaz.
+    """
+    __tablename__ = 'training_status_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    atama_id = db.Column(db.Integer, nullable=False)
+    kullanici_id = db.Column(db.Integer, nullable=False)
+    egitim_id = db.Column(db.Integer, nullable=False)
+    bolum_id = db.Column(db.Integer, nullable=False)  # 0: bölümü olmayan kullanıcılar
+    onceki_durum = db.Column(db.String(20))
+    yeni_durum = db.Column(db.String(20))
+    zaman = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Harici sistemin bildirdiği geçiş zamanı (app.status_updates). zaman her zaman
+    # kaydın yazıldığı andır; geçmiş tarihli bildirimler snapshot'ları bozmaz
+    kaynak_zaman = db.Column(db.DateTime)
+    
+    # İndeksler: zaman aralığı (snapshot ve tekrar oynatma), bölüm bazında aralık, atama geçmişi
+    __table_args__ = (
+        db.Index('ix_training_status_events_zaman', 'zaman'),
+        db.Index('ix_training_status_events_bolum_zaman', 'bolum_id', 'zaman'),
+        db.Index('ix_training_status_events_atama', 'atama_id', 'zaman'),
+    )
+    
+    def __repr__(self):
+        return f'<TrainingStatusEvent {self.atama_id}: {self.onceki_durum} -> {self.yeni_durum}>'
+
+class ComplianceSnapshot(db.Model):
+    """Belirli bir andaki eğitim/bölüm/durum sayıları (app.compliance tarafından oluşturulur)"""
+    __tablename__ = 'compliance_snapshots'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    zaman = db.Column(db.DateTime, nullable=False, unique=True)  # bu andan önceki olaylar dahil
+    olay_sayisi = db.Column(db.Integer, nullable=False, default=0)  # önceki snapshot'tan beri
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ComplianceSnapshot {self.zaman}>'
+
+class ComplianceSnapshotRow(db.Model):
+    """Snapshot satırı; sıfır olan sayılar saklanmaz"""
+    __tablename__ = 'compliance_snapshot_rows'
+    
+    snapshot_id = db.Column(db.Integer, db.ForeignKey('compliance_snapshots.id', ondelete='CASCADE'),
+                            primary_key=True)
+    bolum_id = db.Column(db.Integer, primary_key=True)
+    egitim_id = db.Column(db.Integer, primary_key=True)
+    durum = db.Column(db.String(20), primary_key=True)
+    adet = db.Column(db.Integer, nullable=False)
+    
+    def __repr__(self):
+        return f'<ComplianceSnapshotRow {self.snapshot_id}: {self.egitim_id} - {self.bolum_id} - {self.durum}>'
+
+class DataVersion(db.Model):
+    """Tablo başına değişiklik sayacı (app.data_versions tarafından güncellenir)"""
+    __tablename__ = 'data_versions'
+    
+    tablo = db.Column(db.String(64), primary_key=True)
+    surum = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DataVersion {self.tablo}: {self.surum}>'
+
+class Job(LoaderProfileMixin, db.Model):
+    """Arka plan işi (app.jobs tarafından çalıştırılır)"""
+    __tablename__ = 'jobs'
+    loader_profiles = {
+        'job_list': lambda: (joinedload(Job.olusturan),)
+    }
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tur = db.Column(db.String(50), nullable=False)
+    durum = db.Column(db.String(20), nullable=False, default='bekliyor')  # bekliyor, calisiyor, tamamlandi, hata
+    parametreler = db.Column(db.JSON, nullable=False, default=dict)
+    sonuc = db.Column(db.JSON)
+    ilerleme = db.Column(db.Integer, nullable=False, default=0)
+    toplam = db.Column(db.Integer)
+    mesaj = db.Column(db.String(255))
+    hata = db.Column(db.Text)
+    olusturan_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    baslama_tarihi = db.Column(db.DateTime)
+    bitis_tarihi = db.Column(db.DateTime)
+    # Çalıştırıcının son yaşam sinyali ve alınma sayısı (takılan işlerin kurtarılması)
+    son_sinyal = db.Column(db.DateTime)
+    deneme = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # İlişkiler
+    olusturan = db.relationship('User')
+    
+    # İndeksler: sıradaki işin seçimi
+    __table_args__ = (db.Index('ix_jobs_durum_created_at', 'durum', 'created_at'),)
+    
+    @property
+    def yuzde(self):
+        if self.durum == 'tamamlandi':
+            return 100
+        if not self.toplam:
+            return 0
+        return min(100, round(self.ilerleme / self.toplam * 100))
+    
+    @property
+    def bitti(self):
+        return self.durum in ('tamamlandi', 'hata')
     
     def __repr__(self):
-        return f'<UserTraining {self.kullanici.isim} - {self.egitim.kod} - {self.durum}>' 
\ No newline at end of file
+        return f'<Job {self.id} {self.tur}: {self.durum}>'
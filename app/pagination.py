@@ -0,0 +1,135 @@
+"""
+Keyset (seek) sayfalama
+
+Liste sayfaları (created_at, id) çifti üzerinden sayfalanır: her sayfa bir
+önceki sayfanın son satırından sonrasını ister. OFFSET ve COUNT(*) kullanılmadığı
+için yanıt süresi tablo boyutundan bağımsızdır.
+"""
+
+import base64
+from datetime import datetime
+from flask import current_app, request, url_for
+from sqlalchemy import and_, or_
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(created_at, id):
+    raw = f"{created_at.isoformat() if created_at else ''}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, id = raw.rsplit('|', 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(cursor) from e
+
+class KeysetPage:
+    """Bir liste sayfası ve komşu sayfalara ait imleçler"""
+
+    def __init__(self, items, per_page, sort, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.sort = sort
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def _url(self, **overrides):
+        args = {key: value for key, value in request.args.items() if key not in ('after', 'before')}
+        args.update(overrides)
+        return url_for(request.endpoint, **request.view_args, **args)
+
+    def sort_url(self):
+        """Sıralama yönünü tersine çeviren (ilk sayfaya dönen) bağlantı"""
+        return self._url(sort='asc' if self.sort == 'desc' else 'desc')
+
+    def next_url(self):
+        return self._url(after=self.next_cursor)
+
+    def prev_url(self):
+        return self._url(before=self.prev_cursor)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+def _seek(model, created_at, id, forward):
+    """(created_at, id) çiftinden sonra (forward) veya önce gelen satırlar"""
+    if forward:
+        return or_(model.created_at > created_at,
+                   and_(model.created_at == created_at, model.id > id))
+    return or_(model.created_at < created_at,
+               and_(model.created_at == created_at, model.id < id))
+
+def keyset_query(query, model, cursor=None, forward=True):
+    """İmleçten sonraki satırları (created_at, id) sırasında seçen sorgu"""
+    if cursor is not None:
+        query = query.filter(_seek(model, *decode_cursor(cursor), forward=forward))
+    if forward:
+        return query.order_by(model.created_at.asc(), model.id.asc())
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+def keyset_paginate(query, model, after=None, before=None, per_page=None, sort='desc'):
+    """Sorguyu model.created_at, model.id sırasına göre keyset ile sayfala
+
+    sort='desc' en yeni kayıtlar önce, sort='asc' en eski kayıtlar önce.
+    after: sonraki sayfa imleci, before: önceki sayfa imleci.
+    """
+    if sort not in ('asc', 'desc'):
+        sort = 'desc'
+    per_page = per_page or current_app.config['POSTS_PER_PAGE']
+    ascending = sort == 'asc'
+
+    # Önceki sayfaya giderken sıralama ters çevrilir, sonuç sonra düzeltilir
+    backwards = before is not None and after is None
+    forward = ascending != backwards
+    query = keyset_query(query, model, after if after is not None else before, forward=forward)
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def cursor_of(row):
+        return encode_cursor(row.created_at, row.id)
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if backwards:
+            next_cursor = cursor_of(rows[-1])
+            prev_cursor = cursor_of(rows[0]) if has_more else None
+        else:
+            next_cursor = cursor_of(rows[-1]) if has_more else None
+            prev_cursor = cursor_of(rows[0]) if after is not None else None
+
+    return KeysetPage(rows, per_page, sort, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+def paginate_request(query, model, default_sort='desc'):
+    """İstek parametrelerinden (after, before, sort, per_page) sayfala"""
+    per_page = request.args.get('per_page', type=int) or current_app.config['POSTS_PER_PAGE']
+    per_page = max(1, min(per_page, current_app.config['MAX_PER_PAGE']))
+    try:
+        return keyset_paginate(query, model,
+                               after=request.args.get('after') or None,
+                               before=request.args.get('before') or None,
+                               per_page=per_page,
+                               sort=request.args.get('sort', default_sort))
+    except InvalidCursor:
+        return keyset_paginate(query, model, per_page=per_page,
+                               sort=request.args.get('sort', default_sort))
@@ -0,0 +1,59 @@
+"""
+Şifre özetleme
+
+Özetleme yöntemi ve maliyeti PASSWORD_HASH_METHOD ile belirlenir (Werkzeug
+biçimi, ör. 'scrypt:32768:8:1' veya 'pbkdf2:sha256:600000'). Maliyet
+değiştirildiğinde eski parametrelerle saklanan özetler kullanıcı başarılı
+giriş yaptığında yeni parametrelerle yeniden oluşturulur (needs_rehash).
+
+Çok sayıda şifre özetlenirken (toplu kullanıcı aktarımı) hash_many işi
+süreç havuzuna dağıtır; özetleme CPU'ya bağlı olduğundan thread'ler GIL
+nedeniyle hızlandırmaz.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+# Bu sayının altında süreç havuzu başlatma maliyeti kazançtan büyük
+POOL_THRESHOLD = 8
+
+def configured_method():
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD') or DEFAULT_METHOD
+    return DEFAULT_METHOD
+
+def normalize_method(method):
+    """Varsayılanları açıkça yazılmış yöntem: 'scrypt' -> 'scrypt:32768:8:1'"""
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        defaults = ['32768', '8', '1']
+    elif name == 'pbkdf2':
+        defaults = ['sha256', str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        return method
+    return ':'.join([name, *args, *defaults[len(args):]])
+
+def hash_password(password, method=None):
+    return generate_password_hash(password, method=method or configured_method())
+
+def needs_rehash(password_hash, method=None):
+    """Saklanan özet yapılandırılmış yöntemden farklı parametrelerle mi oluşturulmuş"""
+    stored_method = password_hash.split('$', 1)[0]
+    return normalize_method(stored_method) != normalize_method(method or configured_method())
+
+def hash_many(passwords, method=None, processes=None):
+    """Şifreleri sırası korunarak özetle; çok sayıda şifrede süreç havuzu kullanılır"""
+    passwords = list(passwords)
+    method = method or configured_method()
+    if len(passwords) < POOL_THRESHOLD or processes == 1:
+        return [generate_password_hash(password, method=method) for password in passwords]
+
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, len(passwords) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(partial(generate_password_hash, method=method), passwords,
+                                 chunksize=chunksize))
@@ -0,0 +1,259 @@
+"""
+Ön koşul grafı
+
+Training.pre_requisite_id ilişkileri tek sorguyla yüklenir. Her eğitime sabit
+bir bit atanır ve geçişli kapanış (tüm ön koşullar) bir bit maskesi olarak
+saklanır. Kullanıcının tamamladığı eğitimler de maske olarak ifade edildiğinde
+"U kullanıcısı T eğitimine başlayabilir mi" sorusu tek bir maske işlemidir.
+
+Süreç içindeki graf, bu süreçteki Training değişiklikleri commit edildiğinde
+yalnızca etkilenen alt ağaç yeniden hesaplanarak güncellenir. Graf, yüklendiği
+andaki 'trainings' veri sürümüyle (app.data_versions) saklanır; başka bir
+süreç eğitimleri değiştirdiyse sürüm farklı olur ve graf yeniden yüklenir.
+
+Döngü kontrolü yazma anında da veritabanında yapılır: ön koşulu değişen her
+eğitim için flush sonrası zincir özyinelemeli sorguyla yukarı doğru izlenir.
+Eşzamanlı düzenlemelerin birbirini görmesi için kontrol öncesi 'trainings'
+sürüm satırı kilitlenir.
+"""
+
+import threading
+from collections import defaultdict, deque
+from sqlalchemy import event, select
+from sqlalchemy.orm import attributes
+from app import db
+from app.data_versions import version_table, versions
+from app.models import Training, UserTraining
+
+class PrerequisiteCycleError(ValueError):
+    pass
+
+class PrerequisiteGraph:
+    """Eğitimler arası ön koşul ilişkilerinin geçişli kapanışı"""
+
+    def __init__(self, edges):
+        """edges: {egitim_id: pre_requisite_id veya None}"""
+        self.parent = {}
+        self.children = defaultdict(set)
+        self.bit = {}
+        self.closure = {}
+        self.cyclic = set()
+        self._order = None
+
+        for training_id in edges:
+            self._add_node(training_id)
+        for training_id, parent_id in edges.items():
+            if parent_id is not None and parent_id in self.bit:
+                self.parent[training_id] = parent_id
+                self.children[parent_id].add(training_id)
+
+        roots = [tid for tid in self.bit if tid not in self.parent]
+        reached = self._recompute(roots)
+        # Köklerden ulaşılamayan düğümler bir döngünün parçasıdır
+        self.cyclic = set(self.bit) - reached
+
+    @classmethod
+    def load(cls):
+        """Grafı veritabanından tek sorguyla yükle"""
+        rows = db.session.execute(select(Training.id, Training.pre_requisite_id))
+        return cls({training_id: parent_id for training_id, parent_id in rows})
+
+    def _add_node(self, training_id):
+        if training_id not in self.bit:
+            self.bit[training_id] = 1 << len(self.bit)
+            self.closure[training_id] = 0
+
+    def _recompute(self, starts):
+        """Verilen düğümlerin ve alt ağaçlarının kapanışını yeniden hesapla"""
+        reached = set()
+        queue = deque(starts)
+        while queue:
+            node = queue.popleft()
+            if node in reached:
+                continue
+            reached.add(node)
+            parent_id = self.parent.get(node)
+            self.closure[node] = (self.closure[parent_id] | self.bit[parent_id]) if parent_id is not None else 0
+            queue.extend(self.children.get(node, ()))
+        self._order = None
+        return reached
+
+    @property
+    def order(self):
+        """Topolojik sıra: her eğitim ön koşullarından sonra gelir"""
+        if self._order is None:
+            order = []
+            queue = deque(sorted(tid for tid in self.bit if tid not in self.parent))
+            while queue:
+                node = queue.popleft()
+                order.append(node)
+                queue.extend(sorted(self.children.get(node, ())))
+            self._order = order
+        return self._order
+
+    def __contains__(self, training_id):
+        return training_id in self.bit
+
+    def __len__(self):
+        return len(self.bit)
+
+    def mask(self, training_ids):
+        """Eğitim id'lerini bit maskesine çevir"""
+        mask = 0
+        for training_id in training_ids:
+            mask |= self.bit.get(training_id, 0)
+        return mask
+
+    def ids(self, mask):
+        """Bit maskesindeki eğitim id'leri"""
+        return [tid for tid, bit in self.bit.items() if mask & bit]
+
+    def prerequisites(self, training_id):
+        """Eğitimin tüm (doğrudan ve dolaylı) ön koşulları"""
+        return self.ids(self.closure.get(training_id, 0))
+
+    def can_start(self, training_id, completed_mask):
+        """Tüm ön koşullar tamamlanmış mı"""
+        if training_id in self.cyclic:
+            return False
+        return self.closure.get(training_id, 0) & ~completed_mask == 0
+
+    def missing(self, training_id, completed_mask):
+        """Eksik ön koşulların id'leri"""
+        return self.ids(self.closure.get(training_id, 0) & ~completed_mask)
+
+    def unlocked(self, completed_mask):
+        """Ön koşulları tamamlanmış tüm eğitimler (topolojik sırada)"""
+        return [tid for tid in self.order if self.can_start(tid, completed_mask)]
+
+    def would_create_cycle(self, training_id, parent_id):
+        """training_id'nin ön koşulunu parent_id yapmak döngü oluşturur mu"""
+        if parent_id is None:
+            return False
+        if parent_id == training_id:
+            return True
+        return bool(self.closure.get(parent_id, 0) & self.bit.get(training_id, 0))
+
+    def set_prerequisite(self, training_id, parent_id):
+        """Bir eğitimin ön koşulunu değiştir; yalnızca alt ağacı yeniden hesaplanır"""
+        self._add_node(training_id)
+        if parent_id is not None:
+            self._add_node(parent_id)
+        if self.would_create_cycle(training_id, parent_id):
+            raise PrerequisiteCycleError(training_id, parent_id)
+
+        old_parent = self.parent.pop(training_id, None)
+        if old_parent is not None:
+            self.children[old_parent].discard(training_id)
+        if parent_id is not None:
+            self.parent[training_id] = parent_id
+            self.children[parent_id].add(training_id)
+        self._recompute([training_id])
+
+    def remove(self, training_id):
+        """Silinen eğitimi çıkar; ona bağlı eğitimlerin ön koşulu kalkar"""
+        if training_id not in self.bit:
+            return
+        for child in list(self.children.pop(training_id, ())):
+            self.parent.pop(child, None)
+            self._recompute([child])
+        old_parent = self.parent.pop(training_id, None)
+        if old_parent is not None:
+            self.children[old_parent].discard(training_id)
+        # Bit numarası yeniden kullanılmaz; yalnızca düğüm unutulur
+        del self.bit[training_id]
+        del self.closure[training_id]
+        self.cyclic.discard(training_id)
+        self._order = None
+
+_lock = threading.Lock()
+_state = {'graph': None, 'version': None}
+
+def get_graph():
+    """Süreç içi ön koşul grafı ('trainings' sürümü değiştiyse yeniden yüklenir)"""
+    version = versions(['trainings'])['trainings']
+    graph = _state['graph']
+    if graph is None or _state['version'] != version:
+        graph = PrerequisiteGraph.load()
+        with _lock:
+            _state['graph'] = graph
+            _state['version'] = version
+    return graph
+
+def reset_graph():
+    """Önbellekteki grafı at (toplu yazmalardan sonra)"""
+    with _lock:
+        _state['graph'] = None
+        _state['version'] = None
+
+def creates_cycle(connection, training_id, parent_id):
+    """Veritabanındaki zincire göre parent_id'nin ön koşulları training_id'yi içeriyor mu"""
+    if parent_id is None:
+        return False
+    trainings = Training.__table__
+    chain = (select(trainings.c.id, trainings.c.pre_requisite_id)
+             .where(trainings.c.id == parent_id)
+             .cte('zincir', recursive=True))
+    # UNION tekrar eden satırları eler; veritabanında zaten döngü varsa da sonlanır
+    chain = chain.union(
+        select(trainings.c.id, trainings.c.pre_requisite_id)
+        .join(chain, trainings.c.id == chain.c.pre_requisite_id)
+    )
+    return connection.execute(select(chain.c.id).where(chain.c.id == training_id).limit(1)).first() is not None
+
+def completed_mask(graph, kullanici_id):
+    """Kullanıcının tamamladığı eğitimlerin maskesi (tek sorgu)"""
+    return graph.mask(db.session.scalars(
+        select(UserTraining.egitim_id).where(UserTraining.kullanici_id == kullanici_id,
+                                             UserTraining.durum == 'tamamlandi')
+    ))
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_changes(session, flush_context):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Training):
+            changes.append(('set', obj.id, obj.pre_requisite_id))
+    for obj in session.dirty:
+        if isinstance(obj, Training) and attributes.get_history(obj, 'pre_requisite_id').has_changes():
+            changes.append(('set', obj.id, obj.pre_requisite_id))
+    for obj in session.deleted:
+        if isinstance(obj, Training):
+            changes.append(('remove', obj.id, None))
+    if not changes:
+        return
+
+    if any(action == 'set' and parent_id is not None for action, _, parent_id in changes):
+        connection = session.connection()
+        # Aynı anda ön koşul düzenleyen transaction'lar sırayla kontrol edilir
+        connection.execute(select(version_table.c.surum)
+                           .where(version_table.c.tablo == 'trainings').with_for_update())
+        for action, training_id, parent_id in changes:
+            if action == 'set' and creates_cycle(connection, training_id, parent_id):
+                raise PrerequisiteCycleError(training_id, parent_id)
+    session.info.setdefault('_prerequisite_changes', []).extend(changes)
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_changes(session):
+    changes = session.info.pop('_prerequisite_changes', None)
+    graph = _state['graph']
+    if not changes or graph is None:
+        return
+    with _lock:
+        try:
+            for action, training_id, parent_id in changes:
+                if action == 'remove':
+                    graph.remove(training_id)
+                else:
+                    graph.set_prerequisite(training_id, parent_id)
+        except PrerequisiteCycleError:
+            _state['graph'] = None
+            return
+        # Commit 'trainings' sürümünü bir artırır; arada başka bir süreç yazdıysa
+        # sürüm tutmaz ve graf bir sonraki get_graph'ta yeniden yüklenir
+        if _state['version'] is not None:
+            _state['version'] += 1
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('_prerequisite_changes', None)
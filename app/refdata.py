@@ -0,0 +1,84 @@
+"""
+Referans veri önbelleği
+
+Bölüm, seviye ve eğitim seçim listeleri (id, etiket) süreç içinde önbelleğe
+alınır ve ilk kullanımda yüklenir. Her liste, yüklendiği andaki tablo veri
+sürümüyle (app.data_versions) saklanır. Bu tablolara yazan her transaction
+sürümü artırdığından başka bir süreçte (gunicorn worker'ı, arka plan işi)
+eklenen veya silinen kayıtlar bir sonraki kullanımda listeye yansır. Sürümler
+istek başına bir kez, tek sorguyla okunur; istek içinde commit edilen bir
+yazmadan sonra yeniden okunur.
+
+invalidate() süreçteki listeleri siler (ör. veritabanı yeniden
+tohumlandığında sürümler aynı değerlerden başlayabilir).
+"""
+
+import threading
+from flask import g, has_request_context
+from sqlalchemy import event
+from app import db
+from app.data_versions import versions
+from app.models import Department, Level, Training
+
+TRACKED_TABLES = (Department.__tablename__, Level.__tablename__, Training.__tablename__)
+
+_cache = {}
+_lock = threading.Lock()
+
+def invalidate(*names):
+    """Verilen listeleri (varsayılan: tümü) süreç önbelleğinden sil"""
+    with _lock:
+        for name in names or TRACKED_TABLES:
+            _cache.pop(name, None)
+
+def _current_versions():
+    """{tablo: sürüm}; istek içinde bir kez okunur"""
+    if not has_request_context():
+        return versions(TRACKED_TABLES)
+    current = g.get('_refdata_versions')
+    if current is None:
+        current = g._refdata_versions = versions(TRACKED_TABLES)
+    return current
+
+def _cached(name, loader):
+    current_version = _current_versions()[name]
+    entry = _cache.get(name)
+    if entry is not None and entry[0] == current_version:
+        return entry[1]
+
+    value = loader()
+    with _lock:
+        _cache[name] = (current_version, value)
+    return value
+
+def department_choices():
+    """[(id, ad), ...] bölüm adına göre sıralı"""
+    return list(_cached('departments', lambda: [
+        (d.id, d.ad) for d in db.session.execute(
+            db.select(Department.id, Department.ad).order_by(Department.ad))
+    ]))
+
+def level_choices():
+    """[(id, ad), ...] seviye id'sine göre sıralı"""
+    return list(_cached('levels', lambda: [
+        (l.id, l.ad) for l in db.session.execute(
+            db.select(Level.id, Level.ad).order_by(Level.id))
+    ]))
+
+def training_choices():
+    """[(id, 'KOD - Başlık'), ...] eğitim koduna göre sıralı"""
+    return list(_cached('trainings', lambda: [
+        (t.id, f"{t.kod} - {t.baslik}") for t in db.session.execute(
+            db.select(Training.id, Training.kod, Training.baslik).order_by(Training.kod))
+    ]))
+
+def department_name(bolum_id):
+    """Bölüm adını önbellekten getir (bulunamazsa None)"""
+    return dict(department_choices()).get(bolum_id)
+
+@event.listens_for(db.session, 'after_commit')
+def _forget_request_versions(session):
+    # Commit edilen yazma sürümleri değiştirmiş olabilir; istek içindeki sonraki
+    # kullanım sürümleri yeniden okur
+    if has_request_context():
+        g.pop('_refdata_versions', None)
@@ -0,0 +1,72 @@
+"""
+Okuma replikası yönlendirmesi
+
+REPLICA_DATABASE_URLS tanımlıysa REPLICA_ENDPOINTS kalıplarına uyan GET/HEAD
+istekleri (raporlar, yönetim paneli ve liste sayfaları) sırayla seçilen bir
+replikadan okunur (app.database.RoutingSession). İstek içinde bir yazma olursa
+session'ın sonraki sorguları birincil veritabanına gider.
+
+Kendi yazdığını okuma: bir istekte yazan transaction commit edildiğinde
+kullanıcının oturumuna REPLICA_STICKY_SECONDS saniyelik bir süre yazılır; bu
+süre içindeki istekleri replika gecikmesinden etkilenmemek için birincil
+veritabanından okunur.
+"""
+
+import itertools
+import time
+from fnmatch import fnmatch
+from flask import current_app, has_request_context, request, session as flask_session
+from sqlalchemy import event
+from app import db
+from app.database import REPLICA_INFO_KEY, replica_keys
+
+# Flask oturumunda birincil veritabanından okunacak son zaman (epoch saniye)
+STICKY_KEY = '_primary_until'
+
+def _routable():
+    if request.method not in ('GET', 'HEAD') or request.endpoint is None:
+        return False
+    if flask_session.get(STICKY_KEY, 0) > time.time():
+        return False
+    return any(fnmatch(request.endpoint, pattern) for pattern in current_app.config.get('REPLICA_ENDPOINTS', ()))
+
+def current_replica():
+    """Bu isteğin okumalarının yönlendirildiği replika (yoksa None)"""
+    return db.session.info.get(REPLICA_INFO_KEY)
+
+def init_app(app):
+    keys = replica_keys(app)
+    app.extensions['replicas'] = keys
+    if not keys:
+        return
+    rotation = itertools.cycle(keys)
+
+    @app.before_request
+    def _route_reads():
+        if _routable():
+            db.session.info[REPLICA_INFO_KEY] = next(rotation)
+
+    @app.teardown_request
+    def _reset_route(exc):
+        # Dış uygulama bağlamında (ör. testler) session istekten sonra da kullanılabilir
+        db.session.info.pop(REPLICA_INFO_KEY, None)
+
+@event.listens_for(db.session, 'after_flush')
+def _mark_flush(session, flush_context):
+    session.info['_replica_wrote'] = True
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _mark_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['_replica_wrote'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def _stick_to_primary(session):
+    if not session.info.pop('_replica_wrote', False) or not has_request_context():
+        return
+    if current_app.extensions.get('replicas'):
+        flask_session[STICKY_KEY] = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_writes(session):
+    session.info.pop('_replica_wrote', None)
@@ -0,0 +1,299 @@
+"""
+Eğitim tamamlama süresi analizleri
+
+Başlamış atamaların zaman damgaları tek bir sorguyla sütun dizileri (NumPy)
+olarak okunur: eğitim, bölüm, seviye, durum, başlama ve tamamlanma zamanı
+(epoch saniye). Satırlar LOAD_BATCH_SIZE'lık parçalar halinde akıtılır ve her
+parça hemen diziye çevrilir; satır nesnelerinin tamamı bellekte tutulmaz.
+Hesaplamalar satır döngüsü olmadan, sıralama ve gruplama ile
+vektörel yapılır:
+
+    - tamamlanma süresi dağılımı (gün): adet, medyan, p90
+    - haftalık tamamlanma eğilimi (son ANALYTICS_TREND_WEEKS hafta)
+    - takılan atamalar: devam eden ve başlangıcından bu yana grubun p90
+      tamamlanma süresinden (grupta tamamlanan yoksa ANALYTICS_STALL_DAYS)
+      uzun süre geçmiş olanlar
+
+Süre ve takılma sayıları eğitim, bölüm ve seviye bazında ayrı ayrı hesaplanır.
+
+Sütun dizileri tamamlanma sürümüyle (app.status_events.COMPLETIONS_VERSION) ve
+bölüm eşlemelerinin sürümüyle anahtarlanarak önbellekte tutulur ve yalnızca
+yeni tamamlanma (veya tamamlanmanın geri alınması) geldiğinde yeniden okunur;
+atama, başlatma ve profil değişiklikleri yeniden okumaya yol açmaz. Takılma
+tespiti zamana bağlı olduğundan sonuç ANALYTICS_CACHE_TTL (saniye) dolunca,
+etiketler (eğitim, bölüm, seviye adları) değiştiğinde de önbellekteki
+dizilerden yeniden hesaplanır. Yeniden okuma ve hesaplama kilit altında
+yapılır; aynı anda gelen istekler tek bir hesaplamayı bekler.
+
+NumPy requirements.txt'te tanımlıdır; kurulu olmayan ortamlarda available()
+False döner ve sayfa uyarı gösterir.
+"""
+
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy import and_, case, func, select
+from app import db
+from app.data_versions import versions
+from app.models import TrainingSection, User, UserTraining
+from app.refdata import department_choices, level_choices, training_choices
+from app.rollups import NO_DEPARTMENT
+from app.status_events import COMPLETIONS_VERSION
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    np = None
+
+DIMENSIONS = {
+    'egitim': 'Eğitim',
+    'bolum': 'Bölüm',
+    'seviye': 'Seviye',
+}
+
+# Değiştiğinde sütun dizilerinin yeniden okunduğu sürümler
+SOURCE_VERSIONS = (COMPLETIONS_VERSION, 'training_sections')
+# Değiştiğinde sonucun önbellekteki dizilerden yeniden hesaplandığı sürümler (etiketler)
+LABEL_VERSIONS = ('trainings', 'departments', 'levels')
+
+# Seviyesi tanımlı olmayan (bölüm eşlemesi dışındaki) atamalar
+NO_LEVEL = 0
+
+# Veritabanından bir seferde okunup diziye çevrilen satır sayısı
+LOAD_BATCH_SIZE = 10000
+
+DAY = 86400.0
+WEEK = 7 * DAY
+# 1970-01-01 Perşembe; haftalar Pazartesi başlar
+WEEK_SHIFT = 3 * DAY
+
+_cache = {}
+_lock = threading.Lock()
+
+def available():
+    return np is not None
+
+class Columns:
+    """Başlamış atamaların sütun dizileri; eksik zamanlar NaN"""
+
+    def __init__(self, egitim, bolum, seviye, tamamlandi, baslama, tamamlanma):
+        self.egitim = egitim
+        self.bolum = bolum
+        self.seviye = seviye
+        self.tamamlandi = tamamlandi
+        self.baslama = baslama
+        self.tamamlanma = tamamlanma
+
+    def __len__(self):
+        return len(self.egitim)
+
+    def key(self, dimension):
+        return getattr(self, dimension)
+
+def _epoch(column, dialect_name):
+    """Tarih sütununu epoch saniyeye çeviren ifade (NULL ise -1)"""
+    if dialect_name == 'sqlite':
+        seconds = (func.julianday(column) - 2440587.5) * DAY
+    else:
+        seconds = func.extract('epoch', column)
+    return func.coalesce(seconds, -1.0)
+
+def columns_query():
+    """Başlamış atamaların (eğitim, bölüm, seviye, tamamlandı, başlama, tamamlanma) sorgusu"""
+    dialect_name = db.session.get_bind().dialect.name
+    return (
+        select(UserTraining.egitim_id,
+               func.coalesce(User.bolum_id, NO_DEPARTMENT),
+               func.coalesce(TrainingSection.seviye_id, NO_LEVEL),
+               case((UserTraining.durum == 'tamamlandi', 1), else_=0),
+               _epoch(UserTraining.baslama_tarihi, dialect_name),
+               _epoch(UserTraining.tamamlanma_tarihi, dialect_name))
+        .join(User, User.id == UserTraining.kullanici_id)
+        .outerjoin(TrainingSection, and_(TrainingSection.egitim_id == UserTraining.egitim_id,
+                                         TrainingSection.bolum_id == User.bolum_id))
+        .where(UserTraining.durum != 'baslamadi')
+    )
+
+def load_columns(batch_size=LOAD_BATCH_SIZE):
+    """Başlamış atamaları tek sorguyla, batch_size'lık parçalar halinde sütun dizilerine oku"""
+    stmt = columns_query()
+    # ORM yürütmesi yerine Core bağlantısı: satır başına ek yük yarıya iner. clause
+    # verildiğinden sorgu okuma replikasına yönlendirilebilir
+    connection = db.session.connection(bind_arguments={'clause': stmt})
+    result = connection.execute(stmt, execution_options={'yield_per': batch_size})
+    chunks = [np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64,
+                          count=len(rows) * 6).reshape(len(rows), 6)
+              for rows in result.partitions()]
+    data = np.concatenate(chunks) if chunks else np.empty((0, 6), dtype=np.float64)
+    del chunks
+    times = data[:, 4:6]
+    times[times < 0] = np.nan
+    return Columns(egitim=data[:, 0].astype(np.int64),
+                   bolum=data[:, 1].astype(np.int64),
+                   seviye=data[:, 2].astype(np.int64),
+                   tamamlandi=data[:, 3] == 1,
+                   baslama=times[:, 0].copy(),
+                   tamamlanma=times[:, 1].copy())
+
+def group_quantiles(keys, values, quantiles=(0.5, 0.9)):
+    """Anahtar bazında adet ve doğrusal enterpolasyonlu yüzdelikler
+
+    values artan sırada olmalıdır; anahtarlar kararlı sıralandığında her grubun
+    değerleri sıralı kalır. (anahtarlar, adetler, [yüzdelik dizisi, ...]) döndürür.
+    """
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, np.int64)
+    counts = np.diff(np.r_[starts, len(keys)])
+    results = []
+    for q in quantiles:
+        position = starts + (counts - 1) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        results.append(values[lower] + (values[upper] - values[lower]) * (position - lower))
+    return keys[starts], counts, results
+
+def _count_by(keys):
+    counts = np.bincount(keys)
+    present = np.flatnonzero(counts)
+    return dict(zip(present.tolist(), counts[present].tolist()))
+
+class Prepared:
+    """Boyutlardan bağımsız ara diziler (her analizde bir kez hesaplanır)
+
+    completed_rows: tamamlanan satırlar, süreye göre artan sırada
+    durations: bu satırların tamamlanma süreleri (gün)
+    progress_rows / elapsed: devam eden satırlar ve başlangıçtan bu yana geçen gün
+    """
+
+    def __init__(self, columns, now):
+        completed = (columns.tamamlandi & ~np.isnan(columns.baslama) & ~np.isnan(columns.tamamlanma)
+                     & (columns.tamamlanma >= columns.baslama))
+        rows = np.flatnonzero(completed)
+        durations = (columns.tamamlanma[rows] - columns.baslama[rows]) / DAY
+        order = np.argsort(durations)
+        self.completed_rows = rows[order]
+        self.durations = durations[order]
+        self.finished_at = columns.tamamlanma[self.completed_rows]
+
+        in_progress = ~columns.tamamlandi & ~np.isnan(columns.baslama)
+        self.progress_rows = np.flatnonzero(in_progress)
+        self.elapsed = (now - columns.baslama[self.progress_rows]) / DAY
+
+def dimension_stats(keys, prepared, stall_days):
+    """Anahtar (boyut değeri) başına süre dağılımı ve takılan atama sayıları"""
+    unique, counts, (medians, p90s) = group_quantiles(keys[prepared.completed_rows], prepared.durations)
+    p90_by_key = dict(zip(unique.tolist(), p90s.tolist()))
+    progress_keys = keys[prepared.progress_rows]
+
+    # Her satırın eşiği: grubunun p90'ı (grupta tamamlanan yoksa varsayılan)
+    threshold = np.full(len(progress_keys), float(stall_days))
+    if len(unique):
+        position = np.clip(np.searchsorted(unique, progress_keys), 0, len(unique) - 1)
+        known = unique[position] == progress_keys
+        threshold[known] = p90s[position[known]]
+    stalled = prepared.elapsed > threshold
+
+    stats = {key: {'tamamlanan': count, 'medyan_gun': median, 'p90_gun': p90}
+             for key, count, median, p90 in zip(unique.tolist(), counts.tolist(),
+                                                 medians.tolist(), p90s.tolist())}
+    for key, count in _count_by(progress_keys).items():
+        stats.setdefault(key, {'tamamlanan': 0, 'medyan_gun': None, 'p90_gun': None})['devam'] = count
+    for key, count in _count_by(progress_keys[stalled]).items():
+        stats[key]['takilan'] = count
+    for key, row in stats.items():
+        row.setdefault('devam', 0)
+        row.setdefault('takilan', 0)
+        row['esik_gun'] = p90_by_key.get(key, float(stall_days))
+    return stats
+
+def weekly_trend(prepared, now, weeks):
+    """Son `weeks` haftanın tamamlanma sayıları ve medyan süreleri"""
+    week_index = np.floor((prepared.finished_at + WEEK_SHIFT) / WEEK).astype(np.int64)
+    current = int(np.floor((now + WEEK_SHIFT) / WEEK))
+    first = current - weeks + 1
+    recent = week_index >= first
+
+    unique, counts, (medians,) = group_quantiles(week_index[recent], prepared.durations[recent], (0.5,))
+    by_week = {week: (count, median) for week, count, median
+               in zip(unique.tolist(), counts.tolist(), medians.tolist())}
+
+    trend = []
+    for week in range(first, current + 1):
+        count, median = by_week.get(week, (0, None))
+        start = datetime.fromtimestamp(week * WEEK - WEEK_SHIFT, tz=timezone.utc).date()
+        trend.append({'hafta': start, 'adet': count, 'medyan_gun': median})
+    return trend
+
+def _labels(dimension):
+    if dimension == 'egitim':
+        return dict(training_choices())
+    if dimension == 'bolum':
+        return {NO_DEPARTMENT: 'Bölümsüz', **dict(department_choices())}
+    return {NO_LEVEL: 'Tanımsız', **dict(level_choices())}
+
+def compute(columns, now=None, stall_days=30, trend_weeks=12):
+    """Sütun dizilerinden tüm analizleri hesapla"""
+    now = time.time() if now is None else now
+    prepared = Prepared(columns, now)
+
+    dimensions = {}
+    for dimension in DIMENSIONS:
+        labels = _labels(dimension)
+        stats = dimension_stats(columns.key(dimension), prepared, stall_days)
+        dimensions[dimension] = sorted(
+            ({'id': key, 'ad': labels.get(key, f'#{key}'), **row} for key, row in stats.items()),
+            key=lambda row: (-row['takilan'], row['ad']))
+
+    overall = dimension_stats(np.zeros(len(columns), dtype=np.int64), prepared, stall_days)
+    return {
+        'satir': len(columns),
+        'genel': overall.get(0, {'tamamlanan': 0, 'medyan_gun': None, 'p90_gun': None,
+                                 'devam': 0, 'takilan': 0, 'esik_gun': float(stall_days)}),
+        'boyutlar': dimensions,
+        'egilim': weekly_trend(prepared, now, trend_weeks),
+        'hesaplanma': datetime.utcnow(),
+    }
+
+def reset_cache():
+    """Süreçteki dizileri ve sonucu sil (ör. veritabanı yeniden tohumlandığında)"""
+    with _lock:
+        _cache.clear()
+
+def _fresh(entry, key, now, ttl):
+    return entry is not None and entry['key'] == key and now - entry['computed_at'] < ttl
+
+def summary():
+    """Önbellekteki analiz sonucu
+
+    Yeni tamamlanma geldiyse diziler yeniden okunur; süre dolduysa veya etiketler
+    değiştiyse sonuç önbellekteki dizilerden yeniden hesaplanır.
+    """
+    config = current_app.config
+    ttl = config.get('ANALYTICS_CACHE_TTL', 300)
+    current = versions(SOURCE_VERSIONS + LABEL_VERSIONS)
+    source_key = tuple(current[name] for name in SOURCE_VERSIONS)
+    key = tuple(current.values())
+
+    entry = _cache.get('summary')
+    if _fresh(entry, key, time.monotonic(), ttl):
+        return entry['value']
+
+    with _lock:
+        # Kilidi bekleyen istekler diğerinin hesapladığı sonucu kullanır
+        entry = _cache.get('summary')
+        if _fresh(entry, key, time.monotonic(), ttl):
+            return entry['value']
+
+        if entry is not None and entry['source_key'] == source_key:
+            columns = entry['columns']
+        else:
+            columns = load_columns()
+        value = compute(columns,
+                        stall_days=config.get('ANALYTICS_STALL_DAYS', 30),
+                        trend_weeks=config.get('ANALYTICS_TREND_WEEKS', 12))
+        _cache['summary'] = {'key': key, 'source_key': source_key, 'columns': columns,
+                             'computed_at': time.monotonic(), 'value': value}
+        return value
@@ -0,0 +1,158 @@
+"""
+Atama dışa aktarımı
+
+Satırlar yield_per ile sunucu taraflı imleçten parça parça okunur ve hiçbir
+zaman tamamı belleğe alınmaz. CSV üreteci başlık satırını sorgu çalışmadan
+önce döndürür, böylece ilk bayt hemen gönderilir. XLSX için openpyxl'in
+write_only modu kullanılır (opsiyonel bağımlılık).
+"""
+
+import csv
+import io
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app import db
+from app.models import Department, Training, User, UserTraining
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    openpyxl = None
+
+EXPORT_BATCH_SIZE = 1000
+
+STATUS_LABELS = {
+    'baslamadi': 'Başlamadı',
+    'devam': 'Devam Ediyor',
+    'tamamlandi': 'Tamamlandı',
+}
+
+EXPORT_COLUMNS = [
+    'Kullanıcı', 'E-posta', 'Bölüm', 'Eğitim Kodu', 'Eğitim',
+    'Durum', 'Atanma Tarihi', 'Başlama Tarihi', 'Tamamlanma Tarihi',
+]
+
+class InvalidExportFilter(ValueError):
+    pass
+
+def parse_filters(args):
+    """İstek parametrelerinden dışa aktarım filtrelerini oku"""
+    filters = {
+        'bolum_id': args.get('bolum_id', type=int),
+        'egitim_id': args.get('egitim_id', type=int),
+        'durum': args.get('durum') or None,
+        'tamamlanma_baslangic': None,
+        'tamamlanma_bitis': None,
+    }
+    if filters['durum'] and filters['durum'] not in STATUS_LABELS:
+        raise InvalidExportFilter('Geçersiz durum filtresi.')
+
+    for key in ('tamamlanma_baslangic', 'tamamlanma_bitis'):
+        value = args.get(key)
+        if value:
+            try:
+                filters[key] = datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                raise InvalidExportFilter('Tarihler YYYY-AA-GG biçiminde olmalıdır.')
+    return filters
+
+def export_query(filters):
+    """Atama satırlarını (sütun değerleri olarak) seçen sorgu"""
+    query = (
+        select(User.isim, User.email, Department.ad, Training.kod, Training.baslik,
+               UserTraining.durum, UserTraining.created_at,
+               UserTraining.baslama_tarihi, UserTraining.tamamlanma_tarihi)
+        .select_from(UserTraining)
+        .join(User, User.id == UserTraining.kullanici_id)
+        .join(Training, Training.id == UserTraining.egitim_id)
+        .outerjoin(Department, Department.id == User.bolum_id)
+        .order_by(UserTraining.id)
+    )
+    if filters.get('bolum_id'):
+        query = query.where(User.bolum_id == filters['bolum_id'])
+    if filters.get('egitim_id'):
+        query = query.where(UserTraining.egitim_id == filters['egitim_id'])
+    if filters.get('durum'):
+        query = query.where(UserTraining.durum == filters['durum'])
+    if filters.get('tamamlanma_baslangic'):
+        query = query.where(UserTraining.tamamlanma_tarihi >= filters['tamamlanma_baslangic'])
+    if filters.get('tamamlanma_bitis'):
+        # Bitiş günü dahil
+        query = query.where(UserTraining.tamamlanma_tarihi < filters['tamamlanma_bitis'] + timedelta(days=1))
+    return query
+
+def _format_date(value):
+    return value.strftime('%d.%m.%Y %H:%M') if value else ''
+
+def iter_rows(filters, batch_size=EXPORT_BATCH_SIZE, progress=None):
+    """Dışa aktarım satırlarını sunucu taraflı imleçle parça parça üret
+
+    progress verilirse her parçadan sonra o ana kadar üretilen satır sayısıyla çağrılır.
+    """
+    result = db.session.execute(
+        export_query(filters).execution_options(yield_per=batch_size, stream_results=True)
+    )
+    produced = 0
+    try:
+        for partition in result.partitions():
+            if progress is not None and produced:
+                progress(produced)
+            produced += len(partition)
+            for row in partition:
+                yield [
+                    row.isim, row.email, row.ad or '', row.kod, row.baslik,
+                    STATUS_LABELS.get(row.durum, row.durum),
+                    _format_date(row.created_at),
+                    _format_date(row.baslama_tarihi),
+                    _format_date(row.tamamlanma_tarihi),
+                ]
+    finally:
+        result.close()
+
+def generate_csv(filters, batch_size=EXPORT_BATCH_SIZE, progress=None):
+    """CSV içeriğini parça parça üret (Excel için UTF-8 BOM ile)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+
+    rows_in_chunk = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for row in iter_rows(filters, batch_size, progress):
+        writer.writerow(row)
+        rows_in_chunk += 1
+        if rows_in_chunk == batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows_in_chunk = 0
+    if rows_in_chunk:
+        yield buffer.getvalue()
+
+def generate_xlsx(filters, batch_size=EXPORT_BATCH_SIZE, chunk_size=64 * 1024, progress=None):
+    """XLSX dosyasını geçici dosyaya yazıp parça parça üret
+
+    XLSX bir zip arşivi olduğundan dosya tamamlanmadan gönderilemez; write_only
+    modunda satırlar doğrudan diske yazılır ve bellek kullanımı sabit kalır.
+    """
+    if openpyxl is None:
+        raise RuntimeError('XLSX dışa aktarımı için openpyxl kurulu olmalıdır.')
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Atamalar')
+    sheet.append(EXPORT_COLUMNS)
+    for row in iter_rows(filters, batch_size, progress):
+        sheet.append(row)
+
+    with tempfile.TemporaryFile() as handle:
+        workbook.save(handle)
+        handle.seek(0)
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,59 @@
+"""
+Rapor sorguları
+
+Bölüm/eğitim bazındaki atama ve tamamlama sayıları tek bir SQL sorgusuyla
+hesaplanır; satır başına ek sorgu çalıştırılmaz.
+"""
+
+from collections import OrderedDict
+from sqlalchemy import func
+from app import db
+from app.models import Training, TrainingSection, Level
+from app.rollups import training_totals
+
+def completion_rate(completed_count, assigned_count):
+    """Tamamlama oranını yüzde olarak (bir ondalık basamak) döndür"""
+    return round((completed_count / assigned_count * 100) if assigned_count > 0 else 0, 1)
+
+def _training_stats_query():
+    """Eğitim-bölüm ilişkisi başına atanan/tamamlanan sayılarını veren sorgu
+
+    Sayılar atama tablosu yerine özet tablodan (training_progress_rollups)
+    okunur; maliyet atama sayısından bağımsızdır.
+    """
+    totals = training_totals()
+
+    return (db.session.query(TrainingSection.bolum_id,
+                             Training,
+                             Level,
+                             func.coalesce(totals.c.assigned_count, 0).label('assigned_count'),
+                             func.coalesce(totals.c.completed_count, 0).label('completed_count'))
+            .join(Training, TrainingSection.egitim_id == Training.id)
+            .join(Level, TrainingSection.seviye_id == Level.id)
+            .outerjoin(totals, totals.c.egitim_id == TrainingSection.egitim_id)
+            .order_by(TrainingSection.bolum_id, Training.kod))
+
+def _row_to_dict(row):
+    bolum_id, training, level, assigned_count, completed_count = row
+    return {
+        'training': training,
+        'level': level,
+        'assigned_count': assigned_count,
+        'completed_count': completed_count,
+        'completion_rate': completion_rate(completed_count, assigned_count)
+    }
+
+def department_training_stats(department_id):
+    """Bir bölümdeki tüm eğitimlerin istatistiklerini tek sorguyla getir"""
+    rows = _training_stats_query().filter(TrainingSection.bolum_id == department_id).all()
+    return [_row_to_dict(row) for row in rows]
+
+def department_training_matrix():
+    """Tüm bölümler için eğitim istatistiklerini tek sorguyla getir
+
+    Sonuç, bölüm id'sine göre sıralı bir sözlüktür: {bolum_id: [satır, ...]}
+    """
+    matrix = OrderedDict()
+    for row in _training_stats_query().all():
+        matrix.setdefault(row[0], []).append(_row_to_dict(row))
+    return matrix
@@ -1,7 +1,14 @@
-from flask import render_template, request, flash, redirect, url_for
+from datetime import date, datetime, time, timedelta
+from flask import render_template, request, flash, redirect, url_for, Response, stream_with_context
 from flask_login import login_required, current_user
 from app.reports import bp
 from app.models import Department, Training, TrainingSection, Level, User, UserTraining
+from app.reports.queries import department_training_stats, department_training_matrix
+from app.reports import export, analytics
+from app.jobs import enqueue
+from app.http_cache import conditional
+from app.refdata import department_choices, training_choices
+from app.compliance import compliance_at
 from app import db
 
 def admin_required(f):
@@ -25,6 +32,7 @@ def index():
 @bp.route('/department-trainings')
 @login_required
 @admin_required
+@conditional('departments', 'trainings', 'training_sections', 'levels', 'training_progress_rollups')
 def department_trainings():
     """Bölüme göre eğitimleri listele"""
     departments = Department.query.all()
@@ -36,31 +44,8 @@ def department_trainings():
             flash('Seçilen bölüm bulunamadı.', 'danger')
             return redirect(url_for('reports.department_trainings'))
         
-        # Bölüme ait eğitimleri getir
-        training_sections = TrainingSection.query.filter_by(bolum_id=selected_department_id).all()
-        
-        # Eğitim detaylarını topla
-        trainings_data = []
-        for ts in training_sections:
-            training = Training.query.get(ts.egitim_id)
-            level = Level.query.get(ts.seviye_id)
-            
-            # Bu eğitimin kaç kullanıcıya atandığını say
-            assigned_count = UserTraining.query.filter_by(egitim_id=ts.egitim_id).count()
-            
-            # Bu eğitimi tamamlayan kullanıcı sayısını say
-            completed_count = UserTraining.query.filter_by(
-                egitim_id=ts.egitim_id, 
-                durum='tamamlandi'
-            ).count()
-            
-            trainings_data.append({
-                'training': training,
-                'level': level,
-                'assigned_count': assigned_count,
-                'completed_count': completed_count,
-                'completion_rate': round((completed_count / assigned_count * 100) if assigned_count > 0 else 0, 1)
-            })
+        # Bölüme ait eğitimler ve istatistikleri tek sorguda
+        trainings_data = department_training_stats(selected_department_id)
         
         return render_template('reports/department_trainings.html', 
                              title=f'{department.ad} - Eğitimler',
@@ -72,4 +57,133 @@ def department_trainings():
                          title='Bölüm Eğitimleri',
                          departments=departments,
                          selected_department=None,
-                         trainings_data=[]) 
\ No newline at end of file
+                         trainings_data=[]) 
+
+@bp.route('/department-matrix')
+@login_required
+@admin_required
+@conditional('departments', 'trainings', 'training_sections', 'levels', 'training_progress_rollups')
+def department_matrix():
+    """Tüm bölümlerin eğitim tamamlama matrisi"""
+    departments = Department.query.order_by(Department.ad).all()
+    matrix = department_training_matrix()
+    
+    # Matris sütunları: herhangi bir bölüme bağlı tüm eğitimler
+    trainings = {}
+    for rows in matrix.values():
+        for data in rows:
+            trainings.setdefault(data['training'].id, data['training'])
+    trainings = sorted(trainings.values(), key=lambda t: t.kod)
+    
+    cells = {
+        bolum_id: {data['training'].id: data for data in rows}
+        for bolum_id, rows in matrix.items()
+    }
+    
+    return render_template('reports/department_matrix.html',
+                         title='Bölüm Eğitim Matrisi',
+                         departments=departments,
+                         trainings=trainings,
+                         cells=cells)
+
+@bp.route('/analytics')
+@login_required
+@admin_required
+def completion_analytics():
+    """Tamamlanma süresi dağılımı, haftalık eğilim ve takılan atamalar"""
+    dimension = request.args.get('by', 'egitim')
+    if dimension not in analytics.DIMENSIONS:
+        dimension = 'egitim'
+    
+    return render_template('reports/analytics.html',
+                         title='Tamamlanma Analizi',
+                         available=analytics.available(),
+                         summary=analytics.summary() if analytics.available() else None,
+                         dimension=dimension,
+                         dimensions=analytics.DIMENSIONS)
+
+@bp.route('/compliance')
+@login_required
+@admin_required
+@conditional('training_status_events', 'compliance_snapshots', 'departments', 'trainings',
+             key=lambda: datetime.utcnow().date())
+def compliance_history():
+    """Seçilen gün sonundaki tamamlanma oranları (bölüm veya bölümün eğitimleri bazında)"""
+    # Varsayılan tarih bugündür; ETag gün değişince değişir
+    today = datetime.utcnow().date()
+    selected_date = min(request.args.get('tarih', type=date.fromisoformat) or today, today)
+    selected_department_id = request.args.get('department_id', type=int)
+    
+    # Günün sonu: o gün içindeki tüm geçişler dahil
+    moment = datetime.combine(selected_date + timedelta(days=1), time())
+    result = compliance_at(moment, selected_department_id)
+    
+    return render_template('reports/compliance.html',
+                         title='Uyum Geçmişi',
+                         departments=department_choices(),
+                         selected_department_id=selected_department_id,
+                         selected_date=selected_date,
+                         result=result)
+
+@bp.route('/export')
+@login_required
+@admin_required
+def export_assignments():
+    """Atama dışa aktarım sayfası"""
+    return render_template('reports/export.html',
+                         title='Atamaları Dışa Aktar',
+                         departments=department_choices(),
+                         trainings=training_choices(),
+                         statuses=export.STATUS_LABELS,
+                         filters=request.args,
+                         xlsx_available=export.openpyxl is not None)
+
+@bp.route('/export/assignments.<fmt>')
+@login_required
+@admin_required
+def download_assignments(fmt):
+    """Filtrelenmiş atamaları CSV veya XLSX olarak akış halinde indir"""
+    if fmt not in ('csv', 'xlsx'):
+        flash('Desteklenmeyen dosya biçimi.', 'danger')
+        return redirect(url_for('reports.export_assignments'))
+    if fmt == 'xlsx' and export.openpyxl is None:
+        flash('XLSX dışa aktarımı için openpyxl kurulu olmalıdır.', 'warning')
+        return redirect(url_for('reports.export_assignments', **request.args))
+    
+    try:
+        filters = export.parse_filters(request.args)
+    except export.InvalidExportFilter as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('reports.export_assignments'))
+    
+    filename = f"atamalar_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt}"
+    if fmt == 'csv':
+        body, mimetype = export.generate_csv(filters), 'text/csv; charset=utf-8'
+    else:
+        body, mimetype = export.generate_xlsx(filters), \
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@bp.route('/export/assignments.<fmt>/background', methods=['POST'])
+@login_required
+@admin_required
+def prepare_assignments(fmt):
+    """Büyük dışa aktarımları arka plan işi olarak hazırla"""
+    if fmt not in ('csv', 'xlsx') or (fmt == 'xlsx' and export.openpyxl is None):
+        flash('Desteklenmeyen dosya biçimi.', 'danger')
+        return redirect(url_for('reports.export_assignments'))
+    
+    try:
+        export.parse_filters(request.form)
+    except export.InvalidExportFilter as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('reports.export_assignments'))
+    
+    job = enqueue('export_assignments', olusturan_id=current_user.id,
+                  args=request.form.to_dict(), fmt=fmt)
+    flash('Dosya arka planda hazırlanıyor; hazır olduğunda bu sayfadan indirebilirsiniz.', 'info')
+    return redirect(url_for('admin.job_detail', id=job.id))
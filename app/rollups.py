@@ -0,0 +1,283 @@
+"""
+Eğitim ilerleme özet tablosu (training_progress_rollups)
+
+UserTraining satırları eklendiğinde, durumu değiştiğinde veya silindiğinde özet
+tablo aynı transaction içinde session olaylarıyla güncellenir. Panolar ve
+raporlar atama tablosunu saymak yerine bu tablodan okur.
+
+Kullanıcı veya eğitim silindiğinde atamaları veritabanı ON DELETE CASCADE ile
+silinir ve session'a yüklenmez; bu atamaların sayıları silme öncesinde tek bir
+gruplu sorguyla düşülür.
+
+Session olaylarını atlayan toplu işlemler (Core INSERT/UPDATE/DELETE) işlem
+sonunda rebuild_rollups(egitim_ids=...) ile ilgili eğitimleri yeniden hesaplamalıdır.
+
+Özet tabloya her yazma, tablonun veri sürümünü de artırır (app.data_versions).
+"""
+
+from collections import defaultdict
+from sqlalchemy import event, func, case, select, insert, update, delete
+from sqlalchemy.orm import attributes
+from sqlalchemy.orm.util import identity_key
+from app import db
+from app.data_versions import mark_changed
+from app.models import User, Department, Training, UserTraining, TrainingProgressRollup
+
+# Bölümü olmayan kullanıcıların atamaları bu bölüm id'si altında sayılır
+NO_DEPARTMENT = 0
+
+rollup_table = TrainingProgressRollup.__table__
+
+_TRACKED_ATTRIBUTES = ('kullanici_id', 'egitim_id', 'durum')
+
+def _noop(target, value, oldvalue, initiator):
+    return value
+
+# Eski değerlerin history'de her zaman bulunması için (expire edilmiş nesneler dahil)
+for _attribute in (UserTraining.kullanici_id, UserTraining.egitim_id, UserTraining.durum, User.bolum_id):
+    event.listen(_attribute, 'set', _noop, active_history=True, retval=True)
+
+def old_value(obj, key):
+    history = attributes.get_history(obj, key)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, key)
+
+def is_changed(obj, keys):
+    return any(attributes.get_history(obj, key).has_changes() for key in keys)
+
+def user_departments(session, user_ids, old):
+    """Kullanıcı id'lerini bölüm id'lerine eşle (old=True ise flush öncesi değer)"""
+    departments = {}
+    missing = []
+    for user_id in user_ids:
+        user = session.identity_map.get(identity_key(User, user_id))
+        if user is None:
+            missing.append(user_id)
+            continue
+        bolum_id = old_value(user, 'bolum_id') if old else user.bolum_id
+        departments[user_id] = bolum_id or NO_DEPARTMENT
+
+    if missing:
+        rows = session.connection().execute(
+            select(User.id, User.bolum_id).where(User.id.in_(missing))
+        )
+        for user_id, bolum_id in rows:
+            departments[user_id] = bolum_id or NO_DEPARTMENT
+    return departments
+
+def _upsert(dialect_name):
+    """adet sütununu artıran INSERT ... ON CONFLICT ifadesi (destekleyen veritabanlarında)"""
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(rollup_table)
+    return stmt.on_conflict_do_update(
+        index_elements=['egitim_id', 'bolum_id', 'durum'],
+        set_={'adet': rollup_table.c.adet + stmt.excluded.adet}
+    )
+
+def apply_deltas(connection, deltas):
+    """{(egitim_id, bolum_id, durum): fark} sözlüğünü özet tabloya uygula"""
+    changed = {key: delta for key, delta in deltas.items() if delta}
+    if not changed:
+        return
+
+    upsert = _upsert(connection.dialect.name)
+    if upsert is not None:
+        connection.execute(upsert, [
+            {'egitim_id': egitim_id, 'bolum_id': bolum_id, 'durum': durum, 'adet': delta}
+            for (egitim_id, bolum_id, durum), delta in changed.items()
+        ])
+        changed = {}
+
+    for (egitim_id, bolum_id, durum), delta in changed.items():
+        result = connection.execute(
+            update(rollup_table)
+            .where(rollup_table.c.egitim_id == egitim_id,
+                   rollup_table.c.bolum_id == bolum_id,
+                   rollup_table.c.durum == durum)
+            .values(adet=rollup_table.c.adet + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(rollup_table).values(
+                egitim_id=egitim_id, bolum_id=bolum_id, durum=durum, adet=delta
+            ))
+
+    if any(delta < 0 for delta in deltas.values()):
+        connection.execute(delete(rollup_table).where(rollup_table.c.adet <= 0))
+    mark_changed([rollup_table.name])
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_old_state(session, flush_context, instances):
+    """Silinen/değişen atamaların eski anahtarlarını flush öncesinde düş"""
+    deltas = defaultdict(int)
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    deleted_trainings = {obj.id for obj in session.deleted if isinstance(obj, Training)}
+
+    def cascaded(obj):
+        # Silinen kullanıcı/eğitimle birlikte giden atamalar aşağıda topluca sayılır
+        return (old_value(obj, 'kullanici_id') in deleted_users
+                or old_value(obj, 'egitim_id') in deleted_trainings)
+
+    removed = [obj for obj in session.deleted if isinstance(obj, UserTraining)]
+    changed = [obj for obj in session.dirty
+               if isinstance(obj, UserTraining) and is_changed(obj, _TRACKED_ATTRIBUTES)]
+    moved_users = {obj.id: old_value(obj, 'bolum_id') or NO_DEPARTMENT
+                   for obj in session.dirty
+                   if isinstance(obj, User) and is_changed(obj, ('bolum_id',))}
+    deleted_departments = [obj.id for obj in session.deleted if isinstance(obj, Department)]
+
+    added = any(isinstance(obj, UserTraining) for obj in session.new)
+    if not (removed or changed or added or moved_users or deleted_departments
+            or deleted_users or deleted_trainings):
+        return
+
+    touched = [obj for obj in removed + changed if not cascaded(obj)]
+    old_rows = [(old_value(obj, 'kullanici_id'), old_value(obj, 'egitim_id'), old_value(obj, 'durum'))
+                for obj in touched]
+    departments = user_departments(session, {row[0] for row in old_rows}, old=True)
+    for kullanici_id, egitim_id, durum in old_rows:
+        deltas[(egitim_id, departments[kullanici_id], durum)] -= 1
+
+    if deleted_users:
+        bolum_id = func.coalesce(User.bolum_id, NO_DEPARTMENT)
+        rows = session.connection().execute(
+            select(UserTraining.egitim_id, bolum_id, UserTraining.durum, func.count())
+            .join(User, User.id == UserTraining.kullanici_id)
+            .where(UserTraining.kullanici_id.in_(deleted_users))
+            .group_by(UserTraining.egitim_id, bolum_id, UserTraining.durum)
+        )
+        for egitim_id, bolum, durum, adet in rows:
+            if egitim_id not in deleted_trainings:
+                deltas[(egitim_id, bolum, durum)] -= adet
+
+    session.info['_rollup'] = {
+        'deltas': deltas,
+        'touched': {obj.id for obj in removed + changed},
+        'moved_users': moved_users,
+        'deleted_departments': deleted_departments,
+        'deleted_trainings': deleted_trainings,
+    }
+
+@event.listens_for(db.session, 'after_flush')
+def _apply_new_state(session, flush_context):
+    """Yeni/değişen atamaların güncel anahtarlarını ekle ve özet tabloyu güncelle"""
+    pending = session.info.pop('_rollup', None)
+    if pending is None:
+        return
+
+    deltas = pending['deltas']
+    added = [obj for obj in session.new if isinstance(obj, UserTraining)]
+    added += [obj for obj in session.dirty
+              if isinstance(obj, UserTraining) and obj.id in pending['touched']]
+    departments = user_departments(session, {obj.kullanici_id for obj in added}, old=False)
+    for obj in added:
+        deltas[(obj.egitim_id, departments[obj.kullanici_id], obj.durum)] += 1
+
+    connection = session.connection()
+
+    # Silinen eğitimlerin tüm satırları kaldırılır
+    if pending['deleted_trainings']:
+        connection.execute(delete(rollup_table)
+                           .where(rollup_table.c.egitim_id.in_(pending['deleted_trainings'])))
+        mark_changed([rollup_table.name])
+
+    # Bölümü değişen kullanıcıların bu flush'ta dokunulmayan atamalarını taşı
+    moved_users = pending['moved_users']
+    if moved_users:
+        touched = pending['touched'] | {obj.id for obj in added}
+        new_departments = user_departments(session, moved_users.keys(), old=False)
+        rows = connection.execute(
+            select(UserTraining.id, UserTraining.kullanici_id, UserTraining.egitim_id, UserTraining.durum)
+            .where(UserTraining.kullanici_id.in_(moved_users.keys()))
+        )
+        for ut_id, kullanici_id, egitim_id, durum in rows:
+            if ut_id in touched:
+                continue
+            deltas[(egitim_id, moved_users[kullanici_id], durum)] -= 1
+            deltas[(egitim_id, new_departments[kullanici_id], durum)] += 1
+
+    # Silinen bölümlerin kullanıcıları bölümsüz kalır
+    for bolum_id in pending['deleted_departments']:
+        rows = connection.execute(
+            select(rollup_table.c.egitim_id, rollup_table.c.durum, rollup_table.c.adet)
+            .where(rollup_table.c.bolum_id == bolum_id)
+        )
+        for egitim_id, durum, adet in rows:
+            deltas[(egitim_id, bolum_id, durum)] -= adet
+            deltas[(egitim_id, NO_DEPARTMENT, durum)] += adet
+
+    apply_deltas(connection, deltas)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop('_rollup', None)
+
+def _source_query(egitim_ids=None):
+    """Özet tablonun atama tablosundan hesaplanmış beklenen içeriği"""
+    bolum_id = func.coalesce(User.bolum_id, NO_DEPARTMENT)
+    query = (select(UserTraining.egitim_id, bolum_id.label('bolum_id'), UserTraining.durum,
+                    func.count().label('adet'))
+             .join(User, User.id == UserTraining.kullanici_id)
+             .group_by(UserTraining.egitim_id, bolum_id, UserTraining.durum))
+    if egitim_ids is not None:
+        query = query.where(UserTraining.egitim_id.in_(egitim_ids))
+    return query
+
+def fill_rollups(connection, egitim_ids=None):
+    """Özet tablo satırlarını atama tablosundan yeniden yaz (veri sürümüne dokunmadan)"""
+    egitim_ids = list(egitim_ids) if egitim_ids is not None else None
+
+    clear = delete(rollup_table)
+    if egitim_ids is not None:
+        clear = clear.where(rollup_table.c.egitim_id.in_(egitim_ids))
+    connection.execute(clear)
+    connection.execute(insert(rollup_table).from_select(
+        ['egitim_id', 'bolum_id', 'durum', 'adet'], _source_query(egitim_ids)
+    ))
+
+def rebuild_rollups(connection=None, egitim_ids=None):
+    """Özet tabloyu (veya yalnızca verilen eğitimleri) atama tablosundan yeniden hesapla"""
+    connection = connection if connection is not None else db.session.connection()
+    fill_rollups(connection, egitim_ids)
+    mark_changed([rollup_table.name])
+
+def check_rollups():
+    """Özet tabloyu atama tablosuyla karşılaştır ve tutarsızlıkları listele"""
+    expected = {(row.egitim_id, row.bolum_id, row.durum): row.adet
+                for row in db.session.execute(_source_query())}
+    actual = {(row.egitim_id, row.bolum_id, row.durum): row.adet
+              for row in db.session.execute(select(rollup_table))}
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        if expected.get(key, 0) != actual.get(key, 0):
+            egitim_id, bolum_id, durum = key
+            mismatches.append({
+                'egitim_id': egitim_id,
+                'bolum_id': bolum_id,
+                'durum': durum,
+                'beklenen': expected.get(key, 0),
+                'mevcut': actual.get(key, 0),
+            })
+    return mismatches
+
+def status_totals():
+    """Tüm atamaların durum bazında toplamları: {durum: adet}"""
+    rows = db.session.execute(
+        select(rollup_table.c.durum, func.sum(rollup_table.c.adet)).group_by(rollup_table.c.durum)
+    )
+    return {durum: total for durum, total in rows}
+
+def training_totals():
+    """Eğitim başına atanan/tamamlanan sayılarını veren alt sorgu"""
+    completed = case((rollup_table.c.durum == 'tamamlandi', rollup_table.c.adet), else_=0)
+    return (select(rollup_table.c.egitim_id,
+                   func.sum(rollup_table.c.adet).label('assigned_count'),
+                   func.sum(completed).label('completed_count'))
+            .group_by(rollup_table.c.egitim_id)
+            .subquery())
@@ -0,0 +1,242 @@
+"""
+Tam metin arama indeksi
+
+Kullanıcılar (isim, e-posta), eğitimler (kod, başlık, açıklama) ve bölümler
+(ad, açıklama) için ayrı arama tabloları tutulur (search_users,
+search_trainings, search_departments; satır kimliği kaynak kaydın id'si):
+
+    SQLite      FTS5 sanal tablosu (unicode61, aksan kaldırma, 2-3 harf önek indeksi)
+    PostgreSQL  tsvector sütunu + GIN indeksi ('simple' yapılandırması)
+
+İndeks veritabanı tetikleyicileriyle güncellenir; ORM, Core toplu yazmaları
+ve migrasyonlar ayrıca bir şey yapmaz. Tablolar ve tetikleyiciler
+db.create_all() sonrasında ve 0006 migrasyonunda install() ile kurulur;
+flask rebuild-search-index indeksi baştan doldurur.
+
+Türkçe harf katlama hem indekslenen metne (SQL) hem aranan metne (fold())
+aynı şekilde uygulanır: I/ı/İ/i aynı harf sayılır, ş/ç/ğ/ö/ü aksansız
+karşılıklarına dönüşür. Böylece "IŞIK", "ışık" ve "isik" aynı kaydı bulur.
+
+Sorgulardaki her kelime önek olarak aranır ve tüm kelimeler eşleşmelidir.
+Sıralama (bm25 / ts_rank) yalnızca ilk SEARCH_RANK_WINDOW eşleşmeye
+uygulanır; çok genel önekler (ör. "ku") tüm tabloyu sıralamaz.
+"""
+
+import re
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import Integer, column, event, inspect, text
+from app import db
+from app.models import Department, Training, User
+
+TABLE_PREFIX = 'search_'
+
+Source = namedtuple('Source', ['model', 'table', 'columns', 'weights', 'expressions'])
+Statements = namedtuple('Statements', ['create', 'triggers', 'populate', 'drop'])
+
+# E-postaların yalnızca @ öncesi indekslenir: çoğu kullanıcıda ortak olan alan
+# adı kelimeleri her sorguda tüm tabloya uyan eşleşme listeleri üretir
+_EMAIL_LOCAL_PART = {
+    'sqlite': "substr({column}, 1, instr({column} || '@', '@') - 1)",
+    'postgresql': "split_part({column}, '@', 1)",
+}
+
+# Arama türü -> model, kaynak tablo, indekslenen sütunlar, sütun ağırlıkları
+# ve sütunun indekslenen ifadesi (veritabanına göre, verilmezse sütunun kendisi)
+SOURCES = {
+    'users': Source(User, 'users', ('isim', 'email'), (4.0, 1.0), {'email': _EMAIL_LOCAL_PART}),
+    'trainings': Source(Training, 'trainings', ('kod', 'baslik', 'aciklama'), (4.0, 2.0, 1.0), {}),
+    'departments': Source(Department, 'departments', ('ad', 'aciklama'), (4.0, 1.0), {}),
+}
+
+_FOLD_FROM = 'İIıŞşÇçĞğÖöÜü'
+_FOLD_TO = 'iiissccggoouu'
+_FOLD_TABLE = str.maketrans(_FOLD_FROM, _FOLD_TO)
+# PostgreSQL tsvector ağırlık harfleri (sütun sırasına göre)
+_PG_WEIGHTS = 'ABCD'
+
+def fold(value):
+    """Türkçe harfleri katlayıp küçük harfe çevir (indekslenen SQL ifadesiyle aynı)"""
+    return (value or '').translate(_FOLD_TABLE).lower()
+
+def terms(query):
+    """Aranan metnin katlanmış kelimeleri (e-posta alan adları atılır)"""
+    return re.findall(r'[^\W_]+', fold(re.sub(r'@\S*', ' ', query or '')))
+
+def index_table(kind):
+    return TABLE_PREFIX + SOURCES[kind].table
+
+def _column_sql(dialect_name, source, row, column):
+    template = source.expressions.get(column, {}).get(dialect_name, '{column}')
+    return _fold_sql(dialect_name, template.format(column=f'{row}.{column}'))
+
+def _fold_sql(dialect_name, expression):
+    expression = f"COALESCE({expression}, '')"
+    if dialect_name == 'postgresql':
+        return f"lower(translate({expression}, '{_FOLD_FROM}', '{_FOLD_TO}'))"
+    # SQLite'ta translate() yok; harfler iç içe replace() ile değiştirilir
+    for source, target in zip(_FOLD_FROM, _FOLD_TO):
+        expression = f"replace({expression}, '{source}', '{target}')"
+    return f'lower({expression})'
+
+def _pg_document(source, row):
+    parts = [f"setweight(to_tsvector('simple', regexp_replace({_column_sql('postgresql', source, row, column)}, "
+             f"'[^[:alnum:]]+', ' ', 'g')), '{weight}')"
+             for column, weight in zip(source.columns, _PG_WEIGHTS)]
+    return ' || '.join(parts)
+
+def _sqlite_statements(kind):
+    source, table = SOURCES[kind], index_table(kind)
+    columns = ', '.join(source.columns)
+
+    def values(row):
+        return ', '.join([f'{row}.id'] + [_column_sql('sqlite', source, row, column) for column in source.columns])
+
+    insert_new = f'INSERT INTO {table} (rowid, {columns}) VALUES ({values("NEW")});'
+    delete_old = f'DELETE FROM {table} WHERE rowid = OLD.id;'
+    create = [f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, "
+              f"tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"]
+    triggers = [
+        f'CREATE TRIGGER {table}_ai AFTER INSERT ON {source.table} BEGIN {insert_new} END',
+        f'CREATE TRIGGER {table}_au AFTER UPDATE OF {columns} ON {source.table} '
+        f'BEGIN {delete_old} {insert_new} END',
+        f'CREATE TRIGGER {table}_ad AFTER DELETE ON {source.table} BEGIN {delete_old} END',
+    ]
+    drop_triggers = [f'DROP TRIGGER IF EXISTS {table}_{suffix}' for suffix in ('ai', 'au', 'ad')]
+    populate = [
+        f'DELETE FROM {table}',
+        f'INSERT INTO {table} (rowid, {columns}) SELECT {values(source.table)} FROM {source.table}',
+        f"INSERT INTO {table} ({table}) VALUES ('optimize')",
+    ]
+    return Statements(create, drop_triggers + triggers, populate, drop_triggers + [f'DROP TABLE IF EXISTS {table}'])
+
+def _postgresql_statements(kind):
+    source, table = SOURCES[kind], index_table(kind)
+    create = [
+        f'CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY REFERENCES {source.table} (id) '
+        f'ON DELETE CASCADE, document TSVECTOR NOT NULL)',
+        f'CREATE INDEX IF NOT EXISTS {table}_document ON {table} USING gin (document)',
+    ]
+    triggers = [
+        f'CREATE OR REPLACE FUNCTION {table}_sync() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN '
+        f'INSERT INTO {table} (id, document) VALUES (NEW.id, {_pg_document(source, "NEW")}) '
+        f'ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document; RETURN NULL; END $$',
+        f'DROP TRIGGER IF EXISTS {table}_sync ON {source.table}',
+        f'CREATE TRIGGER {table}_sync AFTER INSERT OR UPDATE OF {", ".join(source.columns)} '
+        f'ON {source.table} FOR EACH ROW EXECUTE FUNCTION {table}_sync()',
+    ]
+    populate = [
+        f'DELETE FROM {table}',
+        f'INSERT INTO {table} (id, document) SELECT id, {_pg_document(source, source.table)} '
+        f'FROM {source.table}',
+    ]
+    drop = [
+        f'DROP TRIGGER IF EXISTS {table}_sync ON {source.table}',
+        f'DROP FUNCTION IF EXISTS {table}_sync()',
+        f'DROP TABLE IF EXISTS {table}',
+    ]
+    return Statements(create, triggers, populate, drop)
+
+def _statements(dialect_name, kind):
+    if dialect_name == 'postgresql':
+        return _postgresql_statements(kind)
+    return _sqlite_statements(kind)
+
+def _exists(connection, kind):
+    return inspect(connection).has_table(index_table(kind))
+
+def supported(dialect_name):
+    return dialect_name in ('sqlite', 'postgresql')
+
+def install(connection):
+    """Arama tablolarını ve tetikleyicileri kur; yeni oluşturulan indeksleri doldur
+
+    Tekrar çalıştırılabilir; mevcut indeksler korunur, tetikleyiciler yeniden
+    oluşturulur. Desteklenmeyen veritabanlarında hiçbir şey yapmaz.
+    """
+    if not supported(connection.dialect.name):
+        return
+    for kind in SOURCES:
+        statements = _statements(connection.dialect.name, kind)
+        populate = [] if _exists(connection, kind) else statements.populate
+        for statement in statements.create + statements.triggers + populate:
+            connection.exec_driver_sql(statement)
+
+def uninstall(connection):
+    if not supported(connection.dialect.name):
+        return
+    for kind in SOURCES:
+        for statement in _statements(connection.dialect.name, kind).drop:
+            connection.exec_driver_sql(statement)
+
+def rebuild(connection, kinds=None):
+    """İndeksleri kaynak tablolardan baştan doldur; {tür: kayıt sayısı} döndürür"""
+    counts = {}
+    for kind in kinds or SOURCES:
+        for statement in _statements(connection.dialect.name, kind).populate:
+            connection.exec_driver_sql(statement)
+        counts[kind] = connection.execute(text(f'SELECT count(*) FROM {index_table(kind)}')).scalar()
+    return counts
+
+@event.listens_for(db.metadata, 'after_create')
+def _install_after_create(target, connection, **kw):
+    install(connection)
+
+@event.listens_for(db.metadata, 'before_drop')
+def _uninstall_before_drop(target, connection, **kw):
+    uninstall(connection)
+
+def _match_sql(dialect_name, kind):
+    """:query eşleşmelerinden sıralama penceresini alıp en iyi :limit id'yi döndüren sorgu"""
+    source, table = SOURCES[kind], index_table(kind)
+    if dialect_name == 'postgresql':
+        return (f"SELECT id FROM (SELECT id, document FROM {table} "
+                f"WHERE document @@ to_tsquery('simple', :query) LIMIT :window) AS matches "
+                f"ORDER BY ts_rank(document, to_tsquery('simple', :query)) DESC, id LIMIT :limit")
+    weights = ', '.join(str(weight) for weight in source.weights)
+    return (f"SELECT id FROM (SELECT rowid AS id, bm25({table}, {weights}) AS score FROM {table} "
+            f"WHERE {table} MATCH :query LIMIT :window) ORDER BY score, id LIMIT :limit")
+
+def _match_query(dialect_name, words):
+    if dialect_name == 'postgresql':
+        return ' & '.join(f'{word}:*' for word in words)
+    return ' '.join(f'"{word}"*' for word in words)
+
+def search_ids(kind, query, limit=None):
+    """Sorguya en iyi uyan kayıt id'leri (en alakalı önce)
+
+    Sorgu SEARCH_MIN_CHARS harften kısaysa veya veritabanı desteklenmiyorsa boş liste döner.
+    """
+    config = current_app.config
+    words = terms(query)
+    if sum(len(word) for word in words) < config.get('SEARCH_MIN_CHARS', 2):
+        return []
+    dialect_name = db.session.get_bind().dialect.name
+    if not supported(dialect_name):
+        return []
+    maximum = config.get('SEARCH_RESULTS_LIMIT', 20)
+    limit = min(limit or maximum, maximum)
+    # columns() ile SELECT olarak işaretlenir; okuma replikasına yönlendirilebilir
+    statement = text(_match_sql(dialect_name, kind)).columns(column('id', Integer))
+    return db.session.scalars(statement, {
+        'query': _match_query(dialect_name, words),
+        'window': max(limit, config.get('SEARCH_RANK_WINDOW', 200)),
+        'limit': limit,
+    }).all()
+
+def search(kind, query, limit=None, columns=None):
+    """Sorguya uyan kayıtlar (alaka sırasıyla)
+
+    columns verilmezse model nesneleri, verilirse (ör. typeahead için id ve
+    isim) yalnızca bu sütunları içeren satırlar döner.
+    """
+    model = SOURCES[kind].model
+    ids = search_ids(kind, query, limit)
+    if not ids:
+        return []
+    if columns:
+        rows = db.session.execute(db.select(model.id, *columns).where(model.id.in_(ids)))
+        by_id = {row.id: row for row in rows}
+    else:
+        by_id = {obj.id: obj for obj in db.session.scalars(db.select(model).where(model.id.in_(ids)))}
+    return [by_id[id] for id in ids if id in by_id]
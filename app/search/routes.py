@@ -0,0 +1,42 @@
+from flask import render_template, request, current_app
+from flask_login import login_required, current_user
+from app.search import bp
+from app.search.index import SOURCES, search
+from app.models import UserTraining
+from app import db
+
+KIND_LABELS = {
+    'users': 'Kullanıcılar',
+    'trainings': 'Eğitimler',
+    'departments': 'Bölümler',
+}
+
+def allowed_kinds():
+    """Kullanıcının arayabileceği türler: personel yalnızca eğitimleri arar"""
+    if current_user.is_admin():
+        return list(SOURCES)
+    return ['trainings']
+
+@bp.route('/')
+@login_required
+def results():
+    query = request.args.get('q', '').strip()
+    kinds = allowed_kinds()
+    found = {kind: search(kind, query) for kind in kinds} if query else {}
+
+    # Personel yalnızca kendisine atanmış eğitimlerin ayrıntısını açabilir
+    assigned = set()
+    if found.get('trainings') and not current_user.is_admin():
+        assigned = set(db.session.scalars(
+            db.select(UserTraining.egitim_id).where(
+                UserTraining.kullanici_id == current_user.id,
+                UserTraining.egitim_id.in_([training.id for training in found['trainings']]))))
+
+    return render_template('search/results.html',
+                         title='Arama',
+                         query=query,
+                         kinds=kinds,
+                         labels=KIND_LABELS,
+                         found=found,
+                         assigned=assigned,
+                         min_chars=current_app.config.get('SEARCH_MIN_CHARS', 2))
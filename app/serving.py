@@ -0,0 +1,86 @@
+"""
+Üretim sunucusu
+
+`flask serve` komutu gunicorn (Linux/macOS) veya waitress (Windows dahil)
+ile wsgi:app uygulamasını çalıştırır. İkisi de opsiyonel bağımlılıktır;
+hangisi kuruluysa o kullanılır.
+
+gunicorn çok süreçlidir; worker sayısı verilmezse 2 * CPU + 1 alınır ve her
+worker uygulamayı kendi sürecinde oluşturur (veritabanı havuzu süreçler
+arasında paylaşılmaz). waitress tek süreçte thread havuzu kullanır; thread
+sayısı verilmezse CPU sayısının iki katı alınır.
+"""
+
+import importlib
+import os
+
+SERVERS = ('gunicorn', 'waitress')
+WSGI_TARGET = 'wsgi:app'
+
+class ServerUnavailable(RuntimeError):
+    pass
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def default_workers():
+    return cpu_count() * 2 + 1
+
+def default_threads():
+    return cpu_count() * 2
+
+def _installed(name):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        return False
+    return True
+
+def available_servers():
+    return [name for name in SERVERS if _installed(name) and (name != 'gunicorn' or os.name != 'nt')]
+
+def choose_server(preferred=None):
+    """Kullanılacak sunucu; tercih edilen kurulu değilse ServerUnavailable"""
+    available = available_servers()
+    if preferred:
+        if preferred not in available:
+            raise ServerUnavailable(f'{preferred} kurulu değil (pip install {preferred})')
+        return preferred
+    if not available:
+        raise ServerUnavailable('gunicorn veya waitress kurulu değil (pip install gunicorn / pip install waitress)')
+    return available[0]
+
+def _load_target(target):
+    module_name, _, attribute = target.partition(':')
+    return getattr(importlib.import_module(module_name), attribute or 'app')
+
+def run_gunicorn(host, port, workers, threads, target=WSGI_TARGET):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('accesslog', '-')
+
+        def load(self):
+            # Her worker uygulamayı (ve veritabanı motorunu) kendisi oluşturur
+            return _load_target(target)
+
+    Application().run()
+
+def run_waitress(host, port, threads, target=WSGI_TARGET):
+    from waitress import serve
+    serve(_load_target(target), host=host, port=port, threads=threads)
+
+def serve(server=None, host='127.0.0.1', port=8000, workers=None, threads=None, target=WSGI_TARGET):
+    server = choose_server(server)
+    if server == 'gunicorn':
+        run_gunicorn(host, port, workers or default_workers(), threads or 1, target)
+    else:
+        run_waitress(host, port, threads or default_threads(), target)
+    return server
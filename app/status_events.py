@@ -0,0 +1,192 @@
+"""
+Atama durum geçişi olay günlüğü (training_status_events)
+
+Atama oluşturulduğunda, durumu değiştiğinde, silindiğinde veya kullanıcının
+bölümü değiştiğinde her atama için bir olay satırı eklenir; satırlar hiçbir
+zaman güncellenmez veya silinmez. Böylece herhangi bir andaki eğitim/bölüm/durum
+sayıları olaylar tekrar oynatılarak hesaplanabilir (app.compliance).
+
+Olaylar özet tabloyla (app.rollups) aynı noktalarda, aynı transaction içinde
+session olaylarıyla yazılır:
+
+    - user.start_training / complete_training, yönetici düzenlemeleri: onceki -> yeni
+    - atama ekleme / silme: None -> durum / durum -> None
+    - kullanıcının bölümü değişirse veya bölümü silinirse: eski bölümde
+      durum -> None, yeni bölümde None -> durum
+
+Session olaylarını atlayan toplu işlemler (Core INSERT/DELETE) aynı transaction
+içinde record(...) veya backfill(...) çağırmalıdır.
+
+Tamamlanmaya giren veya tamamlanmadan çıkan bir geçiş yazıldığında ayrıca
+COMPLETIONS_VERSION veri sürümü artırılır; yalnızca tamamlanmalara bağlı
+sonuçlar (app.reports.analytics) başlatma, atama veya profil değişikliklerinde
+geçersiz olmaz.
+"""
+
+from datetime import datetime
+from sqlalchemy import event, func, insert, literal, null, select
+from app import db
+from app.data_versions import mark_changed
+from app.models import Department, Training, TrainingStatusEvent, User, UserTraining
+from app.rollups import NO_DEPARTMENT, is_changed, old_value, user_departments
+
+event_table = TrainingStatusEvent.__table__
+
+COMPLETIONS_VERSION = f'{event_table.name}:tamamlandi'
+
+_TRACKED_ATTRIBUTES = ('kullanici_id', 'egitim_id', 'durum')
+
+def record(connection, events, zaman=None):
+    """Olay sözlüklerini (atama_id, kullanici_id, egitim_id, bolum_id, onceki_durum, yeni_durum) ekle"""
+    if not events:
+        return
+    zaman = zaman or datetime.utcnow()
+    connection.execute(insert(event_table), [{'zaman': zaman, **row} for row in events])
+    changed = [event_table.name]
+    if any('tamamlandi' in (row['onceki_durum'], row['yeni_durum']) for row in events):
+        changed.append(COMPLETIONS_VERSION)
+    mark_changed(changed)
+
+def transition_events(before, after):
+    """{atama_id: (kullanici_id, egitim_id, bolum_id, durum)} önce/sonra durumlarından olaylar
+
+    Aynı kullanıcı/eğitim/bölümde kalan atama için tek bir geçiş, anahtarı
+    değişen atama için eski anahtarda kapanış ve yeni anahtarda açılış üretilir.
+    """
+    events = []
+    for atama_id in sorted(set(before) | set(after)):
+        old, new = before.get(atama_id), after.get(atama_id)
+        if old is not None and new is not None and old[:3] == new[:3]:
+            if old[3] != new[3]:
+                events.append(_event(atama_id, new, old[3], new[3]))
+            continue
+        if old is not None:
+            events.append(_event(atama_id, old, old[3], None))
+        if new is not None:
+            events.append(_event(atama_id, new, None, new[3]))
+    return events
+
+def _event(atama_id, key, onceki_durum, yeni_durum):
+    kullanici_id, egitim_id, bolum_id, _ = key
+    return {'atama_id': atama_id, 'kullanici_id': kullanici_id, 'egitim_id': egitim_id,
+            'bolum_id': bolum_id, 'onceki_durum': onceki_durum, 'yeni_durum': yeni_durum}
+
+def backfill(connection, *criteria):
+    """Atamaların zaman damgalarından geçiş olaylarını üret (INSERT ... SELECT)
+
+    Her atama için oluşturulma (None -> baslamadi), başlama (baslamadi -> devam)
+    ve tamamlanma (devam -> tamamlandi) olayları mevcut duruma göre eklenir.
+    criteria ile atamalar filtrelenebilir (ör. yeni eklenen satırlar).
+    """
+    bolum_id = func.coalesce(User.bolum_id, NO_DEPARTMENT)
+    created = UserTraining.created_at
+    started = func.coalesce(UserTraining.baslama_tarihi, created)
+    finished = func.coalesce(UserTraining.tamamlanma_tarihi, started)
+    steps = (
+        (None, 'baslamadi', created, None),
+        ('baslamadi', 'devam', started, ('devam', 'tamamlandi')),
+        ('devam', 'tamamlandi', finished, ('tamamlandi',)),
+    )
+    columns = ['atama_id', 'kullanici_id', 'egitim_id', 'bolum_id', 'onceki_durum', 'yeni_durum', 'zaman']
+    changed = [event_table.name]
+    for onceki, yeni, zaman, statuses in steps:
+        source = (select(UserTraining.id, UserTraining.kullanici_id, UserTraining.egitim_id, bolum_id,
+                         literal(onceki) if onceki else null(), literal(yeni), zaman)
+                  .join(User, User.id == UserTraining.kullanici_id)
+                  .where(*criteria))
+        if statuses is not None:
+            source = source.where(UserTraining.durum.in_(statuses))
+        inserted = connection.execute(insert(event_table).from_select(columns, source)).rowcount
+        if yeni == 'tamamlandi' and inserted:
+            changed.append(COMPLETIONS_VERSION)
+    mark_changed(changed)
+
+def _assignment_rows(session, *criteria):
+    """Veritabanındaki (flush öncesi) atamalar: {atama_id: (kullanici_id, egitim_id, bolum_id, durum)}"""
+    rows = session.connection().execute(
+        select(UserTraining.id, UserTraining.kullanici_id, UserTraining.egitim_id,
+               func.coalesce(User.bolum_id, NO_DEPARTMENT), UserTraining.durum)
+        .join(User, User.id == UserTraining.kullanici_id)
+        .where(*criteria)
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_before(session, flush_context, instances):
+    """Değişecek atamaların flush öncesi anahtarlarını topla"""
+    removed = [obj for obj in session.deleted if isinstance(obj, UserTraining)]
+    changed = [obj for obj in session.dirty
+               if isinstance(obj, UserTraining) and is_changed(obj, _TRACKED_ATTRIBUTES)]
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    deleted_trainings = {obj.id for obj in session.deleted if isinstance(obj, Training)}
+    moved_users = {obj.id for obj in session.dirty
+                   if isinstance(obj, User) and is_changed(obj, ('bolum_id',))}
+    deleted_departments = {obj.id for obj in session.deleted if isinstance(obj, Department)}
+    added = any(isinstance(obj, UserTraining) for obj in session.new)
+    if not (removed or changed or added or deleted_users or deleted_trainings
+            or moved_users or deleted_departments):
+        return
+
+    before = {}
+    touched = [obj for obj in removed + changed if obj.id is not None]
+    departments = user_departments(session, {old_value(obj, 'kullanici_id') for obj in touched}, old=True)
+    for obj in touched:
+        kullanici_id = old_value(obj, 'kullanici_id')
+        before[obj.id] = (kullanici_id, old_value(obj, 'egitim_id'), departments[kullanici_id],
+                          old_value(obj, 'durum'))
+
+    # Veritabanının ON DELETE ile sileceği veya bölümünü değiştireceği atamalar
+    orphaned_users = set()
+    if deleted_departments:
+        orphaned_users = set(session.connection().scalars(
+            select(User.id).where(User.bolum_id.in_(deleted_departments))))
+    gone = {obj.id for obj in removed}
+    if deleted_users:
+        rows = _assignment_rows(session, UserTraining.kullanici_id.in_(deleted_users))
+        before.update(rows)
+        gone.update(rows)
+    if deleted_trainings:
+        rows = _assignment_rows(session, UserTraining.egitim_id.in_(deleted_trainings))
+        before.update(rows)
+        gone.update(rows)
+    if moved_users or orphaned_users:
+        rows = _assignment_rows(session, UserTraining.kullanici_id.in_(moved_users | orphaned_users))
+        for atama_id, key in rows.items():
+            before.setdefault(atama_id, key)
+
+    session.info['_status_events'] = {
+        'before': before,
+        'gone': gone,
+        'changed': {obj.id for obj in changed},
+        'orphaned_users': orphaned_users - moved_users,
+    }
+
+@event.listens_for(db.session, 'after_flush')
+def _record_transitions(session, flush_context):
+    """Yeni anahtarları hesapla ve geçiş olaylarını yaz"""
+    pending = session.info.pop('_status_events', None)
+    if pending is None:
+        return
+
+    before, gone = pending['before'], pending['gone']
+    current = [obj for obj in session.new if isinstance(obj, UserTraining)]
+    current += [obj for obj in session.dirty
+                if isinstance(obj, UserTraining) and obj.id in pending['changed'] and obj.id not in gone]
+    current_ids = {obj.id for obj in current}
+    untouched = {atama_id: key for atama_id, key in before.items()
+                 if atama_id not in gone and atama_id not in current_ids}
+
+    user_ids = {obj.kullanici_id for obj in current} | {key[0] for key in untouched.values()}
+    departments = user_departments(session, user_ids, old=False)
+    # Silinen bölümün kullanıcıları bellekteki nesnelerde eski bölümü gösterebilir
+    departments.update({user_id: NO_DEPARTMENT for user_id in pending['orphaned_users'] & user_ids})
+
+    after = {obj.id: (obj.kullanici_id, obj.egitim_id, departments[obj.kullanici_id], obj.durum)
+             for obj in current}
+    after.update({atama_id: (kullanici_id, egitim_id, departments[kullanici_id], durum)
+                  for atama_id, (kullanici_id, egitim_id, _, durum) in untouched.items()})
+    record(session.connection(), transition_events(before, after))
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop('_status_events', None)
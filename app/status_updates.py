@@ -0,0 +1,327 @@
+"""
+Harici sistemlerden (LMS, webhook) toplu eğitim durum güncellemeleri
+
+Her öğe bir atamanın yeni durumunu bildirir:
+
+    {"email": "ayse@example.com", "egitim_kodu": "ISG-101", "durum": "tamamlandi",
+     "zaman": "2024-05-01T10:30:00Z"}
+
+Kullanıcı email veya kullanici_id ile verilir; zaman verilmezse işlem anı
+kullanılır. Öğeler STATUS_UPDATE_BATCH_SIZE'lık parçalar halinde işlenir. Her
+parça için:
+
+    - e-postalar/kullanıcı id'leri ve eğitim kodları birer sorguyla çözülür
+    - ilgili atamalar tek sorguyla okunur, geçişler bellekte doğrulanır
+    - değişen atamalar tek bir UPDATE ... FROM (VALUES ...) ile yazılır
+    - durum olayları, özet tablo farkları ve veri sürümleri aynı transaction'da
+      yazılır, parça commit edilir
+
+Durumlar yalnızca ileri gider (baslamadi -> devam -> tamamlandi). Başlamamış bir
+eğitim doğrudan tamamlandı bildirilirse iki adım aynı zamanla uygulanır. Atamanın
+mevcut durumu veya gerisindeki bir durum "unchanged" olarak raporlanır; böylece
+aynı gönderim tekrar oynatıldığında hiçbir şey yazılmaz. Ön koşul kontrolü
+(user.start_training) uygulanmaz; tamamlanma kaydının kaynağı harici sistemdir.
+
+Bildirilen zaman atamanın başlama/tamamlanma tarihine ve olayın kaynak_zaman
+sütununa yazılır. Olayın zaman sütunu işlem anıdır: uyum snapshot'ları
+(app.compliance) geçmişe eklenen olaylarla eskimez ve counts_at(şimdi) özet
+tabloyla tutarlı kalır.
+
+Uç nokta: POST /api/status-updates (app.api), komut: flask import-status-updates
+"""
+
+import json
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import Integer, String, DateTime, case, column, or_, select, tuple_, update, values
+from app import db
+from app.career import mark_users_changed
+from app.data_versions import mark_changed
+from app.models import Training, User, UserTraining
+from app.rollups import NO_DEPARTMENT, apply_deltas
+from app.status_events import record
+
+STATUSES = ('baslamadi', 'devam', 'tamamlandi')
+BATCH_SIZE = 1000
+# İstemci saatindeki küçük kaymalar için gelecekteki zamanlara tanınan pay
+CLOCK_SKEW = timedelta(minutes=5)
+# Geçerli kullanici_id aralığının üst sınırı (32 bit INTEGER sütunu)
+MAX_ID = 2 ** 31 - 1
+
+APPLIED = 'applied'
+UNCHANGED = 'unchanged'
+ERROR = 'error'
+
+_RANK = {durum: rank for rank, durum in enumerate(STATUSES)}
+
+StatusUpdate = namedtuple('StatusUpdate', ['kullanici_id', 'email', 'egitim_kodu', 'durum', 'zaman'])
+
+class InvalidPayload(ValueError):
+    pass
+
+class StatusUpdateReport:
+    """Öğe sırasıyla sonuçlar ve sonuç türlerine göre sayılar"""
+
+    def __init__(self):
+        self.results = []
+
+    def count(self, result):
+        return sum(1 for item in self.results if item['result'] == result)
+
+    def summary(self):
+        return {'total': len(self.results), APPLIED: self.count(APPLIED),
+                UNCHANGED: self.count(UNCHANGED), 'errors': self.count(ERROR)}
+
+def load_items(text, ndjson=None):
+    """JSON listesi, {"items": [...]} veya NDJSON metnini öğe listesine çevir
+
+    ndjson=None ise biçim içerikten anlaşılır. NDJSON'da çözümlenemeyen satırlar
+    listeye ham metin olarak eklenir ve öğe hatası olarak raporlanır.
+    """
+    if not ndjson:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            if ndjson is not None:
+                raise InvalidPayload('Geçersiz JSON.')
+        else:
+            if isinstance(data, dict):
+                data = data['items'] if 'items' in data else [data]
+            if not isinstance(data, list):
+                raise InvalidPayload('Öğe listesi bekleniyor.')
+            return data
+
+    items = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            items.append(line)
+    return items
+
+def _parse_time(value, now):
+    if value in (None, ''):
+        return now
+    if not isinstance(value, str):
+        raise ValueError
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def parse_item(item, now):
+    """Ham öğeden (StatusUpdate, None) veya (None, hata mesajı)"""
+    if not isinstance(item, dict):
+        return None, 'JSON nesnesi bekleniyor'
+    kullanici_id = item.get('kullanici_id')
+    if kullanici_id is not None and (not isinstance(kullanici_id, int) or isinstance(kullanici_id, bool)
+                                     or not 1 <= kullanici_id <= MAX_ID):
+        return None, 'Geçersiz kullanici_id'
+    email = item.get('email')
+    if email is not None and not isinstance(email, str):
+        return None, 'Geçersiz email'
+    email = (email or '').strip() or None
+    if kullanici_id is None and email is None:
+        return None, 'email veya kullanici_id gerekli'
+    egitim_kodu = item.get('egitim_kodu')
+    if not isinstance(egitim_kodu, str) or not egitim_kodu.strip():
+        return None, 'egitim_kodu gerekli'
+    durum = item.get('durum')
+    if not isinstance(durum, str) or durum not in _RANK:
+        return None, f"Geçersiz durum: {durum}"
+    try:
+        zaman = _parse_time(item.get('zaman'), now)
+    except (ValueError, OverflowError):
+        return None, 'Geçersiz zaman (ISO 8601 bekleniyor)'
+    if zaman > now + CLOCK_SKEW:
+        return None, 'Zaman gelecekte'
+    return StatusUpdate(kullanici_id, email, egitim_kodu.strip(), durum, zaman), None
+
+def _resolve_users(changes):
+    """{('id', kullanici_id) | ('email', email): kullanici_id} (tek sorgu)"""
+    ids = {change.kullanici_id for change in changes if change.kullanici_id is not None}
+    emails = {change.email for change in changes if change.kullanici_id is None}
+    if not ids and not emails:
+        return {}
+    resolved = {}
+    for user_id, email in db.session.execute(
+            select(User.id, User.email).where(or_(User.id.in_(ids), User.email.in_(emails)))):
+        resolved[('id', user_id)] = user_id
+        resolved[('email', email)] = user_id
+    return resolved
+
+def _resolve_trainings(changes):
+    """{egitim_kodu: egitim_id} (tek sorgu)"""
+    codes = {change.egitim_kodu for change in changes}
+    if not codes:
+        return {}
+    return dict(db.session.execute(select(Training.kod, Training.id).where(Training.kod.in_(codes))).all())
+
+def _load_assignments(pairs):
+    """{(kullanici_id, egitim_id): atama durumu sözlüğü} (tek sorgu)"""
+    if not pairs:
+        return {}
+    rows = db.session.execute(
+        select(UserTraining.id, UserTraining.kullanici_id, UserTraining.egitim_id, UserTraining.durum,
+               UserTraining.baslama_tarihi, User.bolum_id)
+        .join(User, User.id == UserTraining.kullanici_id)
+        .where(tuple_(UserTraining.kullanici_id, UserTraining.egitim_id).in_(list(pairs)))
+    )
+    return {(row.kullanici_id, row.egitim_id): {
+        'id': row.id, 'kullanici_id': row.kullanici_id, 'egitim_id': row.egitim_id,
+        'bolum_id': row.bolum_id or NO_DEPARTMENT, 'onceki_durum': row.durum, 'durum': row.durum,
+        'baslama_tarihi': row.baslama_tarihi, 'tamamlanma_tarihi': None, 'events': [], 'items': [],
+    } for row in rows}
+
+def _advance(assignment, change):
+    """Atamayı bellekte yeni duruma ilerlet; (sonuç, hata) döndür"""
+    if _RANK[change.durum] <= _RANK[assignment['durum']]:
+        return UNCHANGED, None
+    if assignment['durum'] == 'baslamadi':
+        start = change.zaman
+    else:
+        start = assignment['baslama_tarihi']
+    if change.durum == 'tamamlandi' and start is not None and change.zaman < start:
+        return ERROR, 'Tamamlanma zamanı başlama zamanından önce'
+
+    if assignment['durum'] == 'baslamadi':
+        assignment['events'].append(('baslamadi', 'devam', change.zaman))
+        assignment['baslama_tarihi'] = change.zaman
+    if change.durum == 'tamamlandi':
+        assignment['events'].append(('devam', 'tamamlandi', change.zaman))
+        assignment['tamamlanma_tarihi'] = change.zaman
+    assignment['durum'] = change.durum
+    return APPLIED, None
+
+def _write(changed, now):
+    """Değişen atamaları tek UPDATE ... FROM (VALUES ...) ile yaz; güncellenen id'ler
+
+    Okumadan sonra başka bir işlemle durumu değişmiş atamalar (durum artık
+    onceki_durum değil) güncellenmez ve dönen kümede yer almaz.
+    """
+    # Kullanılmayan zaman hücreleri NULL yerine now ile doldurulur (yalnızca NULL
+    # içeren bir VALUES sütununun tipi PostgreSQL'de text'e düşer); CASE bunları yok sayar
+    rows = values(column('id', Integer), column('onceki_durum', String), column('durum', String),
+                  column('baslama_tarihi', DateTime), column('tamamlanma_tarihi', DateTime),
+                  name='degisiklikler').data([
+        (assignment['id'], assignment['onceki_durum'], assignment['durum'],
+         assignment['baslama_tarihi'] or now, assignment['tamamlanma_tarihi'] or now)
+        for assignment in changed
+    ])
+    # SQLite "AS ad (sütunlar)" takma adını desteklemez; VALUES bir CTE olarak verilir
+    rows = rows.cte()
+    # ORM'siz (Core) UPDATE: session senkronizasyonu ve ORM derleme maliyeti olmadan
+    table = UserTraining.__table__
+    stmt = (update(table)
+            .add_cte(rows)
+            .where(table.c.id == rows.c.id, table.c.durum == rows.c.onceki_durum)
+            .values(durum=rows.c.durum,
+                    baslama_tarihi=case((rows.c.onceki_durum == 'baslamadi', rows.c.baslama_tarihi),
+                                        else_=table.c.baslama_tarihi),
+                    tamamlanma_tarihi=case((rows.c.durum == 'tamamlandi', rows.c.tamamlanma_tarihi),
+                                           else_=table.c.tamamlanma_tarihi))
+            .returning(table.c.id))
+    return set(db.session.connection().execute(stmt).scalars())
+
+def _result(index, result, assignment=None, previous=None, error=None):
+    item = {'index': index, 'result': result}
+    if assignment is not None:
+        item.update(assignment_id=assignment['id'], previous=previous, status=assignment['durum'])
+    if error is not None:
+        item['error'] = error
+    return item
+
+def apply_batch(entries, now):
+    """(sıra, ham öğe) çiftlerini uygula ve sonuçları sırayla döndür
+
+    Commit çağırana bırakılır.
+    """
+    results = {}
+    parsed = []
+    for index, item in entries:
+        change, error = parse_item(item, now)
+        if error:
+            results[index] = _result(index, ERROR, error=error)
+        else:
+            parsed.append((index, change))
+
+    users = _resolve_users([change for _, change in parsed])
+    trainings = _resolve_trainings([change for _, change in parsed])
+    keyed = []
+    for index, change in parsed:
+        if change.kullanici_id is not None:
+            kullanici_id = users.get(('id', change.kullanici_id))
+        else:
+            kullanici_id = users.get(('email', change.email))
+        egitim_id = trainings.get(change.egitim_kodu)
+        if kullanici_id is None:
+            results[index] = _result(index, ERROR, error='Kullanıcı bulunamadı')
+        elif egitim_id is None:
+            results[index] = _result(index, ERROR, error=f"Eğitim bulunamadı: {change.egitim_kodu}")
+        else:
+            keyed.append((index, (kullanici_id, egitim_id), change))
+
+    assignments = _load_assignments({pair for _, pair, _ in keyed})
+    for index, pair, change in keyed:
+        assignment = assignments.get(pair)
+        if assignment is None:
+            results[index] = _result(index, ERROR, error='Eğitim kullanıcıya atanmamış')
+            continue
+        previous = assignment['durum']
+        result, error = _advance(assignment, change)
+        results[index] = _result(index, result, assignment, previous, error)
+        if result == APPLIED:
+            assignment['items'].append(index)
+
+    changed = [assignment for assignment in assignments.values()
+               if assignment['durum'] != assignment['onceki_durum']]
+    updated = _write(changed, now) if changed else set()
+
+    events, deltas = [], {}
+    for assignment in changed:
+        if assignment['id'] not in updated:
+            for index in assignment['items']:
+                results[index] = _result(index, ERROR, error='Atama eşzamanlı olarak değişti; tekrar gönderin')
+            continue
+        events.extend({'atama_id': assignment['id'], 'kullanici_id': assignment['kullanici_id'],
+                       'egitim_id': assignment['egitim_id'], 'bolum_id': assignment['bolum_id'],
+                       'onceki_durum': onceki, 'yeni_durum': yeni, 'kaynak_zaman': zaman}
+                      for onceki, yeni, zaman in assignment['events'])
+        for durum, delta in ((assignment['onceki_durum'], -1), (assignment['durum'], 1)):
+            key = (assignment['egitim_id'], assignment['bolum_id'], durum)
+            deltas[key] = deltas.get(key, 0) + delta
+
+    if updated:
+        connection = db.session.connection()
+        mark_changed([UserTraining.__tablename__])
+        mark_users_changed({assignment['kullanici_id'] for assignment in changed
+                            if assignment['id'] in updated})
+        record(connection, events, zaman=now)
+        apply_deltas(connection, deltas)
+
+    return [results[index] for index, _ in entries]
+
+def apply_status_updates(items, batch_size=None, progress=None):
+    """Öğeleri parçalar halinde uygula ve StatusUpdateReport döndür
+
+    Her parça ayrı commit edilir; bir hata olursa yalnızca o parça geri alınır
+    ve hata yükseltilir. progress verilirse her parçadan sonra raporla çağrılır.
+    """
+    batch_size = batch_size or current_app.config.get('STATUS_UPDATE_BATCH_SIZE', BATCH_SIZE)
+    report = StatusUpdateReport()
+    now = datetime.utcnow()
+    for start in range(0, len(items), batch_size):
+        entries = list(enumerate(items[start:start + batch_size], start))
+        try:
+            results = apply_batch(entries, now)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        report.results.extend(results)
+        if progress is not None:
+            progress(report)
+    return report
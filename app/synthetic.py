@@ -0,0 +1,140 @@
+"""
+Sentetik organizasyon verisi
+
+Benchmark ve yük testleri için ayarlanabilir boyutta örnek veri üretir:
+bölümler, ön koşul zincirleri halinde eğitimler, eğitim-bölüm ilişkileri,
+kullanıcılar ve gerçekçi durum dağılımına sahip atamalar. Tüm tablolar toplu
+INSERT ile doldurulur; aynı seed ile her çalıştırmada aynı veri üretilir.
+
+Atamalar ön koşul sırasına uyar: bir zincirde kullanıcının ulaştığı noktadan
+önceki eğitimler tamamlanmış, ulaştığı eğitim devam ediyor veya başlamamış,
+sonrakiler başlamamıştır.
+"""
+
+import random
+from datetime import datetime, timedelta
+from app import db
+from app.models import Department, Level, Training, TrainingSection, User, UserTraining
+from app import career, data_versions, prerequisites, refdata, status_events
+from app.passwords import hash_password
+from app.reports import analytics
+from app.rollups import rebuild_rollups
+
+SYNTHETIC_PASSWORD = 'parola123'
+BATCH_SIZE = 5000
+
+# Kullanıcı adları bu listelerden türetilir (arama testleri için Türkçe harfler içerir)
+FIRST_NAMES = ('Ahmet', 'Ayşe', 'Mehmet', 'Fatma', 'Mustafa', 'Emine', 'Ali', 'Hatice', 'Hüseyin', 'Zeynep',
+               'İbrahim', 'Elif', 'Hasan', 'Özlem', 'Murat', 'Şule', 'Ömer', 'Gül', 'Çağlar', 'Işıl',
+               'Yusuf', 'Büşra', 'Emre', 'Merve', 'Burak', 'Derya', 'Oğuz', 'Sibel', 'Kadir', 'Ebru')
+LAST_NAMES = ('Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın', 'Özdemir',
+              'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan', 'Şimşek',
+              'Polat', 'Öz', 'Korkmaz', 'Erdoğan', 'Güneş', 'Işık', 'Uçar', 'Akın', 'Tekin', 'Ünal')
+
+def synthetic_name(index):
+    return f'{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index * 7 // len(FIRST_NAMES) % len(LAST_NAMES)]}'
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(db.insert(model), rows[start:start + BATCH_SIZE])
+
+def seed_synthetic(departments=8, trainings=120, users=2000, chain_length=4,
+                   trainings_per_department=30, seed=42, password=SYNTHETIC_PASSWORD,
+                   history_days=720):
+    """Sentetik organizasyonu oluştur ve oluşturulan kayıt sayılarını döndür
+
+    Veritabanında kayıt varsa önce temizlenmelidir; mevcut kayıtlarla çakışan
+    kod/e-posta değerleri benzersizlik kısıtına takılır. Atamalar son
+    history_days gün içine dağıtılır.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    if Level.query.count() == 0:
+        _insert(Level, [{'ad': ad} for ad in ('Temel', 'Orta', 'İleri')])
+    level_ids = db.session.scalars(db.select(Level.id).order_by(Level.id)).all()
+
+    _insert(Department, [
+        {'ad': f'Bölüm {i + 1:03d}', 'aciklama': f'Sentetik bölüm {i + 1}'} for i in range(departments)
+    ])
+    department_ids = db.session.scalars(
+        db.select(Department.id).where(Department.ad.like('Bölüm %')).order_by(Department.id)).all()
+
+    # Eğitimler chain_length uzunluğunda ön koşul zincirleri halinde
+    _insert(Training, [
+        {'kod': f'SN{i + 1:05d}', 'baslik': f'Sentetik Eğitim {i + 1}',
+         'aciklama': 'Sentetik veri', 'created_at': now - timedelta(minutes=trainings - i)}
+        for i in range(trainings)
+    ])
+    training_ids = db.session.scalars(
+        db.select(Training.id).where(Training.kod.like('SN%')).order_by(Training.id)).all()
+    chains = [training_ids[i:i + chain_length] for i in range(0, len(training_ids), chain_length)]
+    db.session.execute(db.update(Training), [
+        {'id': chain[position], 'pre_requisite_id': chain[position - 1]}
+        for chain in chains for position in range(1, len(chain))
+    ])
+
+    # Her bölüm rastgele zincirlerin eğitimlerini seviye sırasıyla alır
+    department_chains = {}
+    sections = []
+    for bolum_id in department_ids:
+        chosen = rng.sample(chains, min(len(chains), max(1, trainings_per_department // chain_length)))
+        department_chains[bolum_id] = chosen
+        for chain in chosen:
+            for position, egitim_id in enumerate(chain):
+                sections.append({'egitim_id': egitim_id, 'bolum_id': bolum_id,
+                                 'seviye_id': level_ids[min(position, len(level_ids) - 1)]})
+    _insert(TrainingSection, sections)
+
+    password_hash = hash_password(password)
+    roles = ['Personel'] * 18 + ['Eğitmen'] * 2
+    _insert(User, [
+        {'isim': synthetic_name(i), 'email': f'kullanici{i + 1}@example.com',
+         'sifre_hash': password_hash, 'rol': rng.choice(roles),
+         'bolum_id': department_ids[i % len(department_ids)] if department_ids else None,
+         'is_active': rng.random() > 0.03, 'created_at': now - timedelta(minutes=users - i)}
+        for i in range(users)
+    ])
+    user_rows = db.session.execute(
+        db.select(User.id, User.bolum_id).where(User.email.like('kullanici%@example.com'))).all()
+
+    assignments = []
+    for kullanici_id, bolum_id in user_rows:
+        for chain in department_chains.get(bolum_id, ()):
+            # Kullanıcının zincirde ulaştığı nokta; kıdemliler zincirin sonuna yakın
+            reached = min(len(chain), int(rng.betavariate(1.4, 1.2) * (len(chain) + 1)))
+            for position, egitim_id in enumerate(chain):
+                assigned_at = now - timedelta(days=rng.randint(30, max(30, history_days)))
+                row = {'kullanici_id': kullanici_id, 'egitim_id': egitim_id, 'durum': 'baslamadi',
+                       'created_at': assigned_at, 'baslama_tarihi': None, 'tamamlanma_tarihi': None}
+                # Başlama ve tamamlanma tarihleri geleceğe taşmaz
+                if position < reached:
+                    started = min(assigned_at + timedelta(days=rng.randint(0, 20)), now)
+                    row.update(durum='tamamlandi', baslama_tarihi=started,
+                               tamamlanma_tarihi=min(started + timedelta(days=rng.randint(1, 30)), now))
+                elif position == reached and rng.random() < 0.6:
+                    row.update(durum='devam',
+                               baslama_tarihi=min(assigned_at + timedelta(days=rng.randint(0, 20)), now))
+                assignments.append(row)
+    _insert(UserTraining, assignments)
+
+    rebuild_rollups()
+    # Durum geçmişi atamaların zaman damgalarından üretilir
+    status_events.backfill(db.session.connection(), User.email.like('kullanici%@example.com'))
+    data_versions.mark_changed([model.__tablename__ for model in (
+        Level, Department, Training, TrainingSection, User, UserTraining)])
+    db.session.commit()
+
+    # Toplu yazmalar session olaylarını atladığı için önbellekler elle temizlenir
+    refdata.invalidate()
+    prerequisites.reset_graph()
+    career.reset_cache()
+    analytics.reset_cache()
+
+    return {
+        'departments': len(department_ids),
+        'trainings': len(training_ids),
+        'sections': len(sections),
+        'users': len(user_rows),
+        'assignments': len(assignments),
+    }
@@ -1,7 +1,8 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SelectField, SubmitField
 from wtforms.validators import DataRequired, Length, Email, ValidationError
-from app.models import User, Department
+from app.models import User
+from app.refdata import department_choices
 
 class ProfileForm(FlaskForm):
     isim = StringField('Ad Soyad', validators=[DataRequired(), Length(min=2, max=100)])
@@ -12,7 +13,7 @@ class ProfileForm(FlaskForm):
     def __init__(self, original_email, *args, **kwargs):
         super(ProfileForm, self).__init__(*args, **kwargs)
         self.original_email = original_email
-        self.bolum_id.choices = [(d.id, d.ad) for d in Department.query.all()]
+        self.bolum_id.choices = department_choices()
     
     def validate_email(self, email):
         if email.data != self.original_email:
@@ -0,0 +1,29 @@
+"""
+Kullanıcı paneli sorguları
+
+Sayılar veritabanında gruplanarak, listeler sınırlı ve eager-loaded olarak
+çekilir; kullanıcının atama sayısı arttıkça bellek kullanımı artmaz.
+"""
+
+from sqlalchemy import func, select
+from app.models import UserTraining
+
+DASHBOARD_PANEL_LIMIT = 5
+
+_PANEL_ORDER = {
+    'devam': UserTraining.baslama_tarihi,
+    'tamamlandi': UserTraining.tamamlanma_tarihi,
+}
+
+def status_counts_query(kullanici_id):
+    """Kullanıcının atamalarının durum bazında sayıları"""
+    return (select(UserTraining.durum, func.count(UserTraining.id))
+            .where(UserTraining.kullanici_id == kullanici_id)
+            .group_by(UserTraining.durum))
+
+def panel_query(kullanici_id, durum, limit=DASHBOARD_PANEL_LIMIT):
+    """Durumdaki en son atamalar (eğitimleriyle birlikte)"""
+    return (UserTraining.with_profile('training_list')
+            .filter_by(kullanici_id=kullanici_id, durum=durum)
+            .order_by(_PANEL_ORDER[durum].desc())
+            .limit(limit))
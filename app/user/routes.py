@@ -3,28 +3,28 @@ from flask_login import login_required, current_user
 from app import db
 from app.user import bp
 from app.user.forms import ProfileForm
+from app.user.queries import status_counts_query, panel_query
 from app.models import UserTraining, Training, TrainingSection, Department
+from app.prerequisites import get_graph as get_prerequisite_graph, completed_mask
+from app.refdata import training_choices, department_name
+from app.career import career_progress
 from datetime import datetime
 
 @bp.route('/dashboard')
 @login_required
 def dashboard():
-    # Kullanıcının eğitimleri
-    user_trainings = UserTraining.query.filter_by(kullanici_id=current_user.id).all()
-    
-    # İstatistikler
+    # İstatistikler (tek GROUP BY sorgusu)
+    counts = dict(db.session.execute(status_counts_query(current_user.id)).all())
     stats = {
-        'total_assigned': len(user_trainings),
-        'completed': len([ut for ut in user_trainings if ut.durum == 'tamamlandi']),
-        'in_progress': len([ut for ut in user_trainings if ut.durum == 'devam']),
-        'not_started': len([ut for ut in user_trainings if ut.durum == 'baslamadi'])
+        'total_assigned': sum(counts.values()),
+        'completed': counts.get('tamamlandi', 0),
+        'in_progress': counts.get('devam', 0),
+        'not_started': counts.get('baslamadi', 0)
     }
     
-    # Devam eden eğitimler
-    in_progress = [ut for ut in user_trainings if ut.durum == 'devam']
-    
-    # Tamamlanan eğitimler
-    completed = [ut for ut in user_trainings if ut.durum == 'tamamlandi']
+    # Devam eden ve son tamamlanan eğitimler (sınırlı)
+    in_progress = panel_query(current_user.id, 'devam').all() if stats['in_progress'] else []
+    completed = panel_query(current_user.id, 'tamamlandi').all() if stats['completed'] else []
     
     return render_template('user/dashboard.html', 
                          stats=stats,
@@ -48,13 +48,30 @@ def profile():
         form.email.data = current_user.email
         form.bolum_id.data = current_user.bolum_id
     
-    return render_template('user/profile.html', form=form)
+    return render_template('user/profile.html', form=form, department_name=department_name(current_user.bolum_id))
 
 @bp.route('/trainings')
 @login_required
 def my_trainings():
-    user_trainings = UserTraining.query.filter_by(kullanici_id=current_user.id).all()
-    return render_template('user/trainings.html', user_trainings=user_trainings)
+    durum = request.args.get('durum')
+    if durum not in ('baslamadi', 'devam', 'tamamlandi'):
+        durum = None
+    
+    query = UserTraining.with_profile('training_list').filter_by(kullanici_id=current_user.id)
+    if durum:
+        query = query.filter_by(durum=durum)
+    user_trainings = query.all()
+    
+    # Ön koşulları tamamlanmamış eğitimler başlatılamaz
+    graph = get_prerequisite_graph()
+    if durum == 'baslamadi':
+        completed = completed_mask(graph, current_user.id)
+    else:
+        completed = graph.mask(ut.egitim_id for ut in user_trainings if ut.durum == 'tamamlandi')
+    locked_ids = {ut.egitim_id for ut in user_trainings
+                  if ut.durum == 'baslamadi' and not graph.can_start(ut.egitim_id, completed)}
+    
+    return render_template('user/trainings.html', user_trainings=user_trainings, locked_ids=locked_ids, durum=durum)
 
 @bp.route('/training/<int:training_id>/start', methods=['POST'])
 @login_required
@@ -69,6 +86,14 @@ def start_training(training_id):
         return redirect(url_for('user.my_trainings'))
     
     if user_training.durum == 'baslamadi':
+        graph = get_prerequisite_graph()
+        completed = completed_mask(graph, current_user.id)
+        if not graph.can_start(training_id, completed):
+            labels = dict(training_choices())
+            missing = ', '.join(labels.get(id, str(id)) for id in graph.missing(training_id, completed))
+            flash(f'Bu eğitime başlamadan önce ön koşul eğitimlerini tamamlamalısınız: {missing}', 'warning')
+            return redirect(url_for('user.my_trainings'))
+        
         user_training.durum = 'devam'
         user_training.baslama_tarihi = datetime.utcnow()
         db.session.commit()
@@ -109,7 +134,7 @@ def training_detail(training_id):
         return redirect(url_for('user.my_trainings'))
     
     training = Training.query.get(training_id)
-    sections = TrainingSection.query.filter_by(egitim_id=training_id).all()
+    sections = TrainingSection.with_profile('section_list').filter_by(egitim_id=training_id).all()
     
     return render_template('user/training_detail.html', 
                          user_training=user_training,
@@ -119,35 +144,15 @@ def training_detail(training_id):
 @bp.route('/career-path')
 @login_required
 def career_path():
-    # Kullanıcının bölümü
-    user_department = current_user.bolum
-    
-    # Bölümdeki tüm eğitimler
-    department_trainings = TrainingSection.query.filter_by(bolum_id=user_department.id).all()
+    # Seviye bazında ilerleme (tek gruplu sorgu, kullanıcı/bölüm bazında önbellekli)
+    progress_by_level = career_progress(current_user.id, current_user.bolum_id)
     
-    # Kullanıcının tamamladığı eğitimler
-    completed_trainings = UserTraining.query.filter_by(
-        kullanici_id=current_user.id,
-        durum='tamamlandi'
-    ).all()
-    
-    # Seviye bazında ilerleme
-    progress_by_level = {}
-    for section in department_trainings:
-        level_name = section.seviye.ad
-        if level_name not in progress_by_level:
-            progress_by_level[level_name] = {'total': 0, 'completed': 0}
-        
-        progress_by_level[level_name]['total'] += 1
-        
-        # Bu eğitimi tamamlamış mı kontrol et
-        for ut in completed_trainings:
-            if ut.egitim_id == section.egitim_id:
-                progress_by_level[level_name]['completed'] += 1
-                break
+    totals = {
+        'total': sum(level['total'] for level in progress_by_level),
+        'completed': sum(level['completed'] for level in progress_by_level)
+    }
     
     return render_template('user/career_path.html',
-                         user_department=user_department,
+                         department_name=department_name(current_user.bolum_id),
                          progress_by_level=progress_by_level,
-                         department_trainings=department_trainings,
-                         completed_trainings=completed_trainings) 
\ No newline at end of file
+                         totals=totals)
@@ -0,0 +1,166 @@
+"""
+CSV'den toplu kullanıcı aktarımı
+
+Dosya satır satır okunur ve IMPORT_CHUNK_SIZE satırlık parçalar halinde
+işlenir. Her parça için:
+
+    - bölüm adları tek seferde yüklenen seçim listesinden id'ye çevrilir
+    - e-postalar dosyanın önceki satırlarına ve users tablosuna karşı tek
+      sorguyla kontrol edilir
+    - şifresi verilen satırlar süreç havuzunda özetlenir; şifre sütunu boş
+      olan satırlara varsayılan şifrenin tek bir özeti yazılır
+    - kullanıcılar toplu INSERT ile eklenir ve istenirse bölümlerinin
+      TrainingSection eşlemesindeki eğitimler atanır
+    - parça commit edilir
+
+Hatalı satırlar atlanır ve satır numarasıyla rapora eklenir; geçerli satırlar
+aktarılır.
+
+Beklenen sütunlar: isim, email (zorunlu), bolum, rol, sifre (isteğe bağlı).
+Ayraç olarak ';' veya ',' kullanılabilir.
+
+Yönetim panelinden yüklenen dosyalar arka plan işi olarak aktarılır
+(app.job_handlers).
+"""
+
+import csv
+import re
+from collections import namedtuple
+from app import db
+from app.models import User
+from app.assignments import bulk_assign
+from app.data_versions import mark_changed
+from app.passwords import hash_many, hash_password
+from app.refdata import department_choices
+
+IMPORT_CHUNK_SIZE = 5000
+DEFAULT_PASSWORD = '123456'
+ROLES = ('Personel', 'Eğitmen', 'Admin')
+REQUIRED_COLUMNS = ('isim', 'email')
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+RowError = namedtuple('RowError', ['line', 'email', 'message'])
+
+class InvalidImportFile(ValueError):
+    pass
+
+class ImportReport:
+    """Aktarımın ilerleme durumu ve satır bazında hatalar"""
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.assigned = 0
+        self.errors = []
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+def read_rows(stream):
+    """(satır numarası, {sütun: değer}) çiftleri; başlık satırı 1. satırdır"""
+    first_line = stream.readline()
+    delimiter = ';' if first_line.count(';') > first_line.count(',') else ','
+    header = [column.strip().lower() for column in next(csv.reader([first_line], delimiter=delimiter), [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise InvalidImportFile(f"Eksik sütun: {', '.join(missing)}")
+
+    for line, values in enumerate(csv.reader(stream, delimiter=delimiter), start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line, {column: value.strip() for column, value in zip(header, values)}
+
+def _validate(line, row, departments, seen_emails):
+    email = row.get('email', '')
+    if not row.get('isim'):
+        return RowError(line, email, 'İsim boş')
+    if len(row['isim']) > 100:
+        return RowError(line, email, 'İsim 100 karakterden uzun')
+    if not EMAIL_PATTERN.match(email) or len(email) > 120:
+        return RowError(line, email, 'Geçersiz e-posta')
+    if email in seen_emails:
+        return RowError(line, email, 'E-posta dosyada tekrar ediyor')
+    if row.get('bolum') and row['bolum'] not in departments:
+        return RowError(line, email, f"Bölüm bulunamadı: {row['bolum']}")
+    if row.get('rol') and row['rol'] not in ROLES:
+        return RowError(line, email, f"Geçersiz rol: {row['rol']}")
+    if row.get('sifre') and len(row['sifre']) < 6:
+        return RowError(line, email, 'Şifre en az 6 karakter olmalı')
+    return None
+
+def _existing_emails(emails):
+    if not emails:
+        return set()
+    return set(db.session.scalars(db.select(User.email).where(User.email.in_(emails))))
+
+def _import_chunk(chunk, report, departments, seen_emails, default_hash, assign_trainings):
+    valid, errors = [], []
+    for line, row in chunk:
+        error = _validate(line, row, departments, seen_emails)
+        if error:
+            errors.append(error)
+        else:
+            seen_emails.add(row['email'])
+            valid.append((line, row))
+
+    existing = _existing_emails([row['email'] for _, row in valid])
+    if existing:
+        errors.extend(RowError(line, row['email'], 'E-posta zaten kayıtlı')
+                      for line, row in valid if row['email'] in existing)
+        valid = [(line, row) for line, row in valid if row['email'] not in existing]
+    report.errors.extend(sorted(errors))
+
+    if valid:
+        explicit = [row['sifre'] for _, row in valid if row.get('sifre')]
+        hashes = iter(hash_many(explicit))
+        db.session.execute(db.insert(User), [
+            {'isim': row['isim'], 'email': row['email'], 'rol': row.get('rol') or 'Personel',
+             'bolum_id': departments.get(row.get('bolum')), 'is_active': True,
+             'sifre_hash': next(hashes) if row.get('sifre') else default_hash}
+            for _, row in valid
+        ])
+        mark_changed([User.__tablename__])
+        report.created += len(valid)
+
+        if assign_trainings:
+            user_ids = db.session.scalars(
+                db.select(User.id).where(User.email.in_([row['email'] for _, row in valid]),
+                                         User.bolum_id.is_not(None))).all()
+            if user_ids:
+                report.assigned += bulk_assign(kullanici_ids=user_ids, use_sections=True).inserted
+
+    db.session.commit()
+    report.processed += len(chunk)
+
+def import_users(stream, assign_trainings=False, progress=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """Metin akışındaki CSV'den kullanıcıları aktar ve ImportReport döndür
+
+    progress verilirse her parça commit edildikten sonra rapor ile çağrılır.
+    """
+    report = ImportReport()
+    departments = {ad: id for id, ad in department_choices()}
+    default_hash = hash_password(DEFAULT_PASSWORD)
+    seen_emails = set()
+
+    chunk = []
+    try:
+        for line, row in read_rows(stream):
+            chunk.append((line, row))
+            if len(chunk) >= chunk_size:
+                _import_chunk(chunk, report, departments, seen_emails, default_hash, assign_trainings)
+                chunk = []
+                if progress is not None:
+                    progress(report)
+        if chunk:
+            _import_chunk(chunk, report, departments, seen_emails, default_hash, assign_trainings)
+    except Exception:
+        db.session.rollback()
+        raise
+    return report
+
+def write_error_report(errors, handle):
+    """Satır hatalarını CSV olarak yaz"""
+    writer = csv.writer(handle, delimiter=';')
+    writer.writerow(['satir', 'email', 'hata'])
+    writer.writerows(errors)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tamamlanma analizi benchmark'ı
+
+1 milyon başlamış atamalık bir veritabanında analizin uçtan uca süresini
+(veritabanından parçalar halinde okuma + eğitim/bölüm/seviye bazında süre
+dağılımı, takılan atamalar, haftalık eğilim) ölçer. Hesaplamanın bir saniyenin
+altında kaldığını ve parçalı okumanın en yüksek bellek kullanımının tüm
+satırları tek seferde (.all()) okumanın en fazla MEMORY_RATIO katı olduğunu
+doğrular. Önbellekli summary() için profil değişikliğinden sonra dizilerin
+yeniden okunmadığını ve süre dolunca sonucun okuma yapılmadan yeniden
+hesaplandığını ölçer.
+
+Kullanım: python -m benchmarks.bench_analytics [--rows 1000000]
+"""
+
+import argparse
+import itertools
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, select
+from app import create_app, db
+from app.models import Training, User, UserTraining
+from app.reports import analytics
+from app.synthetic import seed_synthetic
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+ROW_COUNT = 1_000_000
+USERS = 20000
+TRAININGS = 500
+INSERT_BATCH = 100000
+COMPUTE_LIMIT_MS = 1000
+MEMORY_RATIO = 0.5
+
+class AnalyticsConfig(BenchmarkConfig):
+    PERF_RING_BUFFER_SIZE = 0
+
+def assignment_rows(user_ids, training_ids, per_user, seed=42):
+    """Her kullanıcıya farklı per_user eğitim; %70 tamamlanmış, son iki yıl içinde başlamış"""
+    np = analytics.np
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    step = len(training_ids) // per_user
+    for offset, kullanici_id in enumerate(user_ids):
+        started = rng.uniform(1, 730, per_user)
+        completed = rng.random(per_user) < 0.7
+        took = rng.gamma(2.0, 8.0, per_user)
+        for position in range(per_user):
+            baslama = now - timedelta(days=float(started[position]))
+            tamamlanma = baslama + timedelta(days=float(took[position]))
+            done = bool(completed[position]) and tamamlanma < now
+            yield {'kullanici_id': kullanici_id,
+                   'egitim_id': training_ids[(offset * 37 + position * step) % len(training_ids)],
+                   'durum': 'tamamlandi' if done else 'devam',
+                   'baslama_tarihi': baslama, 'tamamlanma_tarihi': tamamlanma if done else None,
+                   'created_at': baslama}
+
+def build_database(row_count):
+    """Sentetik organizasyon + row_count başlamış atama (Core ile toplu ekleme)"""
+    seed_synthetic(departments=40, trainings=TRAININGS, users=USERS, trainings_per_department=4,
+                   history_days=730)
+    db.session.execute(delete(UserTraining))
+    user_ids = db.session.scalars(select(User.id).order_by(User.id)).all()
+    training_ids = db.session.scalars(select(Training.id).order_by(Training.id)).all()
+    per_user = -(-row_count // len(user_ids))
+    rows = itertools.islice(assignment_rows(user_ids, training_ids, per_user), row_count)
+    connection = db.session.connection()
+    while batch := list(itertools.islice(rows, INSERT_BATCH)):
+        connection.execute(insert(UserTraining.__table__), batch)
+    db.session.commit()
+    return db.session.scalar(select(func.count()).select_from(UserTraining))
+
+def load_all_rows():
+    """Karşılaştırma: satırları tek seferde listeye okuyup diziye çeviren önceki yöntem"""
+    np = analytics.np
+    rows = db.session.execute(analytics.columns_query()).all()
+    return np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64,
+                       count=len(rows) * 6).reshape(len(rows), 6)
+
+def peak_mb(function):
+    tracemalloc.start()
+    try:
+        result = function()
+        return result, tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+def run(row_count=ROW_COUNT):
+    print("📊 Tamamlanma analizi benchmark'ı")
+    if not analytics.available():
+        print("❌ NumPy kurulu değil (pip install -r requirements.txt)")
+        return False
+
+    app = create_app(AnalyticsConfig)
+    ok = True
+    with app.app_context():
+        db.create_all()
+        with timer() as build_time:
+            total = build_database(row_count)
+        print(f"   Veritabanı: {total} atama, {build_time['ms'] / 1000:.1f} sn")
+
+        with count_queries(db.engine) as queries, timer() as load_time:
+            columns = analytics.load_columns()
+        analytics.compute(columns)
+        with timer() as compute_time:
+            result = analytics.compute(columns)
+        del columns
+
+        _, streamed_mb = peak_mb(analytics.load_columns)
+        _, all_mb = peak_mb(load_all_rows)
+
+        analytics.reset_cache()
+        loads = []
+        load_columns = analytics.load_columns
+        analytics.load_columns = lambda: loads.append(1) or load_columns()
+        try:
+            with timer() as cold:
+                analytics.summary()
+            # Profil değişikliği: tamamlanma sürümü değişmez, diziler yeniden okunmaz
+            user = db.session.scalars(select(User).limit(1)).one()
+            user.isim += ' (güncel)'
+            db.session.commit()
+            with count_queries(db.engine) as warm_queries, timer() as warm:
+                analytics.summary()
+            app.config['ANALYTICS_CACHE_TTL'] = 0
+            with timer() as expired:
+                analytics.summary()
+        finally:
+            analytics.load_columns = load_columns
+        db.session.remove()
+
+    total_ms = load_time['ms'] + compute_time['ms']
+    print(f"   Okuma:    {load_time['ms']:.0f} ms, {queries.count} sorgu, "
+          f"{analytics.LOAD_BATCH_SIZE} satırlık parçalar")
+    print(f"   Hesaplama: {compute_time['ms']:.0f} ms (medyan {result['genel']['medyan_gun']:.1f} gün, "
+          f"{result['genel']['takilan']} takılan)")
+    print(f"   Toplam:   {total_ms:.0f} ms ({result['satir']} satır)")
+    print(f"   En yüksek bellek: parçalı okuma {streamed_mb:.0f} MB, .all() {all_mb:.0f} MB")
+    print(f"   summary(): ilk {cold['ms']:.0f} ms, profil değişikliği sonrası {warm['ms']:.1f} ms "
+          f"({warm_queries.count} sorgu), süre dolunca {expired['ms']:.0f} ms; {len(loads)} okuma")
+
+    if result['satir'] != total:
+        ok = False
+        print(f"❌ Okunan satır sayısı {result['satir']}, beklenen {total}")
+    if queries.count != 1:
+        ok = False
+        print(f"❌ Okuma {queries.count} sorgu çalıştırdı")
+    if compute_time['ms'] >= COMPUTE_LIMIT_MS:
+        ok = False
+        print(f"❌ Hesaplama {COMPUTE_LIMIT_MS} ms sınırını aştı")
+    if len(loads) != 1 or warm_queries.count != 1:
+        ok = False
+        print("❌ Önbellekli summary() dizileri yeniden okudu")
+    if expired['ms'] >= COMPUTE_LIMIT_MS:
+        ok = False
+        print(f"❌ Süre dolunca yeniden hesaplama {COMPUTE_LIMIT_MS} ms sınırını aştı")
+    if streamed_mb > all_mb * MEMORY_RATIO:
+        ok = False
+        print(f"❌ Parçalı okuma belleği .all() belleğinin {MEMORY_RATIO} katını aştı")
+    if ok:
+        print(f"✓ {result['satir']} satır {total_ms / 1000:.2f} sn'de okunup analiz edildi")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=ROW_COUNT)
+    args = parser.parse_args()
+    return run(row_count=args.rows)
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Atama sayfası boyutu ve seçim API'si benchmark'ı
+
+İki ölçekte (küçük ve büyük katalog) atama formlarının HTML boyutunu ölçer ve
+eski seçim listesinin (her eğitim için bir <option>) sayfaya ekleyeceği baytla
+karşılaştırır. Sayfa boyutunun ölçekten bağımsız kaldığını, /api uç
+noktalarının (arama, sayfalama, ids) az sayıda sorguyla yanıt verdiğini doğrular.
+
+Kullanım: python -m benchmarks.bench_api
+"""
+
+import sys
+from markupsafe import escape
+from sqlalchemy import select, update
+from app import create_app, db, identity
+from app.models import Training, User
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+SCALES = [
+    {'departments': 8, 'trainings': 100, 'users': 1000},
+    {'departments': 40, 'trainings': 5000, 'users': 20000},
+]
+PAGES = [
+    '/admin/users/2/assign-trainings',
+    '/admin/user-assignments/add',
+    '/admin/user-assignments/bulk',
+]
+API_REQUESTS = [
+    '/api/users?q=ay&limit=10',
+    '/api/trainings?q=eg&limit=10&kullanici_id=2',
+    '/api/trainings?limit=20',
+    '/api/departments?limit=20',
+    '/api/trainings?ids=1,2,3,4,5',
+]
+API_QUERY_LIMIT = 5
+ITERATIONS = 20
+
+class ApiConfig(BenchmarkConfig):
+    PERF_RING_BUFFER_SIZE = 0
+    QUERY_BUDGET_MODE = 'log'
+    HTTP_CACHE = False
+
+def option_bytes():
+    """Eski SelectMultipleField'ın eğitim listesi için ürettiği <option> baytları"""
+    rows = db.session.execute(select(Training.id, Training.kod, Training.baslik)).all()
+    return sum(len(f'<option value="{row.id}">{escape(row.kod)} - {escape(row.baslik)}</option>'.encode())
+               for row in rows)
+
+def measure_scale(scale):
+    app = create_app(ApiConfig)
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(history_days=30, **scale)
+        db.session.execute(update(User).where(User.id == 1).values(rol='Admin'))
+        db.session.commit()
+        # Kimlik önbelleği süreç genelinde; önceki ölçeğin 1 numaralı kullanıcısı silinir
+        identity.invalidate([1])
+        email = db.session.get(User, 1).email
+        options = option_bytes()
+        engine = db.engine
+        db.session.remove()
+
+    client = app.test_client()
+    client.post('/auth/login', data={'email': email, 'password': SYNTHETIC_PASSWORD}, follow_redirects=True)
+    sizes = {url: len(client.get(url).data) for url in PAGES}
+
+    api = {}
+    for url in API_REQUESTS:
+        response = client.get(url)
+        if response.status_code != 200:
+            print(f"❌ {url}: HTTP {response.status_code}")
+            return None
+        items = len(response.get_json()['items'])
+        with count_queries(engine) as queries, timer() as elapsed:
+            for _ in range(ITERATIONS):
+                client.get(url)
+        api[url] = (elapsed['ms'] / ITERATIONS, queries.count // ITERATIONS, items)
+
+    # İkinci sayfa: ilk yanıtın imleciyle
+    cursor = client.get('/api/trainings?limit=20').get_json()['next_cursor']
+    second = client.get('/api/trainings', query_string={'limit': 20, 'cursor': cursor}).get_json()
+    if not second['items']:
+        print("❌ İmleçle ikinci sayfa boş döndü")
+        return None
+    return sizes, options, api
+
+def run():
+    print("📊 Atama sayfası boyutu ve seçim API'si benchmark'ı")
+    results = []
+    for scale in SCALES:
+        measured = measure_scale(scale)
+        if measured is None:
+            return False
+        results.append((scale, *measured))
+
+    ok = True
+    print(f"   {'Sayfa':<36} " + ' '.join(f"{scale['trainings']:>6} eğitim" for scale, *_ in results))
+    for url in PAGES:
+        print(f"   {url:<36} " + ' '.join(f"{sizes[url] / 1024:>9.1f} KB" for _, sizes, _, _ in results))
+    print(f"   {'Eski <option> listesi (eğitimler)':<36} "
+          + ' '.join(f"{options / 1024:>9.1f} KB" for _, _, options, _ in results))
+
+    small, large = results[0][1], results[-1][1]
+    for url in PAGES:
+        # İsimler ve sayaçlar gibi küçük farklar dışında boyut değişmemeli
+        if abs(large[url] - small[url]) > 512:
+            ok = False
+            print(f"❌ {url} sayfa boyutu katalogla büyüyor: {small[url]} -> {large[url]} bayt")
+
+    scale, _, _, api = results[-1]
+    print(f"   API ({scale['users']} kullanıcı, {scale['trainings']} eğitim):")
+    for url, (ms, queries, items) in api.items():
+        flag = '' if queries <= API_QUERY_LIMIT else '  ❌'
+        print(f"     {url:<48} {ms:>7.2f} ms {queries:>3} sorgu {items:>4} öğe{flag}")
+        if queries > API_QUERY_LIMIT:
+            ok = False
+
+    if ok:
+        print("✓ Atama sayfaları katalog boyutundan bağımsız, API istekleri "
+              f"en fazla {API_QUERY_LIMIT} sorguyla yanıtlanıyor")
+    return ok
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
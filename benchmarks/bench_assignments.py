@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Toplu atama benchmark'ı
+
+3.000 kullanıcıya 35 eğitimin (~100 bin çift) atanma süresini ve aynı
+atamanın tekrarında (tüm çiftler mevcut) atlanan satır sayısını ölçer.
+
+Kullanım: python -m benchmarks.bench_assignments
+"""
+
+import sys
+from app import create_app, db
+from app.assignments import bulk_assign
+from app.models import Department, Training, User, UserTraining
+from app.rollups import check_rollups
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+USER_COUNT = 3000
+TRAINING_COUNT = 35
+
+def seed():
+    department = Department(ad='Benchmark Bölümü')
+    db.session.add(department)
+    db.session.flush()
+    db.session.execute(db.insert(User), [
+        {'isim': f'Kullanıcı {i}', 'email': f'user{i}@example.com', 'sifre_hash': '-',
+         'bolum_id': department.id, 'is_active': True}
+        for i in range(USER_COUNT)
+    ])
+    db.session.execute(db.insert(Training), [
+        {'kod': f'B{i:03d}', 'baslik': f'Benchmark Eğitimi {i}'} for i in range(TRAINING_COUNT)
+    ])
+    db.session.commit()
+    return department.id
+
+def run():
+    print("📊 Toplu atama benchmark'ı")
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        department_id = seed()
+        training_ids = db.session.scalars(db.select(Training.id)).all()
+
+        for label in ('İlk atama', 'Tekrar'):
+            with count_queries(db.engine) as queries, timer() as elapsed:
+                result = bulk_assign(egitim_ids=training_ids, bolum_id=department_id)
+                db.session.commit()
+            print(f"   {label}: {result.inserted} eklendi, {result.skipped} atlandı "
+                  f"({result.total} çift) - {elapsed['ms']:.0f} ms, {queries.count} sorgu")
+
+        expected = USER_COUNT * TRAINING_COUNT
+        if UserTraining.query.count() != expected:
+            print(f"❌ Beklenen atama sayısı {expected}, bulunan {UserTraining.query.count()}")
+            return False
+        if check_rollups():
+            print("❌ Özet tablo atamalarla tutarsız")
+            return False
+
+    print("✓ Toplu atama tutarlı")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Geçmişe dönük uyum sorgusu benchmark'ı
+
+Dört yıllık sentetik atama geçmişinden durum olaylarını üretir, haftalık
+snapshot'ları oluşturur ve rastgele tarihlerde bölüm bazında tamamlanma
+sayılarını iki yolla hesaplar:
+
+    snapshot -> en yakın snapshot + sonrasındaki olayların tekrar oynatılması
+    tam      -> başlangıçtan o ana kadar tüm olayların tekrar oynatılması
+
+Sonuçların aynı olduğunu ve snapshot yolunun sabit sayıda sorguyla çalıştığını doğrular.
+
+Kullanım: python -m benchmarks.bench_compliance
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app import create_app, db
+from app.compliance import build_snapshots, counts_at, replay
+from app.models import TrainingStatusEvent
+from app.synthetic import seed_synthetic
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+HISTORY_DAYS = 4 * 365
+SAMPLES = 30
+MAX_QUERIES = 3
+
+def run():
+    print("📊 Uyum geçmişi benchmark'ı")
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        with timer() as seed_time:
+            seed_synthetic(departments=20, trainings=200, users=5000, trainings_per_department=40,
+                           history_days=HISTORY_DAYS)
+        events = db.session.scalar(select(func.count()).select_from(TrainingStatusEvent))
+        print(f"   Geçmiş: {events} olay, {HISTORY_DAYS} gün ({seed_time['ms'] / 1000:.1f} sn)")
+
+        with timer() as build_time:
+            snapshots = build_snapshots(interval_days=7)
+        print(f"   Snapshot: {len(snapshots)} adet, {build_time['ms'] / 1000:.1f} sn")
+
+        rng = random.Random(7)
+        now = datetime.utcnow()
+        moments = [now - timedelta(days=rng.uniform(0, HISTORY_DAYS)) for _ in range(SAMPLES)]
+        ok = True
+        snapshot_ms = full_ms = 0.0
+        worst_queries = 0
+        for moment in moments:
+            with count_queries(db.engine) as queries, timer() as elapsed:
+                counts, _ = counts_at(moment)
+            snapshot_ms += elapsed['ms']
+            worst_queries = max(worst_queries, queries.count)
+
+            with timer() as elapsed:
+                expected = {key: adet for key, adet in replay(None, moment).items() if adet}
+            full_ms += elapsed['ms']
+            ok = ok and counts == expected
+
+        print(f"   Snapshot + tekrar oynatma: {snapshot_ms / SAMPLES:.1f} ms/sorgu, en fazla {worst_queries} sorgu")
+        print(f"   Tüm geçmişin taranması:    {full_ms / SAMPLES:.1f} ms/sorgu "
+              f"({full_ms / snapshot_ms:.0f}x)")
+        db.session.remove()
+
+    if not ok:
+        print("❌ Snapshot sonuçları tüm geçmişin taranmasıyla uyuşmuyor")
+        return False
+    if worst_queries > MAX_QUERIES:
+        print(f"❌ Geçmiş sorgusu {MAX_QUERIES} sorgudan fazla çalıştırdı")
+        return False
+    print("✓ Geçmiş sorguları snapshot ile tutarlı ve sabit sayıda sorguyla yanıtlanıyor")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
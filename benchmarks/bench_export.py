@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Dışa aktarım benchmark'ı
+
+200 bin atamalık bir veritabanında CSV dışa aktarımının ilk bayta kadar geçen
+süresini, satır hızını ve en yüksek Python bellek kullanımını ölçer. Bellek
+kullanımı satır sayısından bağımsız kalmalıdır.
+
+Kullanım: python -m benchmarks.bench_export
+"""
+
+import sys
+import tracemalloc
+from app import create_app, db
+from app.models import Department, Training, User, UserTraining
+from app.reports.export import generate_csv
+from benchmarks.common import BenchmarkConfig, timer
+
+USER_COUNT = 2000
+TRAINING_COUNT = 100
+
+def seed():
+    department = Department(ad='Benchmark Bölümü')
+    db.session.add(department)
+    db.session.flush()
+    db.session.execute(db.insert(User), [
+        {'isim': f'Kullanıcı {i}', 'email': f'user{i}@example.com', 'sifre_hash': '-',
+         'bolum_id': department.id}
+        for i in range(USER_COUNT)
+    ])
+    db.session.execute(db.insert(Training), [
+        {'kod': f'E{i:03d}', 'baslik': f'Benchmark Eğitimi {i}'} for i in range(TRAINING_COUNT)
+    ])
+    user_ids = db.session.scalars(db.select(User.id)).all()
+    training_ids = db.session.scalars(db.select(Training.id)).all()
+    for training_id in training_ids:
+        db.session.execute(db.insert(UserTraining), [
+            {'kullanici_id': user_id, 'egitim_id': training_id, 'durum': 'tamamlandi'}
+            for user_id in user_ids
+        ])
+    db.session.commit()
+
+def export(limit_rows=None, trace_memory=False):
+    """CSV'yi tüket; ilk parça süresi, toplam süre, satır sayısı ve bellek tepe değeri"""
+    if trace_memory:
+        tracemalloc.start()
+    rows = 0
+    with timer() as total:
+        chunks = generate_csv({})
+        with timer() as first:
+            next(chunks)
+        for chunk in chunks:
+            rows += chunk.count('\n')
+            if limit_rows and rows >= limit_rows:
+                chunks.close()
+                break
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return first['ms'], total['ms'], rows, peak / 1024 / 1024
+
+def run():
+    print("📊 Dışa aktarım benchmark'ı")
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        seed()
+
+        first_ms, total_ms, rows, _ = export()
+        print(f"   {rows} satır: ilk bayt {first_ms:.1f} ms, toplam {total_ms:.0f} ms "
+              f"({rows / total_ms * 1000:.0f} satır/sn)")
+
+        # Bellek ölçümü (tracemalloc yavaşlattığı için ayrı geçişte)
+        peaks = []
+        for limit in (20000, None):
+            _, _, rows, peak_mb = export(limit, trace_memory=True)
+            peaks.append(peak_mb)
+            print(f"   {rows} satır: bellek tepe değeri {peak_mb:.1f} MB")
+
+        if peaks[1] > peaks[0] * 2:
+            print("❌ Bellek kullanımı satır sayısıyla artıyor")
+            return False
+
+    print("✓ Dışa aktarım sabit bellekle çalışıyor")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Koşullu GET (ETag/304) ve işlenmiş sayfa önbelleği benchmark'ı
+
+Rapor ve liste sayfaları için üç durumu karşılaştırır:
+
+    tam      -> önbellek kapalı, görünüm her istekte çalışır
+    304      -> istemci ETag'i gönderir, görünüm çalışmaz
+    önbellek -> ETag gönderilmez, gövde süreç içi önbellekten döner
+
+Kullanım: python -m benchmarks.bench_http_cache
+"""
+
+import sys
+from app import create_app, db
+from app.models import User
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+ITERATIONS = 30
+PAGES = [
+    '/reports/department-trainings?department_id=1',
+    '/reports/department-matrix',
+    '/admin/',
+    '/admin/trainings',
+    '/admin/users',
+    '/admin/user-assignments',
+]
+
+class UncachedConfig(BenchmarkConfig):
+    HTTP_CACHE = False
+
+def make_client(config_class):
+    app = create_app(config_class)
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(departments=8, trainings=120, users=2000)
+        admin = db.session.get(User, 1)
+        admin.rol = 'Admin'
+        db.session.commit()
+        email = admin.email
+    client = app.test_client()
+    client.post('/auth/login', data={'email': email, 'password': SYNTHETIC_PASSWORD}, follow_redirects=True)
+    return app, client
+
+def measure(app, client, url, etag=None):
+    """Ortalama süre (ms) ve son istekteki sorgu sayısı"""
+    headers = {'If-None-Match': etag} if etag else {}
+    client.get(url, headers=headers)
+    with app.app_context():
+        engine = db.engine
+    with count_queries(engine) as queries, timer() as elapsed:
+        for _ in range(ITERATIONS):
+            response = client.get(url, headers=headers)
+    return elapsed['ms'] / ITERATIONS, queries.count // ITERATIONS, response
+
+def run():
+    print("📊 HTTP önbellek benchmark'ı")
+    # Kimlik önbelleği süreç genelinde olduğundan uygulamalar sırayla ölçülür
+    uncached_app, uncached = make_client(UncachedConfig)
+    full = {url: measure(uncached_app, uncached, url)[:2] for url in PAGES}
+    cached_app, cached = make_client(BenchmarkConfig)
+
+    print(f"{'Sayfa':<48} {'Tam (ms)':>9} {'Sorgu':>6} {'304 (ms)':>9} {'Sorgu':>6} "
+          f"{'Önbellek (ms)':>14} {'Sorgu':>6}")
+    ok = True
+    for url in PAGES:
+        full_ms, full_queries = full[url]
+        etag = cached.get(url).headers['ETag']
+        not_modified_ms, not_modified_queries, response = measure(cached_app, cached, url, etag)
+        ok = ok and response.status_code == 304 and not_modified_queries == 1
+        hit_ms, hit_queries, _ = measure(cached_app, cached, url)
+        print(f"{url:<48} {full_ms:>9.2f} {full_queries:>6} {not_modified_ms:>9.2f} "
+              f"{not_modified_queries:>6} {hit_ms:>14.2f} {hit_queries:>6}")
+
+    if not ok:
+        print("❌ Değişmeyen sayfa 304 ile tek sorguda yanıtlanmadı")
+        return False
+    print("✓ Değişmeyen sayfalar tek sürüm sorgusuyla yanıtlanıyor")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Şifre özetleme benchmark'ı
+
+Her parametre seti için tek çekirdekte saniyedeki şifre doğrulama sayısını
+(çekirdek başına giriş kapasitesi) ve toplu özetlemede süreç havuzunun
+kazancını ölçer. PASSWORD_HASH_METHOD seçilirken giriş yoğunluğundaki
+CPU ihtiyacını tahmin etmek için kullanılır.
+
+Kullanım: python -m benchmarks.bench_passwords [--seconds 2] [--bulk 64]
+"""
+
+import argparse
+import os
+import sys
+import time
+from werkzeug.security import check_password_hash, generate_password_hash
+from app.passwords import hash_many
+from benchmarks.common import timer
+
+METHODS = [
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:260000',
+]
+PASSWORD = 'parola123'
+
+def verifications_per_second(method, seconds):
+    password_hash = generate_password_hash(PASSWORD, method=method)
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        check_password_hash(password_hash, PASSWORD)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Şifre özetleme benchmark\'ı')
+    parser.add_argument('--methods', nargs='*', default=METHODS)
+    parser.add_argument('--seconds', type=float, default=2, help='Yöntem başına ölçüm süresi')
+    parser.add_argument('--bulk', type=int, default=64, help='Toplu özetlenecek şifre sayısı')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(argv)
+    print(f"📊 Şifre doğrulama (tek çekirdek, {os.cpu_count()} CPU mevcut)")
+    for method in args.methods:
+        rate = verifications_per_second(method, args.seconds)
+        print(f"   {method:<24} {rate:>8.1f} giriş/sn/çekirdek  ({1000 / rate:>6.1f} ms/giriş)")
+
+    print(f"\n📊 Toplu özetleme ({args.bulk} şifre, {args.methods[0]})")
+    passwords = [f'sifre{i}' for i in range(args.bulk)]
+    with timer() as serial:
+        hash_many(passwords, method=args.methods[0], processes=1)
+    with timer() as pooled:
+        hashes = hash_many(passwords, method=args.methods[0])
+    print(f"   Seri:          {serial['ms']:>8.0f} ms")
+    print(f"   Süreç havuzu:  {pooled['ms']:>8.0f} ms  ({serial['ms'] / pooled['ms']:.1f}x)")
+
+    ok = all(check_password_hash(h, p) for h, p in zip(hashes[:4], passwords[:4]))
+    print("✓ Özetler doğrulandı" if ok else "❌ Özet doğrulaması başarısız")
+    return ok
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
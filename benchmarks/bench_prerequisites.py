@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Ön koşul grafı benchmark'ı
+
+10.000 eğitimlik rastgele bir ön koşul ormanı ve tek bir uzun zincir için
+grafın yüklenme süresini, başlayabilir mi / açık eğitimler sorgularını,
+döngü kontrolünü ve artımlı güncellemeyi ölçer.
+
+Kullanım: python -m benchmarks.bench_prerequisites
+"""
+
+import random
+import sys
+from app import create_app, db
+from app.models import Training
+from app.prerequisites import PrerequisiteGraph, PrerequisiteCycleError
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+TRAINING_COUNT = 10000
+LOOKUPS = 100000
+
+def random_forest(count, seed=42):
+    """Her eğitimin ön koşulu kendinden önceki bir eğitim (veya yok)"""
+    rng = random.Random(seed)
+    return {i: (rng.randrange(1, i) if i > 1 and rng.random() < 0.8 else None)
+            for i in range(1, count + 1)}
+
+def chain(count):
+    return {i: (i - 1 if i > 1 else None) for i in range(1, count + 1)}
+
+def measure(label, edges):
+    rng = random.Random(7)
+    with timer() as build:
+        graph = PrerequisiteGraph(edges)
+    completed = graph.mask(rng.sample(range(1, TRAINING_COUNT + 1), TRAINING_COUNT // 2))
+    targets = [rng.randint(1, TRAINING_COUNT) for _ in range(LOOKUPS)]
+
+    with timer() as lookups:
+        for training_id in targets:
+            graph.can_start(training_id, completed)
+    with timer() as unlocked:
+        unlocked_ids = graph.unlocked(completed)
+    with timer() as cycles:
+        for training_id in targets[:1000]:
+            graph.would_create_cycle(training_id, rng.randint(1, TRAINING_COUNT))
+    with timer() as update:
+        for training_id in targets[:100]:
+            try:
+                graph.set_prerequisite(training_id, rng.randint(1, TRAINING_COUNT))
+            except PrerequisiteCycleError:
+                pass
+
+    print(f"   {label}: kurulum {build['ms']:.0f} ms, "
+          f"{LOOKUPS} kontrol {lookups['ms']:.0f} ms "
+          f"({lookups['ms'] * 1000 / LOOKUPS:.2f} µs/kontrol), "
+          f"açık eğitimler {unlocked['ms']:.0f} ms ({len(unlocked_ids)} eğitim), "
+          f"1000 döngü kontrolü {cycles['ms']:.1f} ms, "
+          f"100 artımlı güncelleme {update['ms']:.0f} ms")
+    return graph
+
+def verify(graph):
+    """Kapanışı ön koşul zincirini yürüyerek doğrula"""
+    for training_id in random.Random(3).sample(sorted(graph.bit), 500):
+        expected, node = set(), graph.parent.get(training_id)
+        while node is not None:
+            expected.add(node)
+            node = graph.parent.get(node)
+        if set(graph.prerequisites(training_id)) != expected:
+            return False
+    return True
+
+def run():
+    print("📊 Ön koşul grafı benchmark'ı")
+    forest = measure('Rastgele orman', random_forest(TRAINING_COUNT))
+    measure('Tek zincir', chain(TRAINING_COUNT))
+    if not verify(forest):
+        print("❌ Geçişli kapanış ön koşul zinciriyle tutarsız")
+        return False
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Training), [
+            {'id': training_id, 'kod': f'P{training_id:05d}', 'baslik': f'Eğitim {training_id}',
+             'pre_requisite_id': parent_id}
+            for training_id, parent_id in random_forest(TRAINING_COUNT).items()
+        ])
+        db.session.commit()
+
+        with count_queries(db.engine) as queries, timer() as elapsed:
+            graph = PrerequisiteGraph.load()
+        print(f"   Veritabanından yükleme: {len(graph)} eğitim - "
+              f"{elapsed['ms']:.0f} ms, {queries.count} sorgu")
+
+    print("✓ Ön koşul grafı tutarlı")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
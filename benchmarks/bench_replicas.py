@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Okuma replikası benchmark'ı
+
+Sentetik veriyle doldurulmuş birincil SQLite dosyasını replika dosyalarına
+kopyalar (flask sync-replicas) ve rapor/liste sayfalarına eşzamanlı GET yükü
+uygular. 0..N replika için saniyedeki istek sayısını ve sorguların
+veritabanlarına dağılımını raporlar. Ayrıca doğrular:
+
+    - yönlendirilen GET istekleri birincil veritabanına sorgu göndermez
+    - yazan kullanıcı REPLICA_STICKY_SECONDS boyunca kendi yazdığını görür
+      (replika kopyası güncellenmediği halde); diğer kullanıcılar replikadan okur
+
+SQLite dosyaları aynı süreçte çalıştığından verim artışı çekirdek sayısıyla
+sınırlıdır. Ayrı sunuculardaki PostgreSQL replikalarıyla ölçmek için
+--database-url ve --replica-url (birden fazla) verilebilir; veritabanı
+flask seed-synthetic ile doldurulmuş ve replikalar güncel olmalıdır.
+
+Kullanım: python -m benchmarks.bench_replicas [--replicas 3 --threads 8 --duration 5]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy import event, update
+from app import create_app, db
+from app.compliance import build_snapshots
+from app.database import sync_sqlite_replicas
+from app.models import Department, User
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from benchmarks.common import BenchmarkConfig
+
+PAGES = [
+    '/reports/department-matrix',
+    '/reports/department-trainings?department_id=1',
+    '/reports/compliance',
+    '/admin/users',
+    '/admin/user-assignments',
+]
+ADMIN_EMAIL = 'kullanici1@example.com'
+STICKY_SECONDS = 1.0
+
+def make_config(database_url, replica_urls):
+    class ReplicaConfig(BenchmarkConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        REPLICA_DATABASE_URLS = list(replica_urls)
+        REPLICA_STICKY_SECONDS = STICKY_SECONDS
+        HTTP_CACHE = False
+        PERF_RING_BUFFER_SIZE = 0
+        QUERY_BUDGET_MODE = 'log'
+        SLOW_QUERY_MS = 10_000
+    return ReplicaConfig
+
+def prepare_sqlite(directory, replicas, users):
+    """Birincil dosyayı doldur ve replika dosyalarına kopyala"""
+    database_url = 'sqlite:///' + os.path.join(directory, 'primary.db')
+    replica_urls = ['sqlite:///' + os.path.join(directory, f'replica{number}.db')
+                    for number in range(1, replicas + 1)]
+    app = create_app(make_config(database_url, replica_urls))
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(departments=8, trainings=120, users=users)
+        promote_admin()
+        build_snapshots()
+        db.session.remove()
+    sync_sqlite_replicas(app)
+    return database_url, replica_urls
+
+def promote_admin():
+    db.session.execute(update(User).where(User.email == ADMIN_EMAIL).values(rol='Admin'))
+    db.session.commit()
+
+def login(app):
+    client = app.test_client()
+    client.post('/auth/login', data={'email': ADMIN_EMAIL, 'password': SYNTHETIC_PASSWORD},
+                follow_redirects=True)
+    return client
+
+class EngineCounter:
+    """Bind anahtarı başına çalışan sorgu sayısı"""
+
+    def __init__(self, app):
+        with app.app_context():
+            self.engines = dict(db.engines)
+        self.counts = {key: 0 for key in self.engines}
+        self._listeners = {}
+        for key, engine in self.engines.items():
+            def listener(*args, key=key):
+                self.counts[key] += 1
+            self._listeners[key] = listener
+            event.listen(engine, 'before_cursor_execute', listener)
+
+    def reset(self):
+        for key in self.counts:
+            self.counts[key] = 0
+
+    def close(self):
+        for key, engine in self.engines.items():
+            event.remove(engine, 'before_cursor_execute', self._listeners[key])
+
+def measure_throughput(app, threads, duration):
+    clients = [login(app) for _ in range(threads)]
+    done = [0] * threads
+    errors = []
+    deadline = time.perf_counter() + duration
+
+    def work(index):
+        client = clients[index]
+        while time.perf_counter() < deadline:
+            response = client.get(PAGES[done[index] % len(PAGES)])
+            if response.status_code != 200:
+                errors.append(response.status_code)
+            done[index] += 1
+
+    workers = [threading.Thread(target=work, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(done) / (time.perf_counter() - started), errors
+
+def check_routing(app, counter):
+    """Yönlendirme ve kendi yazdığını okuma kontrolleri; hata mesajları listesi"""
+    problems = []
+    writer, reader = login(app), login(app)
+    with app.app_context():
+        department = db.session.get(Department, 1)
+        old_name, department_id = department.ad, department.id
+        db.session.remove()
+
+    counter.reset()
+    reader.get(PAGES[0])
+    if counter.counts[None]:
+        problems.append(f'Rapor GET isteği birincil veritabanına {counter.counts[None]} sorgu gönderdi')
+
+    new_name = f'{old_name} (güncellendi)'
+    response = writer.post(f'/admin/departments/{department_id}/edit',
+                           data={'ad': new_name, 'aciklama': ''}, follow_redirects=True)
+    if new_name not in response.get_data(as_text=True):
+        problems.append('Yazan kullanıcı yönlendirme sonrası kendi yazdığını görmedi')
+    if new_name not in writer.get('/admin/departments').get_data(as_text=True):
+        problems.append(f'Yazan kullanıcı {STICKY_SECONDS} sn içinde kendi yazdığını görmedi')
+    if new_name in reader.get('/admin/departments').get_data(as_text=True):
+        problems.append('Diğer kullanıcı birincil veritabanından okudu (replika kopyası güncellenmedi)')
+
+    time.sleep(STICKY_SECONDS + 0.1)
+    counter.reset()
+    writer.get('/admin/departments')
+    if counter.counts[None]:
+        problems.append('Yapışkanlık süresi dolduktan sonra okumalar birincile gitmeye devam etti')
+
+    with app.app_context():
+        db.session.execute(update(Department).where(Department.id == department_id).values(ad=old_name))
+        db.session.commit()
+        db.session.remove()
+    return problems
+
+def run(replicas=3, threads=8, duration=5.0, users=2000, database_url=None, replica_urls=None):
+    print("📊 Okuma replikası benchmark'ı")
+    directory = None
+    if database_url is None:
+        directory = tempfile.mkdtemp(prefix='bench_replicas_')
+        database_url, replica_urls = prepare_sqlite(directory, replicas, users)
+    else:
+        app = create_app(make_config(database_url, []))
+        with app.app_context():
+            promote_admin()
+            db.session.remove()
+        # Replikaların yetki değişikliğini alması için kısa bekleme
+        time.sleep(1)
+
+    ok = True
+    try:
+        print(f"{'Replika':>8} {'İstek/sn':>10} {'Birincil':>10} " +
+              ' '.join(f'{f"Replika {n}":>10}' for n in range(1, len(replica_urls) + 1)))
+        baseline = None
+        for count in range(len(replica_urls) + 1):
+            # Kimlik önbelleği süreç genelinde olduğundan uygulamalar sırayla ölçülür
+            app = create_app(make_config(database_url, replica_urls[:count]))
+            counter = EngineCounter(app)
+            counter.reset()
+            rate, errors = measure_throughput(app, threads, duration)
+            total = sum(counter.counts.values()) or 1
+            shares = [counter.counts[None]] + [counter.counts[f'replica_{n}'] for n in range(1, count + 1)]
+            baseline = baseline or rate
+            print(f"{count:>8} {rate:>10.1f} " + ' '.join(f'{share / total:>10.0%}' for share in shares) +
+                  f"   ({rate / baseline:.2f}x)")
+            if errors:
+                ok = False
+                print(f"   ❌ {len(errors)} başarısız istek: {sorted(set(errors))}")
+
+            if count == len(replica_urls) and count:
+                for problem in check_routing(app, counter):
+                    ok = False
+                    print(f"   ❌ {problem}")
+            counter.close()
+            with app.app_context():
+                for engine in db.engines.values():
+                    engine.dispose()
+    finally:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if ok:
+        print("✓ Okumalar replikalara dağıtıldı, yazan kullanıcı kendi yazdığını birincilden okudu")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--replicas', type=int, default=3, help='SQLite replika dosyası sayısı')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help='Her ölçümün süresi (saniye)')
+    parser.add_argument('--users', type=int, default=2000, help='Sentetik kullanıcı sayısı (SQLite)')
+    parser.add_argument('--database-url', help='Mevcut birincil veritabanı (ör. PostgreSQL)')
+    parser.add_argument('--replica-url', action='append', default=[], help='Replika adresi (tekrarlanabilir)')
+    args = parser.parse_args()
+    if args.database_url and not args.replica_url:
+        parser.error('--database-url ile en az bir --replica-url verilmelidir')
+    return run(replicas=args.replicas, threads=args.threads, duration=args.duration, users=args.users,
+               database_url=args.database_url, replica_urls=args.replica_url or None)
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
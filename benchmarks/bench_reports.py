@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Bölüm eğitim raporu benchmark'ı
+
+Eğitim-bölüm ilişkisi sayısı arttıkça rapor sorgusunun sorgu sayısının
+sabit kaldığını doğrular.
+
+Kullanım: python -m benchmarks.bench_reports
+"""
+
+import random
+import sys
+from app import create_app, db
+from app.models import Department, Level, Training, TrainingSection, User, UserTraining
+from app.rollups import rebuild_rollups
+from app.reports.queries import department_training_stats, department_training_matrix
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+SECTION_COUNTS = [10, 50, 200, 800]
+USER_COUNT = 50
+
+def seed(section_count):
+    """Tek bölümlü, section_count eğitimli örnek veri oluştur"""
+    levels = [Level(ad='Temel'), Level(ad='Orta'), Level(ad='İleri')]
+    department = Department(ad='Benchmark Bölümü')
+    db.session.add_all(levels + [department])
+    db.session.flush()
+
+    db.session.execute(db.insert(Training), [
+        {'kod': f'B{i:05d}', 'baslik': f'Benchmark Eğitimi {i}'} for i in range(section_count)
+    ])
+    db.session.execute(db.insert(User), [
+        {'isim': f'Kullanıcı {i}', 'email': f'user{i}@example.com', 'sifre_hash': '-', 'bolum_id': department.id}
+        for i in range(USER_COUNT)
+    ])
+    training_ids = db.session.scalars(db.select(Training.id)).all()
+    user_ids = db.session.scalars(db.select(User.id)).all()
+
+    db.session.execute(db.insert(TrainingSection), [
+        {'egitim_id': tid, 'bolum_id': department.id, 'seviye_id': levels[i % 3].id}
+        for i, tid in enumerate(training_ids)
+    ])
+    rng = random.Random(section_count)
+    db.session.execute(db.insert(UserTraining), [
+        {'kullanici_id': uid, 'egitim_id': tid,
+         'durum': rng.choice(['baslamadi', 'devam', 'tamamlandi'])}
+        for tid in training_ids
+        for uid in rng.sample(user_ids, 10)
+    ])
+    rebuild_rollups()
+    db.session.commit()
+    return department.id
+
+def run():
+    print("📊 Bölüm eğitim raporu benchmark'ı")
+    print(f"{'Eğitim':>8} {'Sorgu (bölüm)':>14} {'Süre (ms)':>10} {'Sorgu (matris)':>15} {'Süre (ms)':>10}")
+
+    query_counts = set()
+    for section_count in SECTION_COUNTS:
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            db.create_all()
+            department_id = seed(section_count)
+            db.session.expunge_all()
+
+            with count_queries(db.engine) as single, timer() as single_time:
+                rows = department_training_stats(department_id)
+            assert len(rows) == section_count
+
+            db.session.expunge_all()
+            with count_queries(db.engine) as matrix, timer() as matrix_time:
+                department_training_matrix()
+
+            query_counts.update([single.count, matrix.count])
+            print(f"{section_count:>8} {single.count:>14} {single_time['ms']:>10.1f} "
+                  f"{matrix.count:>15} {matrix_time['ms']:>10.1f}")
+            db.session.remove()
+
+    if len(query_counts) != 1:
+        print(f"❌ Sorgu sayısı veri boyutuyla değişiyor: {sorted(query_counts)}")
+        return False
+
+    print(f"✓ Sorgu sayısı sabit: {query_counts.pop()}")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tam metin arama benchmark'ı
+
+100 bin sentetik kullanıcı üretir (indeks tetikleyicilerle dolar) ve tipik
+typeahead sorgularını (isim/e-posta önekleri, çok kelimeli ve Türkçe harfli
+sorgular, tüm tabloya uyan genel önekler) iki yolla çalıştırır:
+
+    indeks -> app.search.index.search (FTS5, sınırlı alaka sıralaması)
+    LIKE   -> isim/e-posta üzerinde '%...%' taraması (indekssiz eski yol)
+
+Her sorgunun en kötü süresinin SEARCH_TARGET_MS altında kaldığını ve
+Türkçe harf katlamanın (ışık/IŞIK/isik) aynı sonuçları verdiğini doğrular.
+Ayrıca /api/users?q= uç noktasının uçtan uca süresini raporlar.
+
+Kullanım: python -m benchmarks.bench_search [--users 100000]
+"""
+
+import argparse
+import statistics
+import sys
+from sqlalchemy import func, or_, select, update
+from app import create_app, db
+from app.models import User
+from app.search.index import search
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from benchmarks.common import BenchmarkConfig, timer
+
+SEARCH_TARGET_MS = 20
+REPEAT = 5
+LIMIT = 10
+QUERIES = [
+    'ay', 'ayş', 'ayşe', 'mehmet', 'meh yıl', 'ışıl', 'işil', 'çağlar öz', 'oğuz kar',
+    'yılmaz', 'kullanici4', 'kullanici12345', 'kullanici99999@example', 'kullanici777@example.com',
+    'ku', 'zz', 'yok böyle biri',
+]
+FOLDED_VARIANTS = ['ışık', 'IŞIK', 'isik', 'Işık']
+
+class SearchConfig(BenchmarkConfig):
+    PERF_RING_BUFFER_SIZE = 0
+    QUERY_BUDGET_MODE = 'log'
+
+def like_search(query, limit):
+    """İndekssiz karşılaştırma: her kelime isim veya e-postada geçmeli"""
+    statement = select(User.id, User.isim, User.email)
+    for word in query.split():
+        pattern = f'%{word}%'
+        statement = statement.where(or_(func.lower(User.isim).like(pattern), User.email.like(pattern)))
+    return db.session.execute(statement.limit(limit)).all()
+
+def best_of(function):
+    durations = []
+    for _ in range(REPEAT):
+        with timer() as elapsed:
+            result = function()
+        durations.append(elapsed['ms'])
+    return min(durations), max(durations), result
+
+def run(users=100000):
+    print("📊 Tam metin arama benchmark'ı")
+    app = create_app(SearchConfig)
+    ok = True
+    with app.app_context():
+        db.create_all()
+        with timer() as seed_time:
+            seed_synthetic(departments=20, trainings=100, users=users, trainings_per_department=1,
+                           history_days=30)
+        db.session.execute(update(User).where(User.email == 'kullanici1@example.com').values(rol='Admin'))
+        db.session.commit()
+        print(f"   Veri: {users} kullanıcı, indeks tetikleyicilerle dolduruldu ({seed_time['ms'] / 1000:.1f} sn)")
+
+        print(f"   {'Sorgu':<26} {'Sonuç':>5} {'İndeks ms':>10} {'en kötü':>8} {'LIKE ms':>9}")
+        worst = []
+        for query in QUERIES:
+            fastest, slowest, rows = best_of(lambda: search('users', query, limit=LIMIT,
+                                                            columns=(User.isim, User.email)))
+            like_ms, _, _ = best_of(lambda: like_search(query, LIMIT))
+            worst.append(slowest)
+            flag = '' if slowest < SEARCH_TARGET_MS else '  ❌'
+            print(f"   {query:<26} {len(rows):>5} {fastest:>10.2f} {slowest:>8.2f} {like_ms:>9.2f}{flag}")
+        print(f"   Medyan {statistics.median(worst):.2f} ms, en kötü {max(worst):.2f} ms "
+              f"(hedef < {SEARCH_TARGET_MS} ms)")
+        if max(worst) >= SEARCH_TARGET_MS:
+            ok = False
+            print(f"❌ Bazı sorgular {SEARCH_TARGET_MS} ms hedefini aştı")
+
+        variants = [[row.id for row in search('users', query, columns=(User.isim,))] for query in FOLDED_VARIANTS]
+        if not variants[0] or any(ids != variants[0] for ids in variants):
+            ok = False
+            print(f"❌ Türkçe harf katlaması tutarsız: {dict(zip(FOLDED_VARIANTS, variants))}")
+        db.session.remove()
+
+    client = app.test_client()
+    client.post('/auth/login', data={'email': 'kullanici1@example.com', 'password': SYNTHETIC_PASSWORD},
+                follow_redirects=True)
+    durations = []
+    for query in QUERIES:
+        for _ in range(REPEAT):
+            with timer() as elapsed:
+                response = client.get('/api/users', query_string={'q': query, 'limit': LIMIT})
+            durations.append(elapsed['ms'])
+            if response.status_code != 200:
+                ok = False
+                print(f"❌ /api/users?q={query}: HTTP {response.status_code}")
+                break
+    durations.sort()
+    print(f"   /api/users uçtan uca: medyan {statistics.median(durations):.2f} ms, "
+          f"p95 {durations[int(len(durations) * 0.95) - 1]:.2f} ms")
+
+    if ok:
+        print(f"✓ Typeahead sorguları {users} kullanıcıda {SEARCH_TARGET_MS} ms altında ve harf katlaması tutarlı")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    args = parser.parse_args()
+    return run(users=args.users)
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
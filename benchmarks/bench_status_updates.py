@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Toplu durum güncellemesi benchmark'ı
+
+Tamamlanmamış atamalardan ITEMS öğelik bir LMS gönderimi (devam/tamamlandi,
+e-posta ile) üretir ve iki yolla uygular:
+
+    tek tek -> user.complete_training gibi: atamayı yükle, durumu değiştir, commit
+    toplu   -> app.status_updates.apply_status_updates (parça başına tek UPDATE)
+
+Toplu yolun en az SPEEDUP_TARGET kat hızlı olduğunu, parça başına sorgu
+sayısının öğe sayısından bağımsız kaldığını, özet tablonun tutarlı olduğunu ve
+aynı gönderim tekrar uygulandığında hiçbir satırın değişmediğini doğrular.
+
+Kullanım: python -m benchmarks.bench_status_updates [--items 10000]
+"""
+
+import argparse
+import random
+import sys
+from datetime import datetime
+from sqlalchemy import select
+from app import create_app, db
+from app.models import Training, User, UserTraining
+from app.rollups import check_rollups
+from app.status_updates import apply_status_updates
+from app.synthetic import seed_synthetic
+from benchmarks.common import BenchmarkConfig, count_queries, timer
+
+ONE_BY_ONE_ITEMS = 500
+SPEEDUP_TARGET = 10
+
+class StatusConfig(BenchmarkConfig):
+    PERF_RING_BUFFER_SIZE = 0
+    STATUS_UPDATE_BATCH_SIZE = 1000
+
+def pending_assignments(limit):
+    """Tamamlanmamış atamalar: (atama_id, email, egitim_kodu, durum)"""
+    return db.session.execute(
+        select(UserTraining.id, User.email, Training.kod, UserTraining.durum)
+        .join(User, User.id == UserTraining.kullanici_id)
+        .join(Training, Training.id == UserTraining.egitim_id)
+        .where(UserTraining.durum != 'tamamlandi')
+        .order_by(UserTraining.id)
+        .limit(limit)
+    ).all()
+
+def complete_one_by_one(rows):
+    """Her öğe için ayrı yükleme ve commit (ORM session olaylarıyla)"""
+    for row in rows:
+        user_training = db.session.get(UserTraining, row.id)
+        if user_training.durum == 'baslamadi':
+            user_training.baslama_tarihi = datetime.utcnow()
+        user_training.durum = 'tamamlandi'
+        user_training.tamamlanma_tarihi = datetime.utcnow()
+        db.session.commit()
+
+def run(items=10000):
+    print("📊 Toplu durum güncellemesi benchmark'ı")
+    app = create_app(StatusConfig)
+    ok = True
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(departments=20, trainings=200, users=6000, trainings_per_department=20,
+                       history_days=30)
+        rows = pending_assignments(items + ONE_BY_ONE_ITEMS)
+        if len(rows) < items + ONE_BY_ONE_ITEMS:
+            print(f"❌ Yeterli tamamlanmamış atama yok ({len(rows)})")
+            return False
+        one_by_one, bulk_rows = rows[:ONE_BY_ONE_ITEMS], rows[ONE_BY_ONE_ITEMS:]
+
+        with timer() as single:
+            complete_one_by_one(one_by_one)
+        single_rate = ONE_BY_ONE_ITEMS / (single['ms'] / 1000)
+
+        rng = random.Random(7)
+        payload = [{'email': row.email, 'egitim_kodu': row.kod,
+                    'durum': 'devam' if row.durum == 'baslamadi' and rng.random() < 0.3 else 'tamamlandi'}
+                   for row in bulk_rows]
+        batches = -(-items // app.config['STATUS_UPDATE_BATCH_SIZE'])
+        with count_queries(db.engine) as queries, timer() as bulk:
+            report = apply_status_updates(payload)
+        bulk_rate = items / (bulk['ms'] / 1000)
+        summary = report.summary()
+
+        with count_queries(db.engine) as replay_queries, timer() as replay:
+            replayed = apply_status_updates(payload).summary()
+        mismatches = check_rollups()
+
+    speedup = bulk_rate / single_rate
+    print(f"   Tek tek: {ONE_BY_ONE_ITEMS} öğe, {single['ms'] / 1000:.2f} sn ({single_rate:,.0f} öğe/sn)")
+    print(f"   Toplu:   {items} öğe, {bulk['ms'] / 1000:.2f} sn ({bulk_rate:,.0f} öğe/sn), "
+          f"{batches} parça, parça başına {queries.count / batches:.1f} sorgu")
+    print(f"   Sonuç:   {summary}")
+    print(f"   Tekrar:  {replay['ms']:.0f} ms, parça başına {replay_queries.count / batches:.1f} sorgu, {replayed}")
+    print(f"   Hızlanma: {speedup:.1f}x (hedef >= {SPEEDUP_TARGET}x)")
+
+    if summary['applied'] != items:
+        ok = False
+        print(f"❌ Tüm öğeler uygulanmadı: {summary}")
+    if replayed['applied'] or replayed['unchanged'] != items:
+        ok = False
+        print(f"❌ Tekrar gönderim satır değiştirdi: {replayed}")
+    if mismatches:
+        ok = False
+        print(f"❌ Özet tablo tutarsız: {mismatches[:5]}")
+    if speedup < SPEEDUP_TARGET:
+        ok = False
+        print(f"❌ Toplu yol hedeflenen hızlanmaya ulaşmadı")
+    if ok:
+        print(f"✓ {items} durum güncellemesi {bulk['ms'] / 1000:.2f} sn'de uygulandı, tekrar gönderim etkisiz")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=10000)
+    args = parser.parse_args()
+    return run(items=args.items)
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
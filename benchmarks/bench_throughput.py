@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Sunucu verimi benchmark'ı
+
+Sentetik veriyle doldurulmuş geçici bir SQLite dosyası üzerinde uygulamayı
+ayrı bir süreçte çalıştırır ve eşzamanlı sanal kullanıcılarla yük üretir.
+Her kullanıcı kendi oturumuyla panel ve eğitim listesini okur, belirli
+aralıklarla profilini günceller (yazma). Modlar:
+
+    dev          flask run (Werkzeug geliştirme sunucusu, thread'li)
+    dev-default  flask run, SQLite PRAGMA ayarları kapalı (rollback journal,
+                 busy_timeout=0); eşzamanlı yazmalarda "database is locked"
+    prod         flask serve (gunicorn veya waitress; kurulu değilse atlanır)
+
+Kullanım: python -m benchmarks.bench_throughput [--concurrency 16 --duration 10]
+"""
+
+import argparse
+import http.cookiejar
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from app import create_app, db
+from app.models import User
+from app.serving import available_servers
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from benchmarks.harness import percentile
+from config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSRF_PATTERN = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+MODES = {
+    'dev': (['flask', '--app', 'wsgi', 'run', '--no-reload', '--no-debugger'], {}),
+    'dev-default': (['flask', '--app', 'wsgi', 'run', '--no-reload', '--no-debugger'],
+                    {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_BUSY_TIMEOUT': '0',
+                     'SQLITE_SYNCHRONOUS': 'FULL'}),
+    'prod': (['flask', '--app', 'run', 'serve'], {}),
+}
+
+def seed_database(path, users):
+    class FileConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + path
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(departments=8, trainings=120, users=users)
+        rows = db.session.execute(
+            db.select(User.email, User.bolum_id).where(User.is_active == True).order_by(User.id)).all()
+        db.session.remove()
+        db.engine.dispose()
+    return rows
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(mode, database_path, port):
+    command, overrides = MODES[mode]
+    env = dict(os.environ, DATABASE_URL='sqlite:///' + database_path, SECRET_KEY='benchmark',
+               PERF_RING_BUFFER_SIZE='0', **overrides)
+    process = subprocess.Popen([sys.executable, '-m', *command, '--port', str(port)], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{mode} sunucusu başlatılamadı')
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/auth/login', timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} sunucusu zamanında yanıt vermedi')
+
+class VirtualUser:
+    """Kendi çerez kavanozu olan oturum açmış istemci"""
+
+    def __init__(self, base_url, email, bolum_id):
+        self.base_url = base_url
+        self.email = email
+        self.bolum_id = bolum_id
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self.writes = 0
+
+    def request(self, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        try:
+            with self.opener.open(self.base_url + path, body, timeout=30) as response:
+                return response.status, response.read().decode('utf-8')
+        except urllib.error.HTTPError as exc:
+            return exc.code, ''
+
+    def csrf_token(self, path):
+        _, page = self.request(path)
+        match = CSRF_PATTERN.search(page)
+        return match.group(1) if match else ''
+
+    def login(self):
+        token = self.csrf_token('/auth/login')
+        self.request('/auth/login', {'csrf_token': token, 'email': self.email, 'password': SYNTHETIC_PASSWORD})
+        self.profile_token = self.csrf_token('/user/profile')
+
+    def update_profile(self):
+        self.writes += 1
+        return self.request('/user/profile', {
+            'csrf_token': self.profile_token, 'isim': f'Yük Testi {self.writes}',
+            'email': self.email, 'bolum_id': self.bolum_id,
+        })
+
+def run_load(base_url, accounts, concurrency, duration, write_every):
+    users = [VirtualUser(base_url, email, bolum_id) for email, bolum_id in accounts[:concurrency]]
+    for user in users:
+        user.login()
+
+    latencies, errors, lock = [], [], threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(user):
+        actions = [lambda: user.request('/user/dashboard'), lambda: user.request('/user/trainings')]
+        iteration = 0
+        while time.perf_counter() < stop_at:
+            iteration += 1
+            action = user.update_profile if write_every and iteration % write_every == 0 \
+                else actions[iteration % len(actions)]
+            started = time.perf_counter()
+            status, _ = action()
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if status >= 500:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'errors': len(errors),
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Sunucu verimi benchmark\'ı')
+    parser.add_argument('--modes', nargs='*', default=list(MODES), choices=list(MODES))
+    parser.add_argument('--users', type=int, default=500, help='Sentetik kullanıcı sayısı')
+    parser.add_argument('--concurrency', type=int, default=16, help='Eşzamanlı sanal kullanıcı')
+    parser.add_argument('--duration', type=float, default=10, help='Mod başına ölçüm süresi (saniye)')
+    parser.add_argument('--write-every', type=int, default=5,
+                        help='Her N istekte bir profil güncellemesi (0: yalnızca okuma)')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(argv)
+    print(f"📊 Sunucu verimi: {args.concurrency} eşzamanlı kullanıcı, mod başına {args.duration:.0f} sn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        ok = True
+        for mode in args.modes:
+            if mode == 'prod' and not available_servers():
+                print(f"   {mode:<12} atlandı (gunicorn veya waitress kurulu değil)")
+                continue
+
+            # Her mod aynı başlangıç verisiyle ölçülür
+            database_path = os.path.join(directory, f'{mode}.db')
+            accounts = seed_database(database_path, args.users)
+            port = free_port()
+            process = start_server(mode, database_path, port)
+            try:
+                result = run_load(f'http://127.0.0.1:{port}', accounts, args.concurrency,
+                                  args.duration, args.write_every)
+            finally:
+                process.terminate()
+                process.wait()
+
+            print(f"   {mode:<12} {result['rps']:>8.1f} istek/sn  p50 {result['p50_ms']:>7.1f} ms  "
+                  f"p95 {result['p95_ms']:>7.1f} ms  {result['requests']:>6} istek  "
+                  f"{result['errors']} hata")
+            if result['errors'] and mode != 'dev-default':
+                ok = False
+    return ok
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
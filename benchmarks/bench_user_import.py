@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Toplu kullanıcı aktarımı benchmark'ı
+
+Sentetik bölüm ve eğitimler üzerine 50 bin satırlık bir CSV aktarır; satırların
+bir kısmı bilinçli olarak hatalıdır (geçersiz e-posta, tekrar eden e-posta,
+bilinmeyen bölüm). Bölüm eğitimleri de atanır. Aktarım bir dakikanın altında
+kalmalıdır.
+
+Şifre sütunu dolu satırlar tek tek özetlendiğinden süre bu satırların sayısıyla
+ve CPU sayısıyla orantılıdır (--with-passwords).
+
+Kullanım: python -m benchmarks.bench_user_import [--rows 50000] [--with-passwords 0]
+"""
+
+import argparse
+import io
+import sys
+from app import create_app, db
+from app.models import User, UserTraining
+from app.refdata import department_choices
+from app.synthetic import seed_synthetic
+from app.user_import import import_users
+from benchmarks.common import BenchmarkConfig, timer
+
+TIME_LIMIT_MS = 60000
+
+def build_csv(rows, with_passwords, departments):
+    output = io.StringIO()
+    output.write('isim;email;bolum;rol;sifre\n')
+    for i in range(rows):
+        email = f'aktarim{i}@example.com'
+        bolum = departments[i % len(departments)]
+        if i % 100 == 1:
+            email = f'gecersiz{i}'
+        elif i % 200 == 3:
+            email = f'aktarim{i - 1}@example.com'
+        elif i % 500 == 7:
+            bolum = 'Olmayan Bölüm'
+        password = f'parola{i:06d}' if i < with_passwords else ''
+        output.write(f'Aktarım Kullanıcısı {i};{email};{bolum};Personel;{password}\n')
+    output.seek(0)
+    return output
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Toplu kullanıcı aktarımı benchmark\'ı')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--with-passwords', type=int, default=0, help='Şifresi verilen satır sayısı')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(argv)
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(departments=8, trainings=120, users=0)
+        departments = [ad for _, ad in department_choices()]
+        stream = build_csv(args.rows, args.with_passwords, departments)
+
+        print(f"📊 Toplu kullanıcı aktarımı ({args.rows} satır, {args.with_passwords} şifreli)")
+        with timer() as elapsed:
+            report = import_users(stream, assign_trainings=True)
+
+        users = db.session.scalar(db.select(db.func.count(User.id)))
+        assignments = db.session.scalar(db.select(db.func.count(UserTraining.id)))
+        print(f"   Süre:           {elapsed['ms']:>10.0f} ms ({args.rows / elapsed['ms'] * 1000:.0f} satır/sn)")
+        print(f"   Eklenen:        {report.created:>10} kullanıcı (tabloda {users})")
+        print(f"   Atama:          {report.assigned:>10} (tabloda {assignments})")
+        print(f"   Hatalı satır:   {report.failed:>10}")
+
+        ok = elapsed['ms'] < TIME_LIMIT_MS and report.created == users and report.assigned == assignments
+        print("✓ Aktarım süre sınırında" if ok else "❌ Aktarım süre sınırını aştı veya sayılar tutarsız")
+        return ok
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,44 @@
+"""
+Benchmark betikleri için ortak yardımcılar
+"""
+
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from config import Config
+
+class BenchmarkConfig(Config):
+    """Bellek içi SQLite veritabanı kullanan ölçüm konfigürasyonu"""
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+
+class QueryCounter:
+    """Bir engine üzerinde çalışan SQL ifadelerini sayar"""
+    
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries(engine):
+    """Blok içinde çalışan sorgu sayısını ölç"""
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+@contextmanager
+def timer():
+    """Blok süresini milisaniye olarak ölç"""
+    result = {'ms': 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['ms'] = (time.perf_counter() - start) * 1000
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Uçtan uca benchmark düzeneği
+
+Sentetik bir organizasyon (app.synthetic) oluşturur ve ana endpoint'leri Flask
+test istemcisiyle çağırır. Her endpoint için p50/p95 gecikme, istek başına
+sorgu sayısı ve en yüksek Python bellek kullanımı JSON olarak kaydedilir.
+Aynı parametrelerle üretilen sonuçlar commit'ler arasında karşılaştırılabilir:
+
+    python -m benchmarks.harness --output once.json
+    python -m benchmarks.harness --compare once.json
+
+--compare verildiğinde p95 gecikmesi eşik oranından fazla artan veya sorgu
+sayısı artan endpoint'ler listelenir ve betik hata koduyla çıkar.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import sqlalchemy
+from app import create_app, db
+from app.models import Department, User
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from benchmarks.common import BenchmarkConfig, count_queries
+
+ADMIN_EMAIL = 'admin@example.com'
+ADMIN_PASSWORD = 'admin123'
+
+def percentile(values, pct):
+    """En yakın sıra yöntemiyle yüzdelik"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def login(client, email, password):
+    return client.post('/auth/login', data={'email': email, 'password': password})
+
+def scenarios(department_id, user_email):
+    """(ad, oturum, istek) üçlüleri; oturum None ise her istek yeni istemciyle yapılır"""
+    return [
+        ('admin.index', 'admin', lambda c: c.get('/admin/')),
+        ('admin.user_assignments', 'admin', lambda c: c.get('/admin/user-assignments')),
+        ('reports.department_trainings', 'admin',
+         lambda c: c.get(f'/reports/department-trainings?department_id={department_id}')),
+        ('user.dashboard', 'user', lambda c: c.get('/user/dashboard')),
+        ('user.career_path', 'user', lambda c: c.get('/user/career-path')),
+        ('auth.login', None, lambda c: login(c, user_email, SYNTHETIC_PASSWORD)),
+    ]
+
+def measure(engine, request, client_factory, iterations, warmup):
+    for _ in range(warmup):
+        request(client_factory())
+
+    latencies, query_counts, statuses = [], [], set()
+    for _ in range(iterations):
+        client = client_factory()
+        with count_queries(engine) as queries:
+            start = time.perf_counter()
+            response = request(client)
+            latencies.append((time.perf_counter() - start) * 1000)
+        query_counts.append(queries.count)
+        statuses.add(response.status_code)
+
+    # Bellek ölçümü tracemalloc yavaşlattığı için ayrı bir istekle
+    client = client_factory()
+    tracemalloc.start()
+    request(client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'queries': max(query_counts),
+        'peak_kb': round(peak / 1024, 1),
+        'status': sorted(statuses),
+    }
+
+def run_benchmarks(args):
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        counts = seed_synthetic(departments=args.departments, trainings=args.trainings,
+                                users=args.users, chain_length=args.chain_length, seed=args.seed)
+        seed_ms = (time.perf_counter() - started) * 1000
+
+        admin = User(isim='Benchmark Yöneticisi', email=ADMIN_EMAIL, rol='Admin')
+        admin.set_password(ADMIN_PASSWORD)
+        db.session.add(admin)
+        db.session.commit()
+
+        department_id = db.session.scalar(db.select(Department.id).order_by(Department.id))
+        user_email = db.session.scalar(
+            db.select(User.email).where(User.bolum_id == department_id, User.is_active == True)
+            .order_by(User.id))
+        engine = db.engine
+        db.session.remove()
+
+    # İstekler dış uygulama bağlamı olmadan yapılır; aksi halde g (ve Flask-Login'in
+    # kullanıcı önbelleği) istekler arasında paylaşılır
+    sessions = {}
+    for role, (email, password) in {'admin': (ADMIN_EMAIL, ADMIN_PASSWORD),
+                                    'user': (user_email, SYNTHETIC_PASSWORD)}.items():
+        client = app.test_client()
+        login(client, email, password)
+        sessions[role] = client
+
+    results = {}
+    for name, session, request in scenarios(department_id, user_email):
+        if args.only and name not in args.only:
+            continue
+        client_factory = (lambda s=session: sessions[s]) if session else app.test_client
+        results[name] = measure(engine, request, client_factory, args.iterations, args.warmup)
+        row = results[name]
+        print(f"   {name:<30} p50 {row['p50_ms']:>8.2f} ms  p95 {row['p95_ms']:>8.2f} ms  "
+              f"{row['queries']:>3} sorgu  {row['peak_kb']:>8.1f} KB  {row['status']}")
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'time': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'params': {
+                'departments': args.departments, 'trainings': args.trainings, 'users': args.users,
+                'chain_length': args.chain_length, 'seed': args.seed,
+                'iterations': args.iterations, 'warmup': args.warmup,
+            },
+            'dataset': counts,
+            'seed_ms': round(seed_ms, 1),
+        },
+        'endpoints': results,
+        'process': {'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)},
+    }
+
+def compare(current, baseline, threshold):
+    """Gerilemeleri listele: [(endpoint, açıklama), ...]"""
+    if baseline['meta'].get('params') != current['meta'].get('params'):
+        print("⚠️  Parametreler farklı; sonuçlar doğrudan karşılaştırılamayabilir.")
+
+    regressions = []
+    print(f"\n   {'Endpoint':<30} {'p95 önce':>10} {'p95 şimdi':>10} {'Sorgu':>9}")
+    for name, row in current['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        print(f"   {name:<30} {before['p95_ms']:>10.2f} {row['p95_ms']:>10.2f} "
+              f"{before['queries']:>4} → {row['queries']:<3}")
+        if row['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append((name, f"p95 {before['p95_ms']} → {row['p95_ms']} ms"))
+        if row['queries'] > before['queries']:
+            regressions.append((name, f"sorgu {before['queries']} → {row['queries']}"))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Uçtan uca benchmark düzeneği')
+    parser.add_argument('--departments', type=int, default=8)
+    parser.add_argument('--trainings', type=int, default=120)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--chain-length', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=30, help='Endpoint başına ölçülen istek')
+    parser.add_argument('--warmup', type=int, default=3, help='Ölçüm öncesi ısınma isteği')
+    parser.add_argument('--only', nargs='*', help='Yalnızca verilen endpoint\'ler')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON sonucu')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='İzin verilen p95 artış oranı (varsayılan 0.25)')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(argv)
+    print("📊 Uçtan uca benchmark")
+    result = run_benchmarks(args)
+    print(f"   Veri: {result['meta']['dataset']} ({result['meta']['seed_ms']:.0f} ms), "
+          f"en yüksek RSS {result['process']['max_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(result, handle, ensure_ascii=False, indent=2)
+        print(f"✓ Sonuçlar {args.output} dosyasına yazıldı")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print("❌ Gerileme bulundu:")
+            for name, detail in regressions:
+                print(f"   {name}: {detail}")
+            return False
+        print("✓ Gerileme yok")
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if run() else 1)
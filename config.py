@@ -11,8 +11,135 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Bağlantı havuzu (bellek içi SQLite'ta havuz boyutu ayarları yok sayılır)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or 5),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 10),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') != '0',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE') or 1800),
+    }
+    
+    # Okuma replikaları (virgülle ayrılmış bağlantı adresleri). REPLICA_ENDPOINTS
+    # kalıplarına uyan GET istekleri replikalardan okunur; yazan kullanıcı
+    # REPLICA_STICKY_SECONDS saniye boyunca birincil veritabanından okur
+    REPLICA_DATABASE_URLS = [url.strip() for url in (os.environ.get('REPLICA_DATABASE_URLS') or '').split(',')
+                             if url.strip()]
+    REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS') or 5)
+    REPLICA_ENDPOINTS = (
+        'reports.*',
+        'admin.index',
+        'admin.departments',
+        'admin.trainings',
+        'admin.training_sections',
+        'admin.user_assignments',
+        'admin.users',
+        'search.*',
+        'api.*',
+    )
+    
+    # SQLite bağlantı ayarları (eşzamanlı yazmalarda "database is locked" hatasını önler)
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    # Silmelerde alt kayıtlar veritabanındaki ON DELETE kurallarıyla temizlenir
+    SQLITE_FOREIGN_KEYS = os.environ.get('SQLITE_FOREIGN_KEYS', '1') != '0'
+    
+    # Üretim sunucusu (flask serve); boş bırakılırsa CPU sayısından hesaplanır
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS') or 0) or None
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS') or 0) or None
+    
+    # Şifre özetleme yöntemi ve maliyeti (Werkzeug biçimi). Değiştirildiğinde eski
+    # özetler kullanıcı giriş yaptığında yeni parametrelerle yeniden oluşturulur
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+    
     # Pagination ayarları
     POSTS_PER_PAGE = 10
+    MAX_PER_PAGE = 100
+    
+    # Şablonda lazy load koruması: 'raise', 'log' veya 'off'
+    # (boş bırakılırsa testte 'raise', debug modunda 'log')
+    LAZY_LOAD_GUARD = os.environ.get('LAZY_LOAD_GUARD')
+    
+    # Oturum açmış kullanıcı önbelleği: paylaşılan arka uçtaki süre (saniye), arka uç
+    # yokken süreç içi süre (diğer worker'lardaki değişiklikler en fazla bu kadar
+    # gecikir), en fazla kayıt ve opsiyonel paylaşılan arka uç ('memory' veya
+    # 'paket.modul:fabrika')
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL') or 300)
+    IDENTITY_CACHE_LOCAL_TTL = float(os.environ.get('IDENTITY_CACHE_LOCAL_TTL') or 5)
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE') or 10000)
+    IDENTITY_CACHE_BACKEND = os.environ.get('IDENTITY_CACHE_BACKEND')
+    
+    # Arka plan işleri: 'thread', 'worker' (flask run-worker) veya 'sync'
+    # (boş bırakılırsa testte 'sync', diğer durumlarda 'thread')
+    JOB_RUNNER = os.environ.get('JOB_RUNNER')
+    JOB_THREADS = int(os.environ.get('JOB_THREADS') or 2)
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL') or 1.0)
+    # Çalışan işin yaşam sinyali aralığı; bu kadar süre sinyal vermeyen iş yeniden
+    # kuyruğa alınır, deneme sayısı dolunca hata olarak kapatılır (saniye)
+    JOB_HEARTBEAT_SECONDS = float(os.environ.get('JOB_HEARTBEAT_SECONDS') or 30)
+    JOB_STALE_SECONDS = float(os.environ.get('JOB_STALE_SECONDS') or 300)
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS') or 3)
+    # İşlerin yüklenen ve ürettiği dosyalar (boş bırakılırsa instance/jobs)
+    JOB_FILES_DIR = os.environ.get('JOB_FILES_DIR')
+    
+    # Uyum snapshot'ları arası gün sayısı (geçmiş sorgularında tekrar oynatılan en uzun aralık)
+    COMPLIANCE_SNAPSHOT_DAYS = int(os.environ.get('COMPLIANCE_SNAPSHOT_DAYS') or 7)
+    
+    # Tamamlanma analizi: takılma eşiği (grupta tamamlanan yoksa, gün), eğilim
+    # penceresi (hafta) ve sonucun önbellekteki dizilerden yeniden hesaplanma süresi (saniye)
+    ANALYTICS_STALL_DAYS = int(os.environ.get('ANALYTICS_STALL_DAYS') or 30)
+    ANALYTICS_TREND_WEEKS = int(os.environ.get('ANALYTICS_TREND_WEEKS') or 12)
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL') or 300)
+    
+    # Tam metin arama: en kısa sorgu (harf), tür başına en fazla sonuç ve alaka
+    # sıralamasının uygulandığı en fazla eşleşme
+    SEARCH_MIN_CHARS = int(os.environ.get('SEARCH_MIN_CHARS') or 2)
+    SEARCH_RESULTS_LIMIT = int(os.environ.get('SEARCH_RESULTS_LIMIT') or 20)
+    SEARCH_RANK_WINDOW = int(os.environ.get('SEARCH_RANK_WINDOW') or 200)
+    
+    # JSON API (/api): varsayılan ve en fazla sayfa boyutu, tarayıcı önbellek süresi (saniye)
+    API_DEFAULT_LIMIT = int(os.environ.get('API_DEFAULT_LIMIT') or 20)
+    API_MAX_LIMIT = int(os.environ.get('API_MAX_LIMIT') or 100)
+    API_CACHE_SECONDS = int(os.environ.get('API_CACHE_SECONDS') or 30)
+    
+    # Harici LMS'ten toplu durum güncellemeleri (POST /api/status-updates): virgülle
+    # ayrılmış Bearer anahtarları (boşsa uç nokta kapalı), parça ve istek başına öğe sayısı
+    STATUS_API_TOKENS = [token.strip() for token in (os.environ.get('STATUS_API_TOKENS') or '').split(',')
+                         if token.strip()]
+    STATUS_UPDATE_BATCH_SIZE = int(os.environ.get('STATUS_UPDATE_BATCH_SIZE') or 1000)
+    STATUS_UPDATE_MAX_ITEMS = int(os.environ.get('STATUS_UPDATE_MAX_ITEMS') or 10000)
+    
+    # Koşullu GET (ETag/304) ve işlenmiş sayfa önbelleği (kayıt sayısı, 0: kapalı)
+    HTTP_CACHE = os.environ.get('HTTP_CACHE', '1') != '0'
+    RENDER_CACHE_SIZE = int(os.environ.get('RENDER_CACHE_SIZE') or 256)
+    # Boş bırakılırsa uygulama dosyalarının değişme zamanından türetilir
+    HTTP_CACHE_SALT = os.environ.get('HTTP_CACHE_SALT')
+    
+    # İstek bazında SQL ölçümü (Server-Timing başlığı ve 'app.sql' logu)
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '1') != '0'
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS') or 100)
+    # /admin/perf sayfasında tutulacak son istek sayısı (0: kapalı)
+    PERF_RING_BUFFER_SIZE = int(os.environ.get('PERF_RING_BUFFER_SIZE') or 200)
+    
+    # Endpoint başına en fazla sorgu sayısı; aşılırsa QUERY_BUDGET_MODE'a göre
+    # 'raise' veya 'log' (boş bırakılırsa testte 'raise', diğer durumlarda 'log')
+    QUERY_BUDGETS = {
+        'user.dashboard': 6,
+        'user.my_trainings': 6,
+        'user.career_path': 6,
+        'admin.index': 8,
+        'admin.users': 6,
+        'admin.trainings': 6,
+        'admin.user_assignments': 6,
+        'reports.department_trainings': 6,
+        'reports.department_matrix': 6,
+        'search.results': 8,
+        'api.users': 4,
+        'api.trainings': 5,
+        'api.departments': 4,
+    }
+    QUERY_BUDGET_DEFAULT = None
+    QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE')
     
     # Mail ayarları (gelecekte kullanılabilir)
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
@@ -0,0 +1,39 @@
+"""Eğitim ilerleme özet tablosu
+
+Tablo mevcut atamalardan doldurulur. flask init-db ile oluşturulmuş ve
+0001_baseline olarak işaretlenmiş veritabanlarında tablo zaten varsa yalnızca
+yeniden hesaplanır. Veri sürümleri tablosu bu noktada henüz olmadığından
+sürüm artırılmaz (app.rollups.fill_rollups).
+
+Revision ID: 0002_progress_rollups
+Revises: 0001_baseline
+Create Date: 2026-10-18 06:58:52.310447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.rollups import fill_rollups
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_progress_rollups'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('training_progress_rollups'):
+        op.create_table('training_progress_rollups',
+        sa.Column('egitim_id', sa.Integer(), nullable=False),
+        sa.Column('bolum_id', sa.Integer(), nullable=False),
+        sa.Column('durum', sa.String(length=20), nullable=False),
+        sa.Column('adet', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('egitim_id', 'bolum_id', 'durum')
+        )
+    fill_rollups(op.get_bind())
+
+
+def downgrade():
+    op.drop_table('training_progress_rollups')
@@ -0,0 +1,85 @@
+"""Arka plan işleri tablosu ve veritabanı seviyesinde silme kuralları
+
+Revision ID: 0004_jobs_and_cascades
+Revises: 0003_hot_query_indexes
+Create Date: 2026-10-18 14:12:37.418205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_jobs_and_cascades'
+down_revision = '0003_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+# İsimsiz foreign key'ler SQLite batch modunda bu kalıpla adlandırılır
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# (tablo, sütun, hedef tablo, ON DELETE kuralı)
+FOREIGN_KEYS = [
+    ('users', 'bolum_id', 'departments', 'SET NULL'),
+    ('trainings', 'pre_requisite_id', 'trainings', 'SET NULL'),
+    ('training_sections', 'egitim_id', 'trainings', 'CASCADE'),
+    ('training_sections', 'bolum_id', 'departments', 'CASCADE'),
+    ('user_trainings', 'kullanici_id', 'users', 'CASCADE'),
+    ('user_trainings', 'egitim_id', 'trainings', 'CASCADE'),
+]
+
+
+def _constraint_name(inspector, table, column, referred_table):
+    for fk in inspector.get_foreign_keys(table):
+        if fk['constrained_columns'] == [column] and fk['referred_table'] == referred_table and fk['name']:
+            return fk['name']
+    return NAMING_CONVENTION['fk'] % {'table_name': table, 'column_0_name': column,
+                                      'referred_table_name': referred_table}
+
+
+def _replace_foreign_keys(ondelete):
+    inspector = sa.inspect(op.get_bind())
+    for table in dict.fromkeys(table for table, _, _, _ in FOREIGN_KEYS):
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referred_table, rule in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                batch_op.drop_constraint(_constraint_name(inspector, table, column, referred_table),
+                                         type_='foreignkey')
+                batch_op.create_foreign_key(
+                    NAMING_CONVENTION['fk'] % {'table_name': table, 'column_0_name': column,
+                                               'referred_table_name': referred_table},
+                    referred_table, [column], ['id'], ondelete=rule if ondelete else None)
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tur', sa.String(length=50), nullable=False),
+    sa.Column('durum', sa.String(length=20), nullable=False),
+    sa.Column('parametreler', sa.JSON(), nullable=False),
+    sa.Column('sonuc', sa.JSON(), nullable=True),
+    sa.Column('ilerleme', sa.Integer(), nullable=False),
+    sa.Column('toplam', sa.Integer(), nullable=True),
+    sa.Column('mesaj', sa.String(length=255), nullable=True),
+    sa.Column('hata', sa.Text(), nullable=True),
+    sa.Column('olusturan_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('baslama_tarihi', sa.DateTime(), nullable=True),
+    sa.Column('bitis_tarihi', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['olusturan_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_durum_created_at', ['durum', 'created_at'], unique=False)
+
+    _replace_foreign_keys(ondelete=True)
+
+
+def downgrade():
+    _replace_foreign_keys(ondelete=False)
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_durum_created_at')
+
+    op.drop_table('jobs')
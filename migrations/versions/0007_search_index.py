@@ -0,0 +1,29 @@
+"""Tam metin arama indeksi
+
+Kullanıcı, eğitim ve bölüm arama tabloları ile tetikleyicileri kurulur ve
+mevcut kayıtlarla doldurulur. DDL veritabanına göre (SQLite FTS5,
+PostgreSQL tsvector) app.search.index'te üretilir.
+
+Revision ID: 0007_search_index
+Revises: 0006_status_events_and_snapshots
+Create Date: 2026-10-18 11:02:41.513207
+
+"""
+from alembic import op
+
+from app.search.index import install, uninstall
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_search_index'
+down_revision = '0006_status_events_and_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    install(op.get_bind())
+
+
+def downgrade():
+    uninstall(op.get_bind())
@@ -1,3 +1,4 @@
+import click
 from app import create_app, db
 from app.models import User, Department, Level, Training, TrainingSection, UserTraining
 
@@ -94,5 +95,203 @@ def init_db():
         print("   3. app.db dosyasının yazma izinlerini kontrol edin")
         db.session.rollback()
 
+@app.cli.command()
+@click.option('--departments', default=8, show_default=True, help='Bölüm sayısı')
+@click.option('--trainings', default=120, show_default=True, help='Eğitim sayısı')
+@click.option('--users', default=2000, show_default=True, help='Kullanıcı sayısı')
+@click.option('--chain-length', default=4, show_default=True, help='Ön koşul zinciri uzunluğu')
+@click.option('--trainings-per-department', default=30, show_default=True, help='Bölüm başına eğitim')
+@click.option('--seed', default=42, show_default=True, help='Rastgele sayı üreteci başlangıç değeri')
+def seed_synthetic(departments, trainings, users, chain_length, trainings_per_department, seed):
+    """Benchmark için sentetik organizasyon verisi ekle"""
+    from app.synthetic import seed_synthetic as seed_data, SYNTHETIC_PASSWORD
+    db.create_all()
+    counts = seed_data(departments=departments, trainings=trainings, users=users,
+                       chain_length=chain_length, trainings_per_department=trainings_per_department,
+                       seed=seed)
+    print("✓ Sentetik veri eklendi:")
+    for name, count in counts.items():
+        print(f"   {name}: {count}")
+    print(f"🔑 Kullanıcı girişi: kullanici1@example.com / {SYNTHETIC_PASSWORD}")
+
+@app.cli.command()
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--assign-trainings', is_flag=True, help='Bölümün varsayılan eğitimlerini ata')
+@click.option('--errors', 'errors_path', type=click.Path(dir_okay=False), help='Hatalı satırların yazılacağı CSV')
+def import_users(path, assign_trainings, errors_path):
+    """CSV dosyasından toplu kullanıcı aktar (isim;email;bolum;rol;sifre)"""
+    import time
+    from app.user_import import import_users as import_file, write_error_report, InvalidImportFile
+    started = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as handle:
+            report = import_file(handle, assign_trainings=assign_trainings)
+    except InvalidImportFile as exc:
+        print(f"❌ {exc}")
+        raise SystemExit(1)
+    
+    print(f"✓ {report.created} kullanıcı eklendi, {report.assigned} eğitim ataması yapıldı "
+          f"({report.processed} satır, {time.perf_counter() - started:.1f} sn).")
+    if report.errors:
+        print(f"⚠️  {report.failed} satır atlandı:")
+        for error in report.errors[:20]:
+            print(f"   satır {error.line} ({error.email}): {error.message}")
+        if errors_path:
+            with open(errors_path, 'w', encoding='utf-8-sig', newline='') as handle:
+                write_error_report(report.errors, handle)
+            print(f"   Tüm hatalar {errors_path} dosyasına yazıldı.")
+
+@app.cli.command()
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, help='Parça boyutu (varsayılan STATUS_UPDATE_BATCH_SIZE)')
+@click.option('--results', 'results_path', type=click.Path(dir_okay=False), help='Öğe sonuçlarının yazılacağı NDJSON dosyası')
+def import_status_updates(path, batch_size, results_path):
+    """JSON/NDJSON dosyasından eğitim durum güncellemelerini uygula (email, egitim_kodu, durum, zaman)"""
+    import json
+    import time
+    from app.status_updates import apply_status_updates, load_items, InvalidPayload
+    started = time.perf_counter()
+    with open(path, encoding='utf-8-sig') as handle:
+        text = handle.read()
+    try:
+        items = load_items(text, ndjson=True if path.endswith(('.ndjson', '.jsonl')) else None)
+    except InvalidPayload as exc:
+        print(f"❌ {exc}")
+        raise SystemExit(1)
+    
+    report = apply_status_updates(items, batch_size=batch_size)
+    summary = report.summary()
+    print(f"✓ {summary['applied']} güncelleme uygulandı, {summary['unchanged']} öğe zaten güncel "
+          f"({summary['total']} öğe, {time.perf_counter() - started:.1f} sn).")
+    errors = [item for item in report.results if item['result'] == 'error']
+    if errors:
+        print(f"⚠️  {len(errors)} öğe uygulanamadı:")
+        for item in errors[:20]:
+            print(f"   öğe {item['index']}: {item['error']}")
+    if results_path:
+        with open(results_path, 'w', encoding='utf-8') as handle:
+            for item in report.results:
+                handle.write(json.dumps(item, ensure_ascii=False) + '\n')
+        print(f"   Tüm sonuçlar {results_path} dosyasına yazıldı.")
+
+@app.cli.command()
+def rebuild_rollups():
+    """Eğitim ilerleme özet tablosunu atamalardan yeniden hesapla"""
+    from app.rollups import rebuild_rollups as rebuild
+    rebuild()
+    db.session.commit()
+    print("✓ Eğitim ilerleme özet tablosu yeniden oluşturuldu.")
+
+@app.cli.command()
+def check_rollups():
+    """Eğitim ilerleme özet tablosunun tutarlılığını kontrol et"""
+    from app.rollups import check_rollups as check
+    mismatches = check()
+    if not mismatches:
+        print("✓ Özet tablo atamalarla tutarlı.")
+        return
+    
+    print(f"❌ {len(mismatches)} tutarsız kayıt bulundu:")
+    for row in mismatches:
+        print(f"   eğitim={row['egitim_id']} bölüm={row['bolum_id']} durum={row['durum']}: "
+              f"beklenen {row['beklenen']}, mevcut {row['mevcut']}")
+    print("💡 Çözüm: flask rebuild-rollups komutunu çalıştırın")
+    raise SystemExit(1)
+
+@app.cli.command()
+@click.option('--interval-days', type=int, help='Snapshot aralığı (varsayılan COMPLIANCE_SNAPSHOT_DAYS)')
+@click.option('--rebuild', is_flag=True, help='Mevcut snapshot\'ları silip baştan oluştur')
+def build_snapshots(interval_days, rebuild):
+    """Durum olaylarından geçmişe dönük uyum snapshot'larını oluştur"""
+    from app.compliance import build_snapshots as build
+    created = build(interval_days=interval_days, rebuild=rebuild)
+    if not created:
+        print("✓ Snapshot'lar güncel.")
+        return
+    print(f"✓ {len(created)} snapshot oluşturuldu ({created[0].zaman:%Y-%m-%d} - {created[-1].zaman:%Y-%m-%d}), "
+          f"{sum(snapshot.olay_sayisi for snapshot in created)} olay işlendi.")
+
+@app.cli.command()
+def sync_replicas():
+    """Birincil SQLite veritabanını replika dosyalarına kopyala (yerel geliştirme için)"""
+    from app.database import sync_sqlite_replicas
+    try:
+        copied = sync_sqlite_replicas(app)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        raise SystemExit(1)
+    if not copied:
+        print("⚠️  REPLICA_DATABASE_URLS tanımlı değil.")
+        return
+    for path in copied:
+        print(f"✓ {path}")
+
+@app.cli.command()
+def rebuild_search_index():
+    """Arama indeksini kullanıcı, eğitim ve bölüm tablolarından baştan oluştur"""
+    from app.search.index import install, rebuild, supported
+    with db.engine.begin() as connection:
+        if not supported(connection.dialect.name):
+            print(f"⚠️  {connection.dialect.name} veritabanında tam metin arama desteklenmiyor.")
+            return
+        install(connection)
+        counts = rebuild(connection)
+    print("✓ Arama indeksi oluşturuldu: " + ", ".join(f"{kind} {count}" for kind, count in counts.items()))
+
+@app.cli.command()
+def explain_hot_queries():
+    """Sık kullanılan sorguların planlarını göster; tam tablo taraması varsa hata ver"""
+    from app.hot_queries import explain_all
+    failures = 0
+    for name, plan, scans in explain_all():
+        print(f"{'❌' if scans else '✓'} {name}")
+        for line in plan:
+            print(f"     {line}")
+        if scans:
+            failures += 1
+            print(f"   Tam tablo taraması: {', '.join(scans)}")
+    
+    if failures:
+        print(f"\n❌ {failures} sorgu tam tablo taraması yapıyor.")
+        print("💡 Çözüm: flask db upgrade ile indeks migrasyonlarını uygulayın")
+        raise SystemExit(1)
+    print("\n✓ Tüm sık kullanılan sorgular indeks kullanıyor.")
+
+@app.cli.command()
+@click.option('--server', type=click.Choice(['gunicorn', 'waitress']), help='Boşsa kurulu olan kullanılır')
+@click.option('--host', default='127.0.0.1', show_default=True)
+@click.option('--port', default=8000, show_default=True)
+@click.option('--workers', type=int, help='gunicorn süreç sayısı (varsayılan 2 * CPU + 1)')
+@click.option('--threads', type=int, help='Süreç başına thread sayısı')
+def serve(server, host, port, workers, threads):
+    """Uygulamayı üretim WSGI sunucusuyla (gunicorn/waitress) çalıştır"""
+    from app import serving
+    try:
+        server = serving.choose_server(server)
+    except serving.ServerUnavailable as exc:
+        print(f"❌ {exc}")
+        raise SystemExit(1)
+    
+    workers = workers or app.config.get('SERVER_WORKERS') or serving.default_workers()
+    threads = threads or app.config.get('SERVER_THREADS')
+    if server == 'gunicorn':
+        print(f"🚀 gunicorn: http://{host}:{port} ({workers} worker)")
+    else:
+        print(f"🚀 waitress: http://{host}:{port} ({threads or serving.default_threads()} thread)")
+    serving.serve(server, host=host, port=port, workers=workers, threads=threads)
+
+@app.cli.command()
+@click.option('--burst', is_flag=True, help='Kuyruk boşalınca çık')
+@click.option('--poll', type=float, help='Boş kuyrukta bekleme süresi (saniye)')
+def run_worker(burst, poll):
+    """Kuyruktaki arka plan işlerini çalıştır (JOB_RUNNER=worker için)"""
+    from app.jobs import run_worker as work
+    print(f"⚙️  İş çalıştırıcı başladı{' (burst)' if burst else ''}")
+    try:
+        processed = work(poll_interval=poll or app.config['JOB_POLL_INTERVAL'], burst=burst)
+    except KeyboardInterrupt:
+        return
+    print(f"✓ {processed} iş çalıştırıldı.")
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Test fikstürleri
+
+Her test bellek içi SQLite üzerinde küçük bir sentetik organizasyonla
+çalışan, TESTING=True olan yeni bir uygulama alır. TESTING modunda lazy load
+koruması ve sorgu bütçesi hata fırlatır.
+"""
+
+import pytest
+from sqlalchemy import update
+from app import create_app, db, identity
+from app.models import User
+from app.synthetic import seed_synthetic, SYNTHETIC_PASSWORD
+from config import Config
+
+ADMIN_ID = 1
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    PERF_RING_BUFFER_SIZE = 0
+
+def make_app(config_class=TestConfig):
+    """Tohumlanmış test uygulaması (app context içinde kullanılmak üzere)"""
+    app = create_app(config_class)
+    with app.app_context():
+        db.create_all()
+        seed_synthetic(departments=4, trainings=30, users=60, trainings_per_department=10,
+                       history_days=60)
+        db.session.execute(update(User).where(User.id == ADMIN_ID).values(rol='Admin'))
+        db.session.commit()
+        # Kimlik önbelleği süreç genelinde; önceki testin kullanıcıları silinir
+        identity.invalidate(db.session.scalars(db.select(User.id)).all())
+        db.session.remove()
+    return app
+
+@pytest.fixture
+def app():
+    app = make_app()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def login(client, user_id):
+    with client.application.app_context():
+        email = db.session.get(User, user_id).email
+        db.session.remove()
+    response = client.post('/auth/login', data={'email': email, 'password': SYNTHETIC_PASSWORD})
+    assert response.status_code == 302
+    return client
+
+@pytest.fixture
+def admin_client(client):
+    return login(client, ADMIN_ID)
@@ -0,0 +1,63 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select
+from app import db
+from app.models import UserTraining
+from app.reports import analytics
+
+np = pytest.importorskip('numpy')
+
+def test_streamed_load_matches_single_batch(app):
+    with app.app_context():
+        started = db.session.scalar(select(func.count()).select_from(UserTraining)
+                                    .where(UserTraining.durum != 'baslamadi'))
+        streamed = analytics.load_columns(batch_size=7)
+        single = analytics.load_columns(batch_size=started + 1)
+
+        assert len(streamed) == started
+        for name in ('egitim', 'bolum', 'seviye', 'tamamlandi', 'baslama', 'tamamlanma'):
+            np.testing.assert_array_equal(getattr(streamed, name), getattr(single, name))
+
+def test_analytics_page_renders(admin_client):
+    response = admin_client.get('/reports/analytics')
+    assert response.status_code == 200
+
+def assignment(durum):
+    return db.session.scalars(select(UserTraining).where(UserTraining.durum == durum)
+                              .order_by(UserTraining.id).limit(1)).one()
+
+def test_summary_reloads_only_for_completions(app, monkeypatch):
+    with app.app_context():
+        loads = []
+        load = analytics.load_columns
+        monkeypatch.setattr(analytics, 'load_columns', lambda: loads.append(1) or load())
+
+        first = analytics.summary()
+        assert analytics.summary() is first
+        assert len(loads) == 1
+
+        # Başlatma ve profil değişikliği dizileri yeniden okutmaz
+        started = assignment('baslamadi')
+        started.durum = 'devam'
+        started.kullanici.isim += ' (güncel)'
+        db.session.commit()
+        assert analytics.summary() is first
+        assert len(loads) == 1
+
+        completed = assignment('devam')
+        completed.durum = 'tamamlandi'
+        completed.tamamlanma_tarihi = datetime.utcnow()
+        db.session.commit()
+        second = analytics.summary()
+        assert len(loads) == 2
+        assert second['genel']['tamamlanan'] == first['genel']['tamamlanan'] + 1
+
+def test_expired_summary_is_recomputed_from_cached_columns(app, monkeypatch):
+    with app.app_context():
+        first = analytics.summary()
+        monkeypatch.setattr(analytics, 'load_columns', lambda: pytest.fail('diziler yeniden okundu'))
+        app.config['ANALYTICS_CACHE_TTL'] = 0
+
+        second = analytics.summary()
+        assert second is not first
+        assert second['satir'] == first['satir']
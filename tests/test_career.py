@@ -0,0 +1,52 @@
+from sqlalchemy import select, update
+from app import career, db
+from app.career import career_progress, user_scope
+from app.data_versions import bump
+from app.models import User, UserTraining
+
+def completed_total(kullanici_id, bolum_id):
+    return sum(level['completed'] for level in career_progress(kullanici_id, bolum_id))
+
+def users_with_pending(limit):
+    return db.session.scalars(
+        select(User).join(UserTraining, UserTraining.kullanici_id == User.id)
+        .where(UserTraining.durum != 'tamamlandi', User.bolum_id.is_not(None))
+        .distinct().order_by(User.id).limit(limit)
+    ).all()
+
+def test_progress_is_refreshed_after_write_in_other_process(app):
+    with app.app_context():
+        user = users_with_pending(1)[0]
+        kullanici_id, bolum_id = user.id, user.bolum_id
+        before = completed_total(kullanici_id, bolum_id)
+        assert completed_total(kullanici_id, bolum_id) == before
+
+        # Başka bir worker'daki toplu güncelleme: bu sürecin session olayları çalışmaz
+        with db.engine.begin() as connection:
+            connection.execute(update(UserTraining.__table__)
+                               .where(UserTraining.kullanici_id == kullanici_id)
+                               .values(durum='tamamlandi'))
+            bump(connection, [user_scope(kullanici_id)])
+
+        assert completed_total(kullanici_id, bolum_id) > before
+
+def test_other_users_completion_keeps_cached_progress(app, monkeypatch):
+    with app.app_context():
+        first, second = users_with_pending(2)
+        first_key, second_key = (first.id, first.bolum_id), (second.id, second.bolum_id)
+        completed_total(*first_key)
+        second_before = completed_total(*second_key)
+
+        loads = []
+        load = career._load_progress
+        monkeypatch.setattr(career, '_load_progress', lambda *key: loads.append(key) or load(*key))
+
+        assignment = db.session.scalars(
+            select(UserTraining).where(UserTraining.kullanici_id == second.id,
+                                       UserTraining.durum != 'tamamlandi').limit(1)).one()
+        assignment.durum = 'tamamlandi'
+        db.session.commit()
+
+        completed_total(*first_key)
+        assert completed_total(*second_key) == second_before + 1
+        assert loads == [second_key]
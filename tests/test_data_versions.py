@@ -0,0 +1,57 @@
+from sqlalchemy import event, select, update
+from app import db
+from app.data_versions import mark_changed, versions
+from app.models import Department, Training
+
+def version_writes(engine):
+    """data_versions tablosuna yazan ifadeleri topla"""
+    statements = []
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if 'data_versions' in statement and not statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', listener)
+    return statements, lambda: event.remove(engine, 'before_cursor_execute', listener)
+
+def test_versions_are_bumped_once_at_commit(app):
+    with app.app_context():
+        before = versions(['trainings', 'departments'])
+        statements, stop = version_writes(db.engine)
+        try:
+            for training in db.session.scalars(select(Training).limit(3)):
+                training.baslik += ' (güncel)'
+                db.session.flush()
+            db.session.get(Department, 1).aciklama = 'Güncel'
+            db.session.flush()
+            assert statements == []
+
+            db.session.commit()
+        finally:
+            stop()
+        assert len(statements) == 1
+        assert versions(['trainings', 'departments']) == {
+            'trainings': before['trainings'] + 1, 'departments': before['departments'] + 1}
+
+def test_changes_flushed_by_commit_are_bumped(app):
+    with app.app_context():
+        before = versions(['trainings'])['trainings']
+        db.session.scalars(select(Training).limit(1)).first().baslik = 'Commit ile yazılan'
+        db.session.commit()
+        assert versions(['trainings'])['trainings'] == before + 1
+
+def test_rollback_discards_pending_versions(app):
+    with app.app_context():
+        before = versions(['trainings'])['trainings']
+        db.session.scalars(select(Training).limit(1)).first().baslik = 'Geri alınan'
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+        assert versions(['trainings'])['trainings'] == before
+
+def test_core_writes_are_bumped_with_mark_changed(app):
+    with app.app_context():
+        before = versions(['trainings'])['trainings']
+        db.session.execute(update(Training).values(aciklama='Toplu'))
+        mark_changed(['trainings'])
+        assert versions(['trainings'])['trainings'] == before
+        db.session.commit()
+        assert versions(['trainings'])['trainings'] == before + 1
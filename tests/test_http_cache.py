@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta
+from app.reports import routes as report_routes
+
+class Tomorrow(datetime):
+    @classmethod
+    def utcnow(cls):
+        return datetime.utcnow() + timedelta(days=1)
+
+def test_unchanged_page_is_served_as_304(admin_client):
+    etag = admin_client.get('/reports/compliance').headers['ETag']
+    response = admin_client.get('/reports/compliance', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+def test_compliance_default_date_changes_etag_at_midnight(admin_client, monkeypatch):
+    response = admin_client.get('/reports/compliance')
+    etag = response.headers['ETag']
+    today = datetime.utcnow().date()
+    assert today.isoformat().encode() in response.data
+
+    monkeypatch.setattr(report_routes, 'datetime', Tomorrow)
+    tomorrow = today + timedelta(days=1)
+    response = admin_client.get('/reports/compliance', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert tomorrow.isoformat().encode() in response.data
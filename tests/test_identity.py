@@ -0,0 +1,74 @@
+"""
+Kimlik önbelleğinin çok worker'lı kullanımı
+
+Diğer worker, users tablosuna Core ile yazan ve kendi invalidate() çağrısıyla
+yalnızca paylaşılan arka ucu temizleyebilen bir süreç olarak taklit edilir;
+bu sürecin yerel önbelleğine dokunamaz.
+"""
+
+import pytest
+from sqlalchemy import update
+from app import db, identity
+from app.models import User
+from tests.conftest import ADMIN_ID, TestConfig, login, make_app
+
+class SharedCacheConfig(TestConfig):
+    IDENTITY_CACHE_BACKEND = 'memory'
+
+@pytest.fixture
+def shared_app():
+    app = make_app(SharedCacheConfig)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+def other_worker_update(app, user_id, **values):
+    """Başka bir worker'da kullanıcıyı güncelle"""
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(update(User.__table__).where(User.id == user_id).values(**values))
+        backend = app.extensions['identity_cache']
+        if backend is not None:
+            backend.delete(identity._backend_key(user_id))
+
+def test_demoted_admin_loses_access_with_shared_backend(shared_app):
+    client = login(shared_app.test_client(), ADMIN_ID)
+    assert client.get('/admin/users').status_code == 200
+
+    other_worker_update(shared_app, ADMIN_ID, rol='Personel')
+    assert client.get('/admin/users').status_code == 403
+
+def test_deactivated_user_is_logged_out_with_shared_backend(shared_app):
+    client = login(shared_app.test_client(), ADMIN_ID)
+    assert client.get('/user/dashboard').status_code == 200
+
+    other_worker_update(shared_app, ADMIN_ID, is_active=False)
+    assert client.get('/user/dashboard').status_code == 302
+
+def test_password_change_revokes_session_with_shared_backend(shared_app):
+    client = login(shared_app.test_client(), ADMIN_ID)
+    assert client.get('/user/dashboard').status_code == 200
+
+    other_worker_update(shared_app, ADMIN_ID, sifre_hash='yeni-ozet')
+    assert client.get('/user/dashboard').status_code == 302
+
+def test_local_cache_expires_quickly_without_backend(app, monkeypatch):
+    client = login(app.test_client(), ADMIN_ID)
+    assert client.get('/admin/users').status_code == 200
+
+    # Arka uç yokken diğer worker bu sürecin önbelleğini temizleyemez
+    other_worker_update(app, ADMIN_ID, rol='Personel')
+    assert client.get('/admin/users').status_code == 200
+
+    clock = identity.time.monotonic() + app.config['IDENTITY_CACHE_LOCAL_TTL']
+    monkeypatch.setattr(identity.time, 'monotonic', lambda: clock)
+    assert client.get('/admin/users').status_code == 403
+
+def test_local_changes_are_visible_immediately(app):
+    client = login(app.test_client(), ADMIN_ID)
+    assert client.get('/admin/users').status_code == 200
+    with app.app_context():
+        db.session.get(User, ADMIN_ID).rol = 'Personel'
+        db.session.commit()
+    assert client.get('/admin/users').status_code == 403
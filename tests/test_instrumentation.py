@@ -0,0 +1,26 @@
+import re
+import pytest
+from app.instrumentation import QueryBudgetExceeded
+
+SERVER_TIMING = re.compile(r'^db;dur=\d+\.\d;desc="(\d+) sorgu"$')
+
+def test_query_budget_exceeded_raises(app, admin_client):
+    app.config['QUERY_BUDGETS'] = {**app.config['QUERY_BUDGETS'], 'admin.users': 1}
+    with pytest.raises(QueryBudgetExceeded, match='admin.users'):
+        admin_client.get('/admin/users')
+
+def test_query_budget_within_limit(app, admin_client):
+    assert admin_client.get('/admin/users').status_code == 200
+
+def test_query_budget_log_mode_does_not_raise(app, admin_client):
+    app.config['QUERY_BUDGETS'] = {**app.config['QUERY_BUDGETS'], 'admin.users': 1}
+    app.config['QUERY_BUDGET_MODE'] = 'log'
+    assert admin_client.get('/admin/users').status_code == 200
+
+def test_server_timing_header(admin_client):
+    response = admin_client.get('/admin/users')
+    timings = response.headers.getlist('Server-Timing')
+    assert len(timings) == 2
+    match = SERVER_TIMING.match(timings[0])
+    assert match and int(match.group(1)) > 0
+    assert re.match(r'^app;dur=\d+\.\d$', timings[1])
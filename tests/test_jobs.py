@@ -0,0 +1,66 @@
+import time
+from datetime import datetime, timedelta
+from app import db
+from app.jobs import recover_stale, run_worker, shutdown
+from app.models import Job
+from tests.conftest import TestConfig, make_app
+
+def stuck_job(deneme, seconds_ago):
+    """Sinyali seconds_ago saniye önce kesilmiş, çalışıyor görünen iş"""
+    started = datetime.utcnow() - timedelta(seconds=seconds_ago)
+    job = Job(tur='rebuild_rollups', parametreler={}, durum='calisiyor', deneme=deneme,
+              baslama_tarihi=started, son_sinyal=started, mesaj='Çalışıyor')
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+def test_stale_job_is_requeued_and_completed(app):
+    with app.app_context():
+        job_id = stuck_job(deneme=1, seconds_ago=3600)
+        alive_id = stuck_job(deneme=1, seconds_ago=10)
+
+        assert recover_stale(stale_seconds=300) == (1, 0)
+        assert db.session.get(Job, job_id).durum == 'bekliyor'
+        assert db.session.get(Job, alive_id).durum == 'calisiyor'
+
+        assert run_worker(burst=True) == 1
+        db.session.expire_all()
+        job = db.session.get(Job, job_id)
+        assert (job.durum, job.deneme) == ('tamamlandi', 2)
+
+def test_job_fails_after_max_attempts(app):
+    with app.app_context():
+        job_id = stuck_job(deneme=3, seconds_ago=3600)
+        assert recover_stale(stale_seconds=300, max_attempts=3) == (0, 1)
+        job = db.session.get(Job, job_id)
+        assert job.durum == 'hata'
+        assert job.bitis_tarihi is not None
+
+def test_thread_runner_picks_up_queued_jobs_on_startup(tmp_path):
+    class ThreadConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'jobs.db'}"
+        JOB_RUNNER = 'thread'
+        JOB_HEARTBEAT_SECONDS = 0.1
+
+    app = make_app(ThreadConfig)
+    with app.app_context():
+        # Yeniden başlatılan bir worker'ın sıraya alıp çalıştıramadığı iş
+        job = Job(tur='rebuild_rollups', parametreler={}, mesaj='Sırada')
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+        db.session.remove()
+
+    app.test_client().get('/auth/login')
+    deadline = time.monotonic() + 10
+    try:
+        with app.app_context():
+            while time.monotonic() < deadline:
+                durum = db.session.get(Job, job_id).durum
+                if durum == 'tamamlandi':
+                    break
+                db.session.remove()
+                time.sleep(0.05)
+            assert durum == 'tamamlandi'
+    finally:
+        shutdown(app)
@@ -0,0 +1,42 @@
+import pytest
+from flask import render_template_string
+from app import db
+from app.lazy_guard import LazyLoadError
+from app.models import UserTraining
+from tests.conftest import login
+
+LIST_PAGES = [
+    '/admin/',
+    '/admin/departments',
+    '/admin/trainings',
+    '/admin/training-sections',
+    '/admin/user-assignments',
+    '/admin/users',
+    '/reports/department-trainings',
+    '/reports/department-matrix',
+]
+
+@pytest.mark.parametrize('url', LIST_PAGES)
+def test_admin_list_pages_render_without_lazy_loads(admin_client, url):
+    response = admin_client.get(url)
+    assert response.status_code == 200
+
+def test_user_pages_render_without_lazy_loads(client, app):
+    with app.app_context():
+        user_id = db.session.scalar(db.select(UserTraining.kullanici_id).limit(1))
+        db.session.remove()
+    login(client, user_id)
+    for url in ('/user/dashboard', '/user/trainings', '/user/career-path'):
+        assert client.get(url).status_code == 200, url
+
+def test_lazy_load_in_template_raises(app):
+    with app.test_request_context('/'):
+        assert app.testing
+        user_training = db.session.scalars(db.select(UserTraining).limit(1)).first()
+        with pytest.raises(LazyLoadError):
+            render_template_string('{{ atama.egitim.baslik }}', atama=user_training)
+
+def test_lazy_load_outside_template_is_allowed(app):
+    with app.test_request_context('/'):
+        user_training = db.session.scalars(db.select(UserTraining).limit(1)).first()
+        assert user_training.egitim.baslik
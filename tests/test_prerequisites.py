@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import select, update
+from app import db, prerequisites
+from app.data_versions import bump
+from app.models import Training
+from app.prerequisites import PrerequisiteCycleError, get_graph
+
+def chained_training():
+    """Ön koşulu olan bir eğitim ve ön koşulu"""
+    training = db.session.scalars(select(Training).where(Training.pre_requisite_id.is_not(None)).limit(1)).first()
+    return training, db.session.get(Training, training.pre_requisite_id)
+
+def test_graph_reloads_after_write_in_other_process(app):
+    with app.app_context():
+        training, parent = chained_training()
+        graph = get_graph()
+        assert parent.id in graph.prerequisites(training.id)
+
+        # Başka bir worker: session olayları bu sürecin grafına ulaşmaz, yalnızca sürüm artar
+        with db.engine.begin() as connection:
+            connection.execute(update(Training.__table__).where(Training.id == training.id)
+                               .values(pre_requisite_id=None))
+            bump(connection, ['trainings'])
+
+        assert get_graph().prerequisites(training.id) == []
+
+def test_local_commit_updates_graph_incrementally(app):
+    with app.app_context():
+        training, parent = chained_training()
+        graph = get_graph()
+        training.pre_requisite_id = None
+        db.session.commit()
+
+        assert get_graph() is graph
+        assert graph.prerequisites(training.id) == []
+
+def test_cycle_is_rejected_at_write_time_with_stale_graph(app):
+    with app.app_context():
+        training, parent = chained_training()
+        # Graf devre dışı kalsa (ör. eski bir worker) bile veritabanı kontrolü döngüyü yakalar
+        prerequisites.reset_graph()
+        parent.pre_requisite_id = training.id
+        with pytest.raises(PrerequisiteCycleError):
+            db.session.commit()
+        db.session.rollback()
+        assert db.session.get(Training, parent.id).pre_requisite_id != training.id
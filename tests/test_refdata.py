@@ -0,0 +1,25 @@
+from sqlalchemy import insert
+from app import db
+from app.data_versions import bump
+from app.models import Department
+from app.refdata import department_choices
+
+def test_department_added_in_other_process_is_a_valid_choice(app):
+    with app.app_context():
+        before = department_choices()
+
+        # Başka bir worker'daki ekleme: bu sürecin session olayları çalışmaz
+        with db.engine.begin() as connection:
+            connection.execute(insert(Department.__table__).values(ad='Yeni Bölüm'))
+            bump(connection, ['departments'])
+
+        names = [ad for _, ad in department_choices()]
+        assert 'Yeni Bölüm' in names
+        assert len(names) == len(before) + 1
+
+def test_choices_are_reloaded_after_commit_in_same_request(app):
+    with app.test_request_context():
+        department_choices()
+        db.session.add(Department(ad='İstekte Eklenen'))
+        db.session.commit()
+        assert 'İstekte Eklenen' in [ad for _, ad in department_choices()]
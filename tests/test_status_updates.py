@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from app import db
+from app.compliance import build_snapshots, counts_at
+from app.models import Training, TrainingProgressRollup, TrainingStatusEvent, User, UserTraining
+from app.rollups import check_rollups
+from app.status_updates import apply_status_updates
+
+TOKEN = 'lms-test-anahtari'
+
+@pytest.fixture
+def lms_client(app):
+    app.config['STATUS_API_TOKENS'] = [TOKEN]
+    return app.test_client()
+
+def post_updates(client, body, mimetype='application/json', token=TOKEN):
+    return client.post('/api/status-updates', data=body, content_type=mimetype,
+                       headers={'Authorization': f'Bearer {token}'})
+
+def pending_items(app, count):
+    with app.app_context():
+        rows = db.session.execute(
+            select(User.email, Training.kod)
+            .select_from(UserTraining)
+            .join(User, User.id == UserTraining.kullanici_id)
+            .join(Training, Training.id == UserTraining.egitim_id)
+            .where(UserTraining.durum != 'tamamlandi')
+            .order_by(UserTraining.id).limit(count)
+        ).all()
+        db.session.remove()
+    return [{'email': email, 'egitim_kodu': kod, 'durum': 'tamamlandi'} for email, kod in rows]
+
+def rollup_counts():
+    return {(row.egitim_id, row.bolum_id, row.durum): row.adet
+            for row in db.session.scalars(select(TrainingProgressRollup)) if row.adet}
+
+def test_backdated_completion_keeps_compliance_consistent(app):
+    with app.app_context():
+        assert build_snapshots(interval_days=1)
+        pending = db.session.execute(
+            select(UserTraining.id, User.email, Training.kod)
+            .join(User, User.id == UserTraining.kullanici_id)
+            .join(Training, Training.id == UserTraining.egitim_id)
+            .where(UserTraining.durum == 'devam').limit(1)
+        ).one()
+        completed_at = datetime.utcnow().replace(microsecond=0) - timedelta(days=30)
+
+        report = apply_status_updates([{'email': pending.email, 'egitim_kodu': pending.kod,
+                                        'durum': 'tamamlandi', 'zaman': completed_at.isoformat() + 'Z'}])
+        assert report.summary()['applied'] == 1
+
+        counts, snapshot = counts_at(datetime.utcnow())
+        assert snapshot is not None
+        assert {key: adet for key, adet in counts.items() if adet} == rollup_counts()
+
+        # Bildirilen zaman atamada ve olayın kaynak zamanında saklanır
+        assert db.session.get(UserTraining, pending.id).tamamlanma_tarihi == completed_at
+        event = db.session.scalars(select(TrainingStatusEvent)
+                                   .where(TrainingStatusEvent.atama_id == pending.id)
+                                   .order_by(TrainingStatusEvent.id.desc()).limit(1)).one()
+        assert event.yeni_durum == 'tamamlandi'
+        assert event.kaynak_zaman == completed_at
+        assert event.zaman > completed_at + timedelta(days=29)
+
+def test_endpoint_requires_bearer_token(lms_client):
+    body = json.dumps([])
+    assert post_updates(lms_client, body, token='yanlis').status_code == 401
+    response = lms_client.post('/api/status-updates', data=body, content_type='application/json')
+    assert response.status_code == 401
+
+def test_ndjson_bad_line_is_an_item_error(app, lms_client):
+    first, second = pending_items(app, 2)
+    body = '\n'.join([json.dumps(first), '{bozuk satır', json.dumps(second)])
+    response = post_updates(lms_client, body, mimetype='application/x-ndjson')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['summary'] == {'total': 3, 'applied': 2, 'unchanged': 0, 'errors': 1}
+    assert [item['result'] for item in data['results']] == ['applied', 'error', 'applied']
+
+def test_replayed_payload_is_unchanged(app, lms_client):
+    body = json.dumps(pending_items(app, 5))
+    assert post_updates(lms_client, body).get_json()['summary']['applied'] == 5
+
+    data = post_updates(lms_client, body).get_json()
+    assert data['summary'] == {'total': 5, 'applied': 0, 'unchanged': 5, 'errors': 0}
+    with app.app_context():
+        assert check_rollups() == []
+
+@pytest.mark.parametrize('override', [
+    {'email': 5},
+    {'email': ['a@example.com']},
+    {'durum': ['devam']},
+    {'durum': {'ad': 'devam'}},
+    {'email': None, 'kullanici_id': 10 ** 20},
+    {'email': None, 'kullanici_id': 0},
+    {'email': None, 'kullanici_id': True},
+    {'egitim_kodu': 7},
+    {'zaman': 12},
+    {'zaman': '0001-01-01T00:00:00+14:00'},
+])
+def test_malformed_items_are_item_errors(app, lms_client, override):
+    valid, malformed = pending_items(app, 2)
+    malformed.update(override)
+    response = post_updates(lms_client, json.dumps([valid, malformed]))
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item['result'] for item in data['results']] == ['applied', 'error']
+    assert data['results'][1]['error']
@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from app import db
+from app.models import TrainingStatusEvent, UserTraining
+
+def test_synthetic_timestamps_are_not_in_the_future(app):
+    with app.app_context():
+        now = datetime.utcnow()
+        latest = db.session.execute(select(func.max(UserTraining.created_at),
+                                           func.max(UserTraining.baslama_tarihi),
+                                           func.max(UserTraining.tamamlanma_tarihi))).one()
+        assert all(value <= now for value in latest)
+        assert db.session.scalar(select(func.max(TrainingStatusEvent.zaman))) <= now
+
+def test_synthetic_dates_are_ordered(app):
+    with app.app_context():
+        rows = db.session.execute(select(UserTraining.created_at, UserTraining.baslama_tarihi,
+                                         UserTraining.tamamlanma_tarihi)).all()
+        for created_at, started, completed in rows:
+            assert started is None or created_at <= started
+            assert completed is None or started <= completed
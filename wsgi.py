@@ -0,0 +1,12 @@
+"""
+Üretim WSGI giriş noktası
+
+    gunicorn -w 4 -b 0.0.0.0:8000 wsgi:app
+    waitress-serve --listen=0.0.0.0:8000 wsgi:app
+
+veya seçili sunucuyu otomatik bulan `flask serve` komutu kullanılabilir.
+"""
+
+from app import create_app
+
+app = create_app()